@@ -27,6 +27,12 @@ from __future__ import print_function
 from pkgutil import extend_path
 from os.path import dirname
 
+# Start the import profiler first, if it has been requested –
+# q.v. “clu.profiling” and “python -m clu --imports”:
+from clu import profiling
+
+profiling.install_if_requested()
+
 from clu.version.read_version import read_version_file
 from clu.version import VersionInfo
 
@@ -49,5 +55,15 @@ __maintainer__ = __author__
 __license__ = 'MIT'
 __copyright__ = f'{__title__} © 2012-2035 {__author__}'
 
+def __getattr__(name):
+    """ Lazily resolve the names of things exported by CLU modules,
+        importing their defining modules only upon first access –
+        q.v. PEP 562, and “clu.all.write_manifest(…)”
+    """
+    if name.startswith('__'):
+        raise AttributeError(f"module “{__name__}” has no attribute “{name}”")
+    from clu.all import lazy_getattr
+    return lazy_getattr(name)
+
 # The CLU project version:
 version_info = VersionInfo(__version__)
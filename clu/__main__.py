@@ -91,8 +91,60 @@ def show():
     center(footer1,    color=colors.cyan)
     center(filler='–', color=colors.gray)
 
+def show_imports(limit=40):
+    """ Prettyprint the import profile of all CLU modules – q.v. “clu.profiling” """
+    from clu import profiling
+    from clu.all import import_clu_modules
+    from clu.scripts import ansicolors as colors
+    from clu.repl.ansi import (print_ansi as output,
+                               print_ansi_centered as center)
+    
+    # Import everything, with the profiler running:
+    import_clu_modules()
+    profiler = profiling.uninstall()
+    
+    # Header + footer:
+    header0 = f'IMPORT PROFILE ({len(profiler.records)} modules imported)'
+    header1 = 'SLOWEST BY SELF TIME'
+    footer0 = '“*” marks modules with exporters; times in ms, allocations in KiB'
+    
+    # Print the top-ranked imports, first by cumulative time,
+    # and then by self time:
+    center(filler='–', color=colors.gray)
+    center(header0,    color=colors.yellow)
+    linebreak()
+    output('\n'.join(profiler.report(limit=limit)), color=colors.green)
+    linebreak()
+    center(header1,    color=colors.yellow)
+    linebreak()
+    output('\n'.join(profiler.report(limit=limit, sortby='self')), color=colors.green)
+    linebreak()
+    center(footer0,    color=colors.cyan)
+    center(filler='–', color=colors.gray)
+
+def profile_imports(allocations=True):
+    """ Re-run “python -m clu --imports” in a fresh interpreter,
+        with import profiling switched on from the very start
+    """
+    import subprocess
+    from clu import profiling
+    environment = dict(os.environ)
+    environment[profiling.ENVIRONMENT_VARIABLE] = allocations and 'all' or 'time'
+    return subprocess.run([sys.executable, '-m', 'clu', '--imports'],
+                           env=environment).returncode
+
 def main():
-    """ Main CLI entry point for exported-item module listing """
+    """ Main CLI entry point for exported-item module listing – or,
+        with “--imports”, for the import-time profile of all modules
+        (add “--no-allocations” for more representative timings)
+    """
+    if '--imports' in sys.argv[1:]:
+        from clu import profiling
+        if profiling.profiler is None:
+            return profile_imports(allocations='--no-allocations' not in sys.argv[1:])
+        show_imports()
+        return os.EX_OK
+    
     # Show ’em:
     show()
     
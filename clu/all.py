@@ -1,11 +1,16 @@
 # -*- coding: utf-8 -*-
 # “fdres`” – spontaneous rebuke from Tribble, 20 Oct 2025 10pm-ish
 from __future__ import print_function
-from clu.exporting import Exporter
+from clu.exporting import Exporter, lazy_attributes
+
+import os
 
 exporter = Exporter(path=__file__)
 export = exporter.decorator()
 
+# The static export manifest, written at build time – q.v. “write_manifest(…)” sub.
+manifest_path = os.path.join(os.path.dirname(__file__), 'exports.json')
+
 @export
 def import_all_modules(basepath, appname, exportername='exporter'):
     """ Import all modules that use the “clu.exporting.ExporterBase”
@@ -51,6 +56,50 @@ def import_clu_modules():
                                appname=consts.APPNAME,
                           exportername=consts.EXPORTER_NAME)
 
+@export
+def write_manifest(path=None):
+    """ Write the static export manifest for CLU, mapping the names of
+        all things exported by CLU modules to the dotpaths of the modules
+        in which they are defined, as JSON – either to the specified path,
+        or the default location (q.v. “clu.all.manifest_path”).
+        
+        Names that collide with those of CLU’s own top-level modules and
+        packages are omitted. Returns the manifest dictionary.
+    """
+    from clu.constants import consts
+    import json, pkgutil
+    
+    import_clu_modules()
+    toplevels = frozenset(info.name for info \
+                                   in pkgutil.iter_modules((consts.BASEPATH,)))
+    
+    manifest = { name : dotpath for name, dotpath \
+                                 in Exporter.manifest().items() \
+                                 if name not in toplevels }
+    
+    with open(path or manifest_path, "w") as handle:
+        json.dump(manifest, handle, indent=4, sort_keys=True)
+    
+    return manifest
+
+@export
+def load_manifest(path=None):
+    """ Load the static export manifest for CLU – either from the specified
+        path, or the default location – returning an empty dictionary if no
+        manifest has been written (q.v. “write_manifest(…)” supra.)
+    """
+    import json
+    
+    try:
+        with open(path or manifest_path, "r") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+
+# The lazy-loading “__getattr__(…)” and “__dir__()” for the “clu”
+# package itself – q.v. “clu.__getattr__(…)”:
+lazy_getattr, lazy_dir = lazy_attributes('clu', load_manifest)
+
 code_attrs = tuple(f'__code__.co_{attname}' for attname in ('names',
                                                             'varnames',
                                                             'cellvars',
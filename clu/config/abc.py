@@ -7,15 +7,18 @@ import collections
 import collections.abc
 import copy
 
+from functools import wraps
+
 abstract = abc.abstractmethod
 
 from clu.constants.consts import DEBUG, NAMESPACE_SEP, NoDefault, pytuple
-from clu.config.ns import concatenate_ns, prefix_for
-from clu.config.ns import unpack_ns, pack_ns, get_ns, compare_ns, namespace_matches
+from clu.config.ns import concatenate_ns, prefix_for, clean_ns
+from clu.config.ns import parse_ns, pack_ns, get_ns, compare_ns
 from clu.config.keymapview import KeyMapKeysView, KeyMapItemsView, KeyMapValuesView
 from clu.config.keymapview import NamespaceWalkerKeysView, NamespaceWalkerItemsView
 from clu.config.keymapview import NamespaceWalkerValuesView
 from clu.config.keymaputils import freeze_class
+from clu.config.nstrie import NamespaceTrie
 
 from clu.naming import qualified_import, qualified_name, nameof
 from clu.predicates import (typeof,
@@ -170,21 +173,28 @@ class FrozenKeyMap(FrozenKeyMapBase):
         # Shortcut for unprefixed keys:
         if unprefixed:
             return cls({ nskey : self[nskey] \
-                     for nskey in self \
+                     for nskey in self.namespace_trie().unprefixed() \
                       if NAMESPACE_SEP not in nskey })
         
         # Shortcut for a lack of namespaces:
         if not namespaces:
             return cls(self)
         
-        # Iterate namespaces, taking those matching our namespaces
-        # for a new instance:
-        out = {}
-        for namespace in namespaces:
-            out.update({ nskey : self[nskey] \
-                     for nskey in self \
-                      if namespace_matches(nskey, namespace) })
-        return cls(out)
+        # Use the namespace trie to visit only those keys matching
+        # our namespaces, taking them for a new instance:
+        trie = self.namespace_trie()
+        return cls({ nskey : self[nskey] \
+                 for nskey in trie.keys(*namespaces, inclusive=True) })
+    
+    def namespace_trie(self):
+        """ Return a “NamespaceTrie” prefix index of the namespaced keys
+            in the mapping, for efficient per-namespace key retrieval.
+            
+            This implementation builds a new trie with every call; types
+            whose contents can’t change behind their backs may cache the
+            trie instead, as do “FrozenFlat” and “FrozenNested”.
+        """
+        return NamespaceTrie(self)
 
     def keys(self, *namespaces, unprefixed=False):
         """ Return a namespaced view over either all keys in the mapping,
@@ -354,7 +364,38 @@ class NamespaceWalker(FrozenKeyMap):
         derived from this StackOverflow answer:
         
             • https://stackoverflow.com/a/12507546/298171
+        
+        Subclasses may also opt into an index of namespaced keys, by passing
+        the “indexed” class keyword, like so:
+        
+            class IndexedWalker(NamespaceWalker, indexed=True):
+                # …
+        
+        … The index is a dict mapping packed namespaced keys to their values,
+        built lazily from one call to “walk(…)” the first time it is needed.
+        After that, “__iter__()”, “__len__()”, “__contains__(…)” and
+        “__getitem__(…)” are all served from the index – and the index is
+        discarded whenever a subclass’ “__setitem__(…)”, “__delitem__(…)”
+        or “clear(…)” is called. Subclasses that mutate their backing store
+        by other means should call “invalidate()” themselves. Indexed
+        NamespaceWalkers also cache their “NamespaceTrie” (q.v. the method
+        “namespace_trie()” supra.) which is invalidated along with the index.
     """
+    __slots__ = ('nsindex', 'nstrie')
+    
+    def __init_subclass__(cls, indexed=None, **kwargs):
+        """ Translate the “indexed” class keyword into a class attribute,
+            and wrap any mutator methods defined by the subclass such that
+            calling them will invalidate the instance’s index
+        """
+        super().__init_subclass__(**kwargs)
+        if indexed is not None:
+            cls.indexed = bool(indexed)
+        for name in ('__setitem__', '__delitem__', 'clear'):
+            if name in cls.__dict__:
+                setattr(cls, name, invalidates(cls.__dict__[name]))
+    
+    indexed = False
     
     @abstract
     def walk(self):
@@ -366,8 +407,9 @@ class NamespaceWalker(FrozenKeyMap):
                 for *fragments, key, value in self.walk():
                     # …
             
-            … So an item with no namespace prefix would yield “['key', 'value']”,
-            but one with three would yield “['do', 're', 'me', 'key', 'value']”.
+            … So an item with no namespace prefix would yield “('key', 'value')”,
+            but one with three would yield “('do', 're', 'me', 'key', 'value')”.
+            Any sequence will do, but tuples are cheapest to build (and to unpack).
             
             See the “mapwalk(…)” and “envwalk(…)” function implementations,
             for practical examples of how this can work. “mapwalk(…)” iterates
@@ -383,6 +425,37 @@ class NamespaceWalker(FrozenKeyMap):
         """
         ...
     
+    def _get_nsindex(self):
+        """ Return the namespaced-key index, building it first if necessary.
+            Returns None for instances of classes that haven’t opted in.
+        """
+        if not self.indexed:
+            return None
+        index = getattr(self, 'nsindex', None)
+        if index is None:
+            index = self.nsindex = { pack_ns(key, *fragments) : value \
+                                 for *fragments, key, value in self.walk() }
+        return index
+    
+    def invalidate(self):
+        """ Discard the namespaced-key index and namespace trie, if either
+            has been built – they will be rebuilt as needed upon the next
+            lookup.
+        """
+        self.nsindex = None
+        self.nstrie = None
+    
+    def namespace_trie(self):
+        """ Return a “NamespaceTrie” prefix index of the namespaced keys
+            in the mapping – cached, for indexed NamespaceWalkers.
+        """
+        if not self.indexed:
+            return NamespaceTrie(self)
+        trie = getattr(self, 'nstrie', None)
+        if trie is None:
+            trie = self.nstrie = NamespaceTrie(self._get_nsindex())
+        return trie
+    
     def flatten(self, cls=None):
         """ Dearticulate an articulated KeyMap instance into one that is flat. """
         if cls is None:
@@ -423,14 +496,24 @@ class NamespaceWalker(FrozenKeyMap):
         return NamespaceWalkerValuesView(self, *namespaces)
     
     def __iter__(self):
+        index = self._get_nsindex()
+        if index is not None:
+            yield from index
+            return
         for *fragments, key, value in self.walk():
             yield pack_ns(key, *fragments)
     
     def __len__(self):
+        index = self._get_nsindex()
+        if index is not None:
+            return len(index)
         return iterlen(self.walk())
     
     def __contains__(self, nskey):
-        key, fragments = unpack_ns(nskey)
+        index = self._get_nsindex()
+        if index is not None:
+            return nskey in index or clean_ns(nskey) in index
+        key, fragments = parse_ns(nskey)
         for *frags, k, value in self.walk():
             if k == key:
                 if compare_ns(frags, fragments):
@@ -438,13 +521,44 @@ class NamespaceWalker(FrozenKeyMap):
         return False
     
     def __getitem__(self, nskey):
-        key, fragments = unpack_ns(nskey)
+        index = self._get_nsindex()
+        if index is not None:
+            try:
+                return index[nskey]
+            except KeyError:
+                cleaned = clean_ns(nskey)
+                if cleaned in index:
+                    return index[cleaned]
+            raise KeyError(nskey)
+        key, fragments = parse_ns(nskey)
         for *frags, k, value in self.walk():
             if k == key:
                 if compare_ns(frags, fragments):
                     return value
         raise KeyError(nskey)
 
+@export
+def invalidates(function):
+    """ Decorate a NamespaceWalker mutator method, such that calling
+        it will invalidate the namespaced-key index of the instance.
+        
+        This is applied automatically to any “__setitem__(…)”,
+        “__delitem__(…)” and “clear(…)” methods defined on
+        NamespaceWalker subclasses.
+    """
+    if getattr(function, '__invalidates__', False):
+        return function
+    
+    @wraps(function)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            self.invalidate()
+    
+    wrapper.__invalidates__ = True
+    return wrapper
+
 # NON-KEYMAP ABC STRUCTURES: FlatOrderedSet
 
 @export
@@ -9,7 +9,7 @@ import sys
 
 from clu.constants.consts import APPNAME, NoDefault
 from clu.config.abc import KeyMap, NamespaceWalker
-from clu.config.ns import pack_ns, prefix_env, unpack_env, nskey_from_env, nskey_to_env
+from clu.config.ns import pack_ns, parse_ns, prefix_env, unpack_env, nskey_from_env, nskey_to_env
 from clu.typology import iterlen
 from clu.exporting import Exporter
 
@@ -26,14 +26,15 @@ def envwalk(appname, mapping):
         the format expected for a “walk(…)” function.
     """
     app_prefix = prefix_env(appname)
-    for envkey in (ek for ek in mapping.keys() if ek.startswith(app_prefix)):
-        an, key, fragments = unpack_env(envkey)
-        assert an == appname
-        yield fragments + [key, mapping[envkey]]
+    for envkey, value in mapping.items():
+        if envkey.startswith(app_prefix):
+            an, key, fragments = unpack_env(envkey)
+            assert an == appname
+            yield (*fragments, key, value)
 
 @export
 class FrozenEnviron(NamespaceWalker, clu.abstract.ReprWrapper,
-                                     clu.abstract.Cloneable):
+                                     clu.abstract.Cloneable, indexed=True):
     
     """ A concrete immutable – or frozen – KeyMap class wrapping a
         frozen copy of an environment-variable dictionary. Like
@@ -58,6 +59,14 @@ class FrozenEnviron(NamespaceWalker, clu.abstract.ReprWrapper,
         because it translates to the namespaced key “i:heard:you:like”,
         which, you will note, is different.
         
+        FrozenEnviron is an indexed NamespaceWalker: the variables bearing
+        its app prefix are filtered out of the environment and parsed into
+        namespaced keys just once, the first time they’re needed – after
+        which iteration, “len(…)” and “walk()” are all served from the
+        index. Pass “indexed=False” as a class keyword to a subclass in
+        order to scan the environment afresh on every walk. The wrapped
+        dictionary is always a private copy – of “os.environ”, by default,
+        or of the given environment mapping – so the index can’t go stale.
     """
     
     __slots__ = ('environment', 'appname')
@@ -74,16 +83,32 @@ class FrozenEnviron(NamespaceWalker, clu.abstract.ReprWrapper,
         """
         super().__init__()
         self.appname = appname or APPNAME
-        self.environment = environment is None \
-                       and os.environ.copy() \
-                        or environment
+        self.environment = dict(os.environ if environment is None else environment)
         if updates:
             self.environment.update(**updates)
     
     def walk(self):
         """ Iteratively walk the backend environment access dictionary. """
-        yield from envwalk(self.appname,
-                           self.environment)
+        if not self.indexed:
+            yield from envwalk(self.appname,
+                               self.environment)
+            return
+        for nskey, value in self._get_nsindex().items():
+            key, fragments = parse_ns(nskey)
+            yield (*fragments, key, value)
+    
+    def _get_nsindex(self):
+        """ Return the index of the app-prefixed environment variables,
+            building it first if necessary – directly, with “envwalk(…)”
+        """
+        if not self.indexed:
+            return None
+        index = getattr(self, 'nsindex', None)
+        if index is None:
+            index = self.nsindex = { pack_ns(key, *fragments) : value \
+                                 for *fragments, key, value \
+                                  in envwalk(self.appname, self.environment) }
+        return index
     
     def __contains__(self, nskey):
         envkey = nskey_to_env(self.appname, nskey)
@@ -131,24 +156,102 @@ class FrozenEnviron(NamespaceWalker, clu.abstract.ReprWrapper,
 @export
 class Environ(FrozenEnviron, KeyMap, contextlib.AbstractContextManager):
     
-    __slots__ = 'stash'
+    """ A concrete mutable KeyMap class wrapping a live environment-variable
+        dictionary – “os.environ” by default (q.v. “FrozenEnviron” supra.)
+        
+        Changes made via the instance itself discard the index of app-
+        prefixed variables outright. Since the environment may also be
+        changed out from under an Environ instance – by other code writing
+        to “os.environ”, say – the index records the names of the variables
+        behind its keys, and “walk()” reads their values afresh from the
+        environment every time. Before the index is used, those names are
+        checked against the app-prefixed names currently in the environment
+        – which costs only a prefix check of each name, with no parsing and
+        no values read – and the index is rebuilt if they differ.
+    """
+    
+    __slots__ = ('stash', 'fingerprint', 'envnames')
     
     def __init__(self, environment=None, appname=None, **updates):
         """ Initialize a KeyMap instance wrapping an environment-variable
             dictionary from a target dictionary, with a supplied appname.
         """
-        if environment is None:
-            environment = os.environ
-        
-        super().__init__(environment=environment,
-                             appname=appname,
-                                   **updates)
+        # N.B. “FrozenEnviron.__init__(…)” is skipped, as it would copy
+        # the environment – Environ wraps the live mapping:
+        super(FrozenEnviron, self).__init__()
+        self.appname = appname or APPNAME
+        self.environment = os.environ if environment is None else environment
+        if updates:
+            self.environment.update(**updates)
         self.stash = None
+        self.fingerprint = None
+        self.envnames = None
     
     def freeze(self):
-        return FrozenEnviron(environment=self.environment.copy(),
+        return FrozenEnviron(environment=self.environment,
                                  appname=self.appname)
     
+    def walk(self):
+        """ Iteratively walk the backend environment access dictionary,
+            reading the values of any indexed variables afresh
+        """
+        if not self.indexed:
+            yield from envwalk(self.appname,
+                               self.environment)
+            return
+        self._get_nsindex()
+        environment = self.environment
+        for nskey, envkey in self.envnames.items():
+            try:
+                value = environment[envkey]
+            except KeyError:
+                continue
+            key, fragments = parse_ns(nskey)
+            yield (*fragments, key, value)
+    
+    def _get_nsindex(self):
+        """ Return the index of the app-prefixed environment variables –
+            building it, along with its map of namespaced keys to variable
+            names, if it’s missing or if the app-prefixed variable names in
+            the environment have since changed
+        """
+        if not self.indexed:
+            return None
+        environment = self.environment
+        app_prefix = prefix_env(self.appname)
+        fingerprint = tuple(envkey for envkey in environment \
+                                    if envkey.startswith(app_prefix))
+        if self.fingerprint != fingerprint:
+            self.invalidate()
+            self.fingerprint = fingerprint
+        index = getattr(self, 'nsindex', None)
+        if index is None:
+            index, envnames = {}, {}
+            for envkey, value in environment.items():
+                if envkey.startswith(app_prefix):
+                    _, key, fragments = unpack_env(envkey)
+                    nskey = pack_ns(key, *fragments)
+                    index[nskey] = value
+                    envnames[nskey] = envkey
+            self.nsindex, self.envnames = index, envnames
+        return index
+    
+    def invalidate(self):
+        """ Discard the index, its map of variable names, and the namespace
+            trie, if any of these have been built
+        """
+        super().invalidate()
+        self.fingerprint = None
+        self.envnames = None
+    
+    def namespace_trie(self):
+        """ Return the “NamespaceTrie” prefix index of the namespaced keys
+            in the mapping – cached, but rebuilt with the index whenever the
+            backing environment changes
+        """
+        self._get_nsindex()
+        return super().namespace_trie()
+    
     def __setitem__(self, nskey, value):
         envkey = nskey_to_env(self.appname, nskey)
         self.environment[envkey] = value
@@ -160,10 +263,12 @@ class Environ(FrozenEnviron, KeyMap, contextlib.AbstractContextManager):
     def setenv(self, envkey, value):
         """ Set the value for a key directly in the backend environment. """
         self.environment[envkey] = value
+        self.invalidate()
     
     def unsetenv(self, envkey):
         """ Delete a key directly from the backend environment """
         del self.environment[envkey]
+        self.invalidate()
     
     def __enter__(self):
         self.stash = self.environment.copy()
@@ -176,6 +281,7 @@ class Environ(FrozenEnviron, KeyMap, contextlib.AbstractContextManager):
             self.environment.clear()
         finally:
             self.environment.update(self.stash or {})
+            self.invalidate()
         self.stash = None
         return exc_type is None
     
@@ -305,6 +411,58 @@ def test():
         assert nskey_from_env('YODOGG_KEY') == ('yodogg', 'key')
         assert nskey_from_env('YODOGG_') == ('yodogg', '')
     
+    class ScanningEnviron(Environ, indexed=False):
+        pass
+    
+    @inline.fixture
+    def bigenvironment():
+        """ An environment dictionary with 64 app-prefixed variables,
+            among 512 variables in total
+        """
+        out = { f"YODOGG_NS{idx % 8}_KEY{idx}" : str(idx) for idx in range(64) }
+        out.update({ f"OTHER_VAR{idx}" : str(idx) for idx in range(448) })
+        return out
+    
+    @inline
+    def test_environ_change_detection():
+        """ Environ index rebuilding upon external changes """
+        environment = dict(bigenvironment())
+        env = Environ(environment=environment, appname='yodogg')
+        assert len(env) == 64
+        index = env.nsindex
+        assert len(env) == 64
+        assert env.nsindex is index
+        environment['YODOGG_NS0_KEY0'] = 'yo dogg'
+        assert dict(env.items())['ns0:key0'] == 'yo dogg'
+        assert dict(env.flatten().items())['ns0:key0'] == 'yo dogg'
+        assert env.nsindex is index
+        environment['YODOGG_WAT'] = 'hax'
+        assert 'wat' in tuple(env)
+        assert 'wat' in env.namespace_trie()
+        assert env.nsindex is not index
+        del environment['YODOGG_WAT']
+        environment['YODOGG_WAT2'] = 'hax'
+        assert 'wat2' in tuple(env)
+        assert 'wat' not in tuple(env)
+    
+    @inline
+    def test_environ_walk_scanning():
+        """ Baseline: scan the environment for every walk """
+        env = ScanningEnviron(environment=bigenvironment(), appname='yodogg')
+        for idx in range(10):
+            for *fragments, key, value in env.walk():
+                pass
+            assert len(env) == 64
+    
+    @inline
+    def test_environ_walk_indexed():
+        """ Walk the environment from its pre-parsed index """
+        env = Environ(environment=bigenvironment(), appname='yodogg')
+        for idx in range(10):
+            for *fragments, key, value in env.walk():
+                pass
+            assert len(env) == 64
+    
     @inline.diagnostic
     def show_environment():
         """ Show environment variables """
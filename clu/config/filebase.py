@@ -3,7 +3,9 @@ from __future__ import print_function
 
 import abc
 import clu.abstract
+import hashlib
 import os
+import pickle
 import sys
 
 abstract = abc.abstractmethod
@@ -11,16 +13,20 @@ abstract = abc.abstractmethod
 from clu.constants.enums import System, SYSTEM
 from clu.config.keymap import Nested
 from clu.fs.appdirectories import AppDirs
-from clu.fs.filesystem import TemporaryName, Directory
+from clu.fs.filesystem import TemporaryName, TemporaryDirectory, Directory
 from clu.fs.misc import extension, filesize
 from clu.fs import pypath
 from clu.predicates import isiterable
 from clu.typology import isvalidpath
+from clu.naming import qualified_name
 from clu.exporting import Exporter
 
 exporter = Exporter(path=__file__)
 export = exporter.decorator()
 
+# The “tree” slot descriptor, wrapped by “FileBase.tree” sub.:
+treeslot = Nested.tree
+
 @export
 class FileName(clu.abstract.AppName, metaclass=abc.ABCMeta):
     
@@ -136,6 +142,122 @@ class FileName(clu.abstract.AppName, metaclass=abc.ABCMeta):
             raise FileNotFoundError(f"Couldn’t find config file {file_name}")
         return Directory(root_dir.realpath()).subpath(file_name)
 
+@export
+class FileCache(metaclass=clu.abstract.Slotted):
+    
+    """ A persistent on-disk cache of parsed config-file trees.
+        
+        Each entry is a pickle file, named for a key derived from the
+        arguments used to locate a config file, which records the path
+        to the file that was found, its modification time, size and
+        content digest, and the tree that was parsed from it.
+        
+        An entry is valid while the file’s modification time and size
+        are unchanged – or, failing that, while its content digest is
+        unchanged, in which case the entry is refreshed in place. Stale,
+        truncated or otherwise unreadable entries are treated as misses.
+        
+        N.B. Cache hits skip the file search, too: a config file newly
+        placed somewhere earlier in the search order will not be found
+        until the cached file itself changes, or the cache is cleared.
+    """
+    
+    __slots__ = ('directory',)
+    
+    suffix = 'pickle'
+    
+    def __init__(self, directory):
+        """ Initialize a FileCache with the path to its directory,
+            which will be created upon the first write if necessary
+        """
+        self.directory = os.fspath(directory)
+    
+    @classmethod
+    def for_appname(cls, appname):
+        """ Return a FileCache for an app’s user cache directory """
+        appdir = AppDirs(appname=appname)
+        return cls(os.path.join(appdir.user_cache_dir, 'config'))
+    
+    @staticmethod
+    def keyfor(*components):
+        """ Compute a cache key from arbitrary hashable components """
+        digester = hashlib.blake2b(digest_size=16)
+        digester.update(bytes(repr(components), encoding='utf-8'))
+        return digester.hexdigest()
+    
+    @staticmethod
+    def digest(contents):
+        """ Compute the content digest for some raw file data """
+        return hashlib.blake2b(contents).hexdigest()
+    
+    def entrypath(self, key):
+        """ The path to the entry file for a given key """
+        return os.path.join(self.directory, f"{key}.{self.suffix}")
+    
+    def get(self, key):
+        """ Return a tuple (filepath, tree) for a valid cache entry,
+            or None if the key is missing or its entry is stale
+        """
+        try:
+            with open(self.entrypath(key), "rb") as handle:
+                entry = pickle.load(handle)
+            stat = os.stat(entry['filepath'])
+        except (OSError, EOFError, KeyError, TypeError,
+                pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        
+        if (stat.st_mtime_ns, stat.st_size) != (entry['mtime'], entry['size']):
+            # The file was touched – check its contents:
+            try:
+                with open(entry['filepath'], "rb") as handle:
+                    contents = handle.read()
+            except OSError:
+                return None
+            if self.digest(contents) != entry['digest']:
+                return None
+            self.set(key, entry['filepath'], contents, entry['tree'])
+        
+        return entry['filepath'], entry['tree']
+    
+    def set(self, key, filepath, contents, tree):
+        """ Store the parsed tree for a file, along with the file’s
+            modification time, size and content digest. Returns True
+            if the entry was written, and False otherwise.
+        """
+        try:
+            stat = os.stat(filepath)
+            entry = { 'filepath' : os.fspath(filepath),
+                         'mtime' : stat.st_mtime_ns,
+                          'size' : stat.st_size,
+                        'digest' : self.digest(contents),
+                          'tree' : tree }
+            dumped = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+            os.makedirs(self.directory, exist_ok=True)
+            # Write atomically, so concurrent readers never see
+            # a partially-written entry:
+            temppath = f"{self.entrypath(key)}.{os.getpid()}"
+            with open(temppath, "wb") as handle:
+                handle.write(dumped)
+            os.replace(temppath, self.entrypath(key))
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            return False
+        return True
+    
+    def discard(self, key):
+        """ Remove the entry for a given key, if present """
+        try:
+            os.unlink(self.entrypath(key))
+        except FileNotFoundError:
+            return False
+        return True
+    
+    def clear(self):
+        """ Remove all entries from the cache """
+        if os.path.isdir(self.directory):
+            for entry in os.listdir(self.directory):
+                if entry.endswith(self.suffix):
+                    os.unlink(os.path.join(self.directory, entry))
+
 @export
 class FileBase(Nested, FileName): # type: ignore
     
@@ -157,8 +279,22 @@ class FileBase(Nested, FileName): # type: ignore
         will know immediately what they do. If in case, somehow,
         you don’t know, lookit the docstrings for the methods
         themselves, doggie. Yes.
+        
+        Instances constructed with “lazy=True” find their file, but
+        defer reading and parsing it until the tree is first accessed
+        (q.v. the “tree” property sub.) Subclasses whose “loads(…)”
+        method expects bytes, rather than text, should set the class
+        attribute “binary” to True.
+        
+        Instances constructed with “cached=True” – or with an instance
+        of “FileCache” (q.v. supra.) – keep their parsed trees in an
+        on-disk cache, keyed by the arguments used to locate the file.
+        Later constructions with the same arguments skip both the file
+        search and the parse, so long as the file has not changed.
     """
     
+    binary = False
+    
     def __init__(self, filepath=None, *args, **kwargs):
         """ FileBase __init__(…):
             
@@ -168,6 +304,8 @@ class FileBase(Nested, FileName): # type: ignore
                 • extra_site_dirs   (default: None)
                 • extra_user_dirs   (default: None)
                 • search_sys_path   (default: False)
+                • lazy              (default: False)
+                • cached            (default: False)
             
             * The “filepath” arg will be ignored if “FileName.find_file(…)”
               returns a valid path to a file
@@ -176,10 +314,37 @@ class FileBase(Nested, FileName): # type: ignore
         extra_site_dirs = kwargs.pop('extra_site_dirs', None)
         extra_user_dirs = kwargs.pop('extra_user_dirs', None)
         search_sys_path = kwargs.pop('search_sys_path', False)
+        lazy            = kwargs.pop('lazy', False)
+        cached          = kwargs.pop('cached', False)
+        
+        # Nothing pending, yet:
+        self.pending = None
+        
+        # Set up the parsed-tree cache, if any:
+        if cached is True:
+            cached = FileCache.for_appname(type(self).appname)
+        self.cache = cached or None
+        self.cachekey = None
         
         # Call super:
         super(FileBase, self).__init__(*args, **kwargs)
         
+        if self.cache is not None:
+            self.cachekey = self.cache.keyfor(qualified_name(type(self)),
+                                              isvalidpath(filepath) and os.fspath(filepath) or None,
+                                              filename,
+                                              tuple(sorted(map(os.fspath, extra_site_dirs or tuple()))),
+                                              tuple(sorted(map(os.fspath, extra_user_dirs or tuple()))),
+                                              search_sys_path,
+                                              os.environ.get('XDG_CONFIG_DIRS'),
+                                              os.environ.get('XDG_CONFIG_HOME'))
+            cacheentry = self.cache.get(self.cachekey)
+            if cacheentry is not None:
+                # Skip both the file search and the parse:
+                self.filepath, self.tree = cacheentry
+                self.nskeys = None
+                return
+        
         if isvalidpath(filepath):
             self.filepath = filepath
         else:
@@ -192,7 +357,24 @@ class FileBase(Nested, FileName): # type: ignore
                 self.filepath = filename
         
         if isvalidpath(self.filepath):
-            self.load()
+            if lazy:
+                self.pending = self.filepath
+                self.nskeys = None
+            else:
+                self.load()
+    
+    @property
+    def tree(self):
+        """ The nested dictionary tree of the config data – which, for
+            lazy instances, is loaded upon first access.
+        """
+        if self.pending is not None:
+            self.load(self.pending)
+        return treeslot.__get__(self)
+    
+    @tree.setter
+    def tree(self, tree):
+        treeslot.__set__(self, tree)
     
     @property
     def name(self):
@@ -242,10 +424,27 @@ class FileBase(Nested, FileName): # type: ignore
         if not isvalidpath(filepath):
             raise FileNotFoundError("No valid filepath available for load()")
         
-        with open(filepath, "r") as handle:
-            loaded = handle.read()
+        # Loading satisfies any pending lazy load:
+        self.pending = None
+        
+        with open(filepath, "rb") as handle:
+            contents = handle.read()
+        loaded = self.binary and contents or str(contents, encoding='utf-8')
         
-        return self.loads(loaded)
+        try:
+            out = self.loads(loaded)
+        finally:
+            self.invalidate()
+        
+        # Store the freshly parsed tree in the cache, if any:
+        if self.cachekey is not None and filepath == self.filepath:
+            self.cache.set(self.cachekey, filepath, contents, self.tree)
+        
+        # The tree was replaced wholesale, so we own all of it –
+        # and its namespaced keyset must be rebuilt, lazily:
+        self.owned = None
+        self.nskeys = None
+        return out
     
     @abstract
     def loads(self, loaded):
@@ -285,3 +484,111 @@ class FileBase(Nested, FileName): # type: ignore
 
 # Assign the modules’ `__all__` and `__dir__` using the exporter:
 __all__, __dir__ = exporter.all_and_dir()
+
+def test():
+    
+    from clu.testing.utils import inline
+    from clu.config.formats import JsonFile, PickleFile, TomlFile, YamlFile
+    
+    formats = (JsonFile, PickleFile, TomlFile, YamlFile)
+    
+    # A config tree with 32 sections of 4 subsections of 16 keys each:
+    bigtree = { f"section{idx}" : { f"sub{jdx}" : { f"key{kdx}" : f"value{kdx}" \
+                                                  for kdx in range(16) } \
+                                                  for jdx in range(4) } \
+                                                  for idx in range(32) }
+    
+    @inline.fixture
+    def configdir():
+        """ A temporary directory containing the config tree in each format """
+        tempdir = TemporaryDirectory(prefix="filebase-test-", change=False)
+        for cls in formats:
+            instance = cls()
+            instance.tree = bigtree
+            instance.dump(os.path.join(tempdir.name, cls.filename))
+        return tempdir
+    
+    @inline.fixture
+    def filecache():
+        """ A parsed-tree cache within the temporary directory """
+        return FileCache(os.path.join(configdir().name, 'cache'))
+    
+    def first_read(cls, lazy=False, cached=False):
+        """ Load a config file, and read a single value from it """
+        instance = cls(os.path.join(configdir().name, cls.filename),
+                       lazy=lazy, cached=cached and filecache())
+        assert instance['section16:sub2:key8'] == 'value8'
+        return instance
+    
+    @inline.precheck
+    def check_lazy_load_on_first_access():
+        """ Lazy FileBase instances parse upon first access """
+        for cls in formats:
+            instance = cls(os.path.join(configdir().name, cls.filename), lazy=True)
+            assert instance.pending == instance.filepath
+            assert treeslot.__get__(instance) == {}
+            assert 'section31:sub3:key15' in instance
+            assert instance.pending is None
+            assert instance.tree == bigtree
+            assert len(instance) == 32 * 4 * 16
+    
+    @inline
+    def test_json_first_read():
+        """ JSON: eager load-to-first-read """
+        first_read(JsonFile, lazy=False)
+    
+    @inline
+    def test_pickle_first_read():
+        """ Pickle: eager load-to-first-read """
+        first_read(PickleFile, lazy=False)
+    
+    @inline
+    def test_toml_first_read():
+        """ TOML: eager load-to-first-read """
+        first_read(TomlFile, lazy=False)
+    
+    @inline
+    def test_yaml_first_read():
+        """ YAML: eager load-to-first-read """
+        first_read(YamlFile, lazy=False)
+    
+    @inline
+    def test_json_lazy_first_read():
+        """ JSON: lazy load-to-first-read """
+        first_read(JsonFile, lazy=True)
+    
+    @inline
+    def test_pickle_lazy_first_read():
+        """ Pickle: lazy load-to-first-read """
+        first_read(PickleFile, lazy=True)
+    
+    @inline
+    def test_toml_lazy_first_read():
+        """ TOML: lazy load-to-first-read """
+        first_read(TomlFile, lazy=True)
+    
+    @inline
+    def test_yaml_lazy_first_read():
+        """ YAML: lazy load-to-first-read """
+        first_read(YamlFile, lazy=True)
+    
+    @inline
+    def test_toml_cached_first_read():
+        """ TOML: cached load-to-first-read """
+        first_read(TomlFile, cached=True)
+    
+    @inline
+    def test_yaml_cached_first_read():
+        """ YAML: cached load-to-first-read """
+        first_read(YamlFile, cached=True)
+    
+    @inline.diagnostic
+    def cleanup():
+        """ Remove the temporary config directory """
+        configdir().close()
+    
+    # Run all inline tests:
+    return inline.test(100)
+
+if __name__ == '__main__':
+    sys.exit(test())
@@ -29,6 +29,8 @@ class PickleFileBase(FileBase, Nested):
         many related class methods). 
     """
     
+    binary = True
+    
     def loads(self, loaded):
         """ Load nested namespaced dictionary data from a pickle-encoded string """
         self.tree = pickle.loads(loaded)
@@ -3,6 +3,11 @@ from __future__ import print_function
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as Loader
+except ImportError:
+    from yaml import SafeLoader as Loader
+
 from clu.constants.consts import PROJECT_NAME
 # from clu.config.keymap import FrozenNested
 from clu.config.keymap import Nested
@@ -34,7 +39,7 @@ class YamlFileBase(FileBase, Nested):
     
     def loads(self, loaded):
         """ Load nested namespaced dictionary data from a YAML-encoded string """
-        self.tree = yaml.load(loaded)
+        self.tree = yaml.load(loaded, Loader=Loader)
     
     def dumps(self):
         """ Dump a YAML-encoded string from nested namespaced dictionary data """
@@ -7,6 +7,7 @@ import sys, re
 
 from clu.config import abc, ns
 from clu.config.keymaputils import thaw_name, thaw_class, freeze_name, freeze_class
+from clu.config.nstrie import NamespaceTrie
 from clu.constants import consts
 from clu.predicates import tuplize, typeof
 from clu.typology import ismapping, isset
@@ -24,9 +25,9 @@ def flatwalk(mapping):
         
         Based on https://stackoverflow.com/a/12507546/298171
     """
-    for nskey in mapping.keys():
-        key, fragments = ns.unpack_ns(nskey)
-        yield fragments + [key, mapping[nskey]]
+    for nskey, value in mapping.items():
+        key, fragments = ns.parse_ns(nskey)
+        yield (*fragments, key, value)
 
 @export
 def articulate(mapping, walker=flatwalk):
@@ -52,7 +53,7 @@ class FrozenFlat(abc.FrozenKeyMap, clu.abstract.ReprWrapper,
     
     """ A concrete immutable – or frozen – KeyMap class with a flat internal topology. """
     
-    __slots__ = 'dictionary'
+    __slots__ = ('dictionary', 'nstrie')
     
     def __init__(self, dictionary=None, **updates):
         """ Initialize a flat KeyMap instance from a target dictionary.
@@ -72,11 +73,25 @@ class FrozenFlat(abc.FrozenKeyMap, clu.abstract.ReprWrapper,
         
         # Assign things:
         self.dictionary = dict(dictionary or {})
+        self.nstrie = None
         if updates:
             self.dictionary.update(**updates)
     
     def thaw(self):
-        return thaw_class(type(self))(dictionary=copy.copy(self.dictionary))
+        return self._share(thaw_class(type(self)))
+    
+    def _share(self, cls):
+        """ Return a new instance of “cls” sharing this instance’s dictionary
+            (and namespace trie, if any) – instead of copying it. Mutable
+            instances copy a shared dictionary upon their first write,
+            q.v. “Flat._writable()” sub.
+        """
+        out = cls()
+        out.dictionary = self.dictionary
+        out.nstrie = self.nstrie
+        if isinstance(out, Flat):
+            out.shared = True
+        return out
     
     def nestify(self, cls=None, walker=flatwalk):
         """ Articulate a flattened KeyMap instance out into one that is nested. """
@@ -85,6 +100,14 @@ class FrozenFlat(abc.FrozenKeyMap, clu.abstract.ReprWrapper,
         return cls(tree=articulate(self.dictionary, walker=walker),
                 nskeyset=frozenset(self.keys()))
     
+    def namespace_trie(self):
+        """ Return the (cached) “NamespaceTrie” prefix index of the
+            namespaced keys in the mapping
+        """
+        if self.nstrie is None:
+            self.nstrie = NamespaceTrie(self.dictionary)
+        return self.nstrie
+    
     def __iter__(self):
         yield from self.dictionary
     
@@ -104,8 +127,9 @@ class FrozenFlat(abc.FrozenKeyMap, clu.abstract.ReprWrapper,
         return repr(self.dictionary)
     
     def clone(self, deep=False, memo=None):
-        copier = deep and copy.deepcopy or copy.copy
-        return type(self)(dictionary=copier(self.dictionary))
+        if deep:
+            return type(self)(dictionary=copy.deepcopy(self.dictionary, memo))
+        return self._share(type(self))
     
     def to_dict(self):
         """ Used by `clu.config.codecs` to serialize the keymap """
@@ -114,50 +138,49 @@ class FrozenFlat(abc.FrozenKeyMap, clu.abstract.ReprWrapper,
 @export
 class Flat(FrozenFlat, abc.KeyMap):
     
-    """ A concrete mutable KeyMap class with a flat internal topology. """
+    """ A concrete mutable KeyMap class with a flat internal topology.
+        
+        Freezing, thawing or cloning a Flat instance shares its dictionary
+        with the new instance, rather than copying it; the dictionary is
+        then copied (once) by whichever mutable instance writes to it first.
+    """
+    
+    __slots__ = ('shared',)
+    
+    def __init__(self, dictionary=None, **updates):
+        """ Initialize a mutable flat KeyMap instance from a target dictionary. """
+        super().__init__(dictionary, **updates)
+        self.shared = False
     
     def freeze(self):
-        return freeze_class(type(self))(dictionary=copy.copy(self.dictionary))
+        return self._share(freeze_class(type(self)))
+    
+    def _share(self, cls):
+        # Our dictionary is no longer ours alone:
+        self.shared = True
+        return super()._share(cls)
+    
+    def _writable(self):
+        """ Return the instance dictionary, for writing – first copying it,
+            if it is shared with another instance. The namespace trie is
+            discarded along with a shared dictionary, to be rebuilt lazily.
+        """
+        if self.shared:
+            self.dictionary = dict(self.dictionary)
+            self.nstrie = None
+            self.shared = False
+        return self.dictionary
     
     def __setitem__(self, nskey, value):
-        self.dictionary[nskey] = value
+        dictionary = self._writable()
+        if self.nstrie is not None and nskey not in dictionary:
+            self.nstrie.add(nskey)
+        dictionary[nskey] = value
     
     def __delitem__(self, nskey):
-        del self.dictionary[nskey]
-    
-    def keys(self, *namespaces, unprefixed=False):
-        """ Return a namespaced view over either all keys in the mapping,
-            or over only those keys in the mapping which match the specified
-            namespace values.
-        """
-        if unprefixed:
-            return super().keys(unprefixed=True)
-        if not namespaces:
-            return super().keys()
-        return (key for key in self.dictionary.keys() \
-                if any(ns.namespace_matches(key, namespace) for namespace in namespaces))
-    
-    def items(self, *namespaces, unprefixed=False):
-        """ Return a namespaced view over either all key/value pairs in the
-            mapping, or over only those key/value pairs in the mapping whose
-            keys match the specified namespace values.
-        """
-        if unprefixed or not namespaces:
-            return super().items(unprefixed=unprefixed)
-        return ((key, value) for key, value in self.dictionary.items() \
-                if any(ns.namespace_matches(key, namespace) for namespace in namespaces))
-    
-    def values(self, *namespaces, unprefixed=False):
-        """ Return a namespaced view over either all values in the mapping,
-            or over only those values in the mapping whose keys match the
-            specified namespace values.
-        """
-        if unprefixed:
-            return super().values(unprefixed=True)
-        if not namespaces:
-            return super().values()
-        return (value for key, value in self.dictionary.items() \
-                if any(ns.namespace_matches(key, namespace) for namespace in namespaces))
+        del self._writable()[nskey]
+        if self.nstrie is not None:
+            self.nstrie.discard(nskey)
 
 @export
 def dictify(treeish, cls=dict):
@@ -174,17 +197,36 @@ def dictify(treeish, cls=dict):
 def mapwalk(mapping, pre=None):
     """ Iteratively walk a nested mapping.
         
+        Rather than recursing, this uses an explicit stack of pairs of
+        namespace-prefix tuples and item iterators. Each prefix tuple is
+        built once per nested mapping and shared by all of its items, which
+        are yielded as “(*fragments, key, value)” tuples – in the same
+        depth-first order as the recursive version.
+        
         Based on https://stackoverflow.com/a/12507546/298171
     """
-    pre = pre and pre[:] or []
-    if ismapping(mapping):
-        for key, value in mapping.items():
-            if ismapping(value):
-                yield from mapwalk(value, pre + [key])
-            else:
-                yield pre + [key, value]
-    else:
+    if not ismapping(mapping):
         yield mapping
+        return
+    
+    # Leaf values are overwhelmingly of a handful of types, so the
+    # results of “ismapping(…)” are memoized by type for the walk:
+    mappingtypes = { dict : True }
+    stack = [(tuple(pre or ()), iter(mapping.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            cls = type(value)
+            try:
+                nested = mappingtypes[cls]
+            except KeyError:
+                nested = mappingtypes[cls] = ismapping(value)
+            if nested:
+                stack.append(((*prefix, key), iter(value.items())))
+                break
+            yield (*prefix, key, value)
+        else:
+            stack.pop()
 
 # CONCRETE SUBCLASSES: FrozenNested and Nested
 
@@ -222,7 +264,7 @@ class FrozenNested(abc.NamespaceWalker, clu.abstract.ReprWrapper,
         self.tree = dictify(tree or {})
         if updates:
             for nskey, value in updates.items():
-                key, fragments = ns.unpack_ns(nskey)
+                key, fragments = ns.parse_ns(nskey)
                 d = self.tree
                 for fragment in fragments:
                     try:
@@ -239,15 +281,45 @@ class FrozenNested(abc.NamespaceWalker, clu.abstract.ReprWrapper,
         """ Iteratively walk the nested KeyMap’s tree of dicts. """
         yield from mapwalk(self.tree)
     
+    def namespace_trie(self):
+        """ Return the (cached) “NamespaceTrie” prefix index of the
+            namespaced keys in the mapping
+        """
+        trie = getattr(self, 'nstrie', None)
+        if trie is None:
+            trie = self.nstrie = NamespaceTrie(self.nskeyset())
+        return trie
+    
     def nskeyset(self):
         """ Walk the tree, and assemble a set of the namespaced keys """
         yield from (ns.pack_ns(key, *fragments) \
                for *fragments, key, value in self.walk() \
                    if not ismapping(value))
     
+    @staticmethod
+    def subkeys(mapping, *prefix):
+        """ Iterate over the namespaced keys of a subtree, prefixed with
+            the namespace fragments at which the subtree is rooted
+        """
+        yield from (ns.pack_ns(key, *prefix, *fragments) \
+               for *fragments, key, value in mapwalk(mapping))
+    
     def thaw(self):
-        return thaw_class(type(self))(tree=copy.copy(self.tree),
-                                  nskeyset=copy.copy(self.nskeys))
+        return self._share(thaw_class(type(self)))
+    
+    def _share(self, cls):
+        """ Return a new instance of “cls” sharing this instance’s tree,
+            keyset and namespace trie – instead of copying them. Mutable
+            instances copy the shared dicts along the path of each write,
+            q.v. “Nested._writable(…)” sub.
+        """
+        out = cls()
+        out.tree = self.tree
+        out.nskeys = self.nskeys
+        out.nstrie = getattr(self, 'nstrie', None)
+        if isinstance(out, Nested):
+            out.owned = {}
+        return out
     
     def submap(self, *namespaces, unprefixed=False, cls=None):
         """ Return a flattened mapping, if possible a mutable one,
@@ -269,15 +341,15 @@ class FrozenNested(abc.NamespaceWalker, clu.abstract.ReprWrapper,
         if not namespaces:
             return cls(self.tree, nskeyset=self.nskeys)
         
-        # Our namespaces, their output data:
-        ours = frozenset(self._get_namespace_foset().things)
+        # Our namespace trie, their output data:
+        ours = self.namespace_trie()
         theirs = {}
         
         # Go through the namespaces we were passed, and copy anything
         # we have that matches those namespaces into a new output dict –
         # wholesale and sans any namespaced-key prefixes:
         for namespace in namespaces:
-            if namespace not in ours:
+            if not ours.hasnamespace(namespace):
                 continue
             d = self.tree
             for fragment in ns.split_ns(namespace):
@@ -292,9 +364,10 @@ class FrozenNested(abc.NamespaceWalker, clu.abstract.ReprWrapper,
         return repr(self.tree)
     
     def clone(self, deep=False, memo=None):
-        copier = deep and copy.deepcopy or copy.copy
-        return type(self)(tree=copier(self.tree),
-                      nskeyset=copier(self.nskeys))
+        if deep:
+            return type(self)(tree=copy.deepcopy(self.tree, memo),
+                          nskeyset=copy.deepcopy(self.nskeys, memo))
+        return self._share(type(self))
     
     def to_dict(self):
         """ Used by `clu.config.codecs` to serialize the keymap """
@@ -304,10 +377,10 @@ class FrozenNested(abc.NamespaceWalker, clu.abstract.ReprWrapper,
     def __contains__(self, nskey):
         if not isset(self.nskeys):
             self.nskeys = frozenset(self.nskeyset())
-        return nskey in self.nskeys
+        return nskey in self.nskeys or ns.clean_ns(nskey) in self.nskeys
     
     def __getitem__(self, nskey):
-        key, fragments = ns.unpack_ns(nskey)
+        key, fragments = ns.parse_ns(nskey)
         d = self.tree
         for fragment in fragments:
             d = d[fragment]
@@ -318,8 +391,17 @@ class Nested(FrozenNested, abc.KeyMap):
     
     """ A concrete mutable KeyMap class with an articulated (or nested)
         internal topology.
+        
+        Freezing, thawing or cloning a Nested instance shares its tree with
+        the new instance, rather than copying it. Thereafter, each write
+        copies only those dicts along the path to the key being written
+        that are still shared – a.k.a. “path copying”. The “owned” slot
+        tracks the dicts that the instance has copied for itself; it is
+        None if the instance owns its entire tree outright.
     """
     
+    __slots__ = ('owned',)
+    
     def __init__(self, tree=None, *, nskeyset=None, **updates):
         """ Initialize an articulated (née “nested”) KeyMap instance from a
             target nested dictionary (or a “tree” of dicts).
@@ -329,32 +411,98 @@ class Nested(FrozenNested, abc.KeyMap):
         
         # Mutable-ize the keyset:
         self.nskeys = nskeyset and set(nskeyset) or set(self.nskeyset())
+        
+        # The tree was built for us by “dictify(…)”, so it’s all ours:
+        self.owned = None
     
     def freeze(self):
-        return freeze_class(type(self))(tree=copy.copy(self.tree),
-                                    nskeyset=frozenset(self.nskeys))
-    
-    def __setitem__(self, nskey, value):
-        key, fragments = ns.unpack_ns(nskey)
+        return self._share(freeze_class(type(self)))
+    
+    def _share(self, cls):
+        # Neither our tree nor our keyset is ours alone anymore:
+        if isinstance(self.nskeys, set):
+            self.nskeys = frozenset(self.nskeys)
+        self.owned = {}
+        return super()._share(cls)
+    
+    def _writable(self, fragments):
+        """ Return the dict for a sequence of namespace fragments, for
+            writing – creating any missing dicts along the way, and copying
+            any that are shared with another instance.
+        """
         d = self.tree
+        owned = self.owned
+        if owned is None:
+            for fragment in fragments:
+                try:
+                    d = d[fragment]
+                except KeyError:
+                    d[fragment] = {}
+                    d = d[fragment]
+            return d
+        
+        # Copy the shared dicts along the path, keeping references
+        # to the copies – so their ids stay unique while in “owned”:
+        if id(d) not in owned:
+            d = self.tree = dict(d)
+            owned[id(d)] = d
         for fragment in fragments:
             try:
-                d = d[fragment]
+                child = d[fragment]
             except KeyError:
-                d[fragment] = {}
-                d = d[fragment]
+                child = {}
+            else:
+                if id(child) in owned or not ismapping(child):
+                    d = child
+                    continue
+                child = dict(child)
+            owned[id(child)] = child
+            d[fragment] = child
+            d = child
+        return d
+    
+    def _writable_keys(self):
+        """ Return the namespaced keyset, for writing – first copying it,
+            if it is shared with another instance.
+        """
+        if not isinstance(self.nskeys, set):
+            self.nskeys = set(self.nskeys is None and self.nskeyset() or self.nskeys)
+        return self.nskeys
+    
+    def clear(self, *namespaces, unprefixed=False):
+        """ Remove all items from the mapping – either in totality,
+            or only those matching a specific namespace.
+        """
+        if namespaces or unprefixed:
+            return super().clear(*namespaces, unprefixed=unprefixed)
+        self.tree = {}
+        self.nskeys = set()
+        self.owned = None
+        return None
+    
+    def __setitem__(self, nskey, value):
+        key, fragments = ns.parse_ns(nskey)
+        d = self._writable(fragments)
+        nskeys = self._writable_keys()
+        
+        # Overwriting a namespace drops all of the keys within it:
+        if key in d and ismapping(d[key]):
+            nskeys.difference_update(self.subkeys(d[key], *fragments, key))
         d[key] = value
-        self.nskeys.add(nskey)
+        
+        # … whereas writing one adds all of those from the value:
+        if ismapping(value):
+            nskeys.discard(ns.clean_ns(nskey))
+            nskeys.update(self.subkeys(value, *fragments, key))
+        else:
+            nskeys.add(ns.clean_ns(nskey))
     
     def __delitem__(self, nskey):
         if nskey not in self:
             raise KeyError(nskey)
-        key, fragments = ns.unpack_ns(nskey)
-        d = self.tree
-        for fragment in fragments:
-            d = d[fragment]
-        del d[key]
-        self.nskeys.remove(nskey)
+        key, fragments = ns.parse_ns(nskey)
+        del self._writable(fragments)[key]
+        self._writable_keys().discard(ns.clean_ns(nskey))
 
 # Assign the modules’ `__all__` and `__dir__` using the exporter:
 __all__, __dir__ = exporter.all_and_dir()
@@ -568,6 +716,82 @@ def test():
         assert nested.submap(unprefixed=True) == FrozenNested({ 'type' : 'Program' })
         assert nested.submap() == dict(nested)
     
+    @inline
+    def test_nested_copy_on_write():
+        """ Nested copy-on-write path copying """
+        nested = Nested(tree=nestedmaps())
+        frozen = nested.freeze()
+        thawed = frozen.thaw()
+        assert thawed.tree is frozen.tree
+        thawed['body:declare_i:init:value'] = 3
+        assert frozen['body:declare_i:init:value'] == 2
+        assert thawed['body:declare_i:init:value'] == 3
+        assert thawed.tree['body']['declare_j'] is frozen.tree['body']['declare_j']
+        assert thawed.tree['body']['declare_i']['id'] is frozen.tree['body']['declare_i']['id']
+    
+    @inline.fixture
+    def bignested():
+        """ A Nested instance with 32 namespaces of 32 keys each """
+        flat = Flat({ f"ns{idx}:sub{jdx % 4}:key{jdx}" : jdx \
+                      for idx in range(32) \
+                      for jdx in range(32) })
+        return flat.nestify(cls=Nested)
+    
+    @inline
+    def test_nested_freeze_thaw_copying():
+        """ Baseline: freeze, thaw and write by copying the tree """
+        nested = bignested()
+        frozen = FrozenNested(tree=copy.copy(nested.tree),
+                          nskeyset=frozenset(nested.nskeys))
+        thawed = Nested(tree=copy.copy(frozen.tree),
+                    nskeyset=copy.copy(frozen.nskeys))
+        thawed['ns16:sub1:key1'] = 'yo dogg'
+    
+    @inline
+    def test_nested_freeze_thaw_sharing():
+        """ Copy-on-write: freeze, thaw and write by path copying """
+        nested = bignested()
+        frozen = nested.freeze()
+        thawed = frozen.thaw()
+        thawed['ns16:sub1:key1'] = 'yo dogg'
+        assert frozen['ns16:sub1:key1'] != 'yo dogg'
+    
+    def mapwalk_recursive(mapping, pre=None):
+        """ The pre-iterative “mapwalk(…)” implementation """
+        pre = pre and pre[:] or []
+        if ismapping(mapping):
+            for key, value in mapping.items():
+                if ismapping(value):
+                    yield from mapwalk_recursive(value, pre + [key])
+                else:
+                    yield pre + [key, value]
+        else:
+            yield mapping
+    
+    @inline
+    def test_mapwalk_iterative_eq():
+        """ Iterative and recursive “mapwalk(…)” equivalence """
+        for tree in (nestedmaps(), bignested().tree):
+            assert tuple(mapwalk(tree)) == \
+                   tuple(tuple(path) for path in mapwalk_recursive(tree))
+        assert tuple(mapwalk(arbitrary(), pre=['yo'])) == (('yo', 'yo', 'dogg'),
+                                                           ('yo', 'iheard', 'you like dict literals'))
+        assert tuple(mapwalk('yo dogg')) == ('yo dogg',)
+    
+    @inline
+    def test_mapwalk_recursive():
+        """ Baseline: walk a nested tree recursively """
+        tree = bignested().tree
+        for *fragments, key, value in mapwalk_recursive(tree):
+            pass
+    
+    @inline
+    def test_mapwalk_iterative():
+        """ Walk a nested tree with an explicit stack """
+        tree = bignested().tree
+        for *fragments, key, value in mapwalk(tree):
+            pass
+    
     @inline.diagnostic
     def show_nested_contents():
         """ Evaluate submap(…) contents """
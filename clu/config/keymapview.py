@@ -10,7 +10,7 @@ import collections.abc
 abstract = abc.abstractmethod
 
 from clu.constants.consts import NAMESPACE_SEP, pytuple
-from clu.config.ns import concatenate_ns, pack_ns, unpack_ns, get_ns_and_key, namespace_matches
+from clu.config.ns import pack_ns, get_ns_and_key, namespace_matches
 
 from clu.predicates import isnormative, tuplize
 from clu.typology import isnumber, iterlen
@@ -34,9 +34,17 @@ class KeyMapViewBase(collections.abc.Sequence,
         specially kitted out to deal with KeyMap namespaces: each instance
         has a ‘mapping’ attribute referring to the parent KeyMap instance,
         a ‘namespaces’ iterable attribute with the unconcatenated namespace
-        parts for which the instance was allocated, and a ‘prefix’ shortcut
-        attribute containing the concatenated namespace parts as a string
-        prefix.
+        parts for which the instance was allocated, and a ‘submap’ property
+        that materializes the namespaced items as a new KeyMap instance –
+        which the views themselves avoid doing: namespaced keys are found
+        using the parent KeyMap’s “NamespaceTrie” prefix index.
+        
+        Views are also sequences: for positional indexing, slicing, and
+        reversal, they keep a cached tuple of their namespaced keys, which
+        is rebuilt only after the parent KeyMap’s keys have changed (as
+        indicated by the version of its “NamespaceTrie”). Parent KeyMaps
+        that build a new trie with every call, rather than keeping one,
+        offer no such indication – and their keys are gathered afresh.
         
         Each concrete subclass of KeyMapViewBase registers itself as a
         “virtual subclass” of its corresponding ‘collections.abc’ view
@@ -44,33 +52,104 @@ class KeyMapViewBase(collections.abc.Sequence,
     """
     
     __slots__ = pytuple('weakref') \
-              + tuplize('mapping', 'namespaces', 'submap')
+              + tuplize('mapping', 'namespaces', 'keycache')
+    
+    # Whether keys exactly equal to a namespace are considered
+    # to be within that namespace, as per “FrozenKeyMap.submap(…)”:
+    inclusive = True
     
     def __init__(self, mapping, *namespaces):
         """ Initialize a view on a KeyMap instance, for a given namespace """
         self.mapping = mapping
         self.namespaces = tuplize(namespaces)
-        if namespaces:
-            self.submap = self.mapping.submap(*self.namespaces)
-        else:
-            self.submap = self.mapping
+        self.keycache = None
+    
+    @property
+    def submap(self):
+        """ A KeyMap containing only the namespaced items in the view """
+        if not self.namespaces:
+            return self.mapping
+        return self.mapping.submap(*self.namespaces)
     
     @property
     def _mapping(self): # pragma: no cover
         """ For compatibility with “collections.abc” stuff """
         return self.submap
     
+    def _matches(self, nskey):
+        """ Return True if a namespaced key falls within the view’s namespaces """
+        if not self.namespaces:
+            return True
+        return any(namespace_matches(nskey, namespace) \
+               for namespace in self.namespaces)
+    
+    def _iterkeys(self):
+        """ Iterate over the namespaced keys in the view """
+        if not self.namespaces:
+            yield from self.mapping
+        else:
+            trie = self.mapping.namespace_trie()
+            yield from trie.keys(*self.namespaces, inclusive=self.inclusive)
+    
+    def _haskey(self, nskey):
+        """ Return True if a namespaced key is present in the view """
+        return self._matches(nskey) and nskey in self.mapping
+    
+    def _triekeys(self, trie):
+        """ Return a tuple of the namespaced keys in the view, using a
+            given “NamespaceTrie” of the parent mapping
+        """
+        if not self.namespaces:
+            return tuple(self.mapping)
+        return tuple(trie.keys(*self.namespaces, inclusive=self.inclusive))
+    
+    def _keyseq(self):
+        """ Return a tuple of the namespaced keys in the view, in order –
+            cached, and rebuilt only if the parent mapping’s keys have
+            changed since it was last built.
+            
+            Only a parent mapping that keeps its trie (as “nstrie”) can be
+            checked for changes; for any other, the keys are gathered anew
+            with each call, and the view stops trying to cache them.
+        """
+        if self.keycache is False:
+            return tuple(self._iterkeys())
+        trie = self.mapping.namespace_trie()
+        if trie is not getattr(self.mapping, 'nstrie', None):
+            self.keycache = False
+            return self._triekeys(trie)
+        if self.keycache is not None:
+            cachedtrie, version, keys = self.keycache
+            if cachedtrie is trie and version == trie.version:
+                return keys
+        keys = self._triekeys(trie)
+        self.keycache = (trie, trie.version, keys)
+        return keys
+    
+    def _element(self, nskey):
+        """ Return the view element corresponding to a namespaced key """
+        return nskey
+    
     def __len__(self):
-        return len(self.submap)
+        if not self.namespaces:
+            return len(self.mapping)
+        return iterlen(self._iterkeys())
     
     def __getitem__(self, idx):
         if isnormative(idx):
-            return self.submap[idx]
+            if not self._haskey(idx):
+                raise KeyError(idx)
+            return self.mapping[idx]
+        if isinstance(idx, slice):
+            return tuple(self._element(nskey) for nskey in self._keyseq()[idx])
         if isnumber(idx):
-            return tuple(self.submap)[idx]
+            return self._element(self._keyseq()[idx])
         tn = typename(idx)
         raise KeyError(f"bad index type: {tn}")
     
+    def __reversed__(self):
+        yield from (self._element(nskey) for nskey in reversed(self._keyseq()))
+    
     @abstract
     def __contains__(self, nskey):
         ...
@@ -95,10 +174,10 @@ class KeyMapKeysView(KeyMapViewBase,
     _from_iterable = classmethod(set_returner)
     
     def __contains__(self, nskey):
-        return nskey in self.submap
+        return self._haskey(nskey)
     
     def __iter__(self):
-        yield from self.submap
+        yield from self._iterkeys()
 
 @export
 @collections.abc.ItemsView.register
@@ -111,15 +190,20 @@ class KeyMapItemsView(KeyMapViewBase,
     
     def __contains__(self, item):
         nskey, value = item
+        if not self._matches(nskey):
+            return False
         try:
-            contained = self.submap[nskey]
+            contained = self.mapping[nskey]
         except KeyError:
             return False
         else:
             return contained is value or contained == value
     
+    def _element(self, nskey):
+        return (nskey, self.mapping[nskey])
+    
     def __iter__(self):
-        yield from ((nskey, self.mapping[nskey]) for nskey in self.submap)
+        yield from ((nskey, self.mapping[nskey]) for nskey in self._iterkeys())
 
 @export
 @collections.abc.ValuesView.register
@@ -129,27 +213,40 @@ class KeyMapValuesView(KeyMapViewBase,
     """ A KeyMap values view. """
     
     def __contains__(self, value):
-        for nskey in self.submap:
-            contained = self.submap[nskey]
+        for contained in self:
             if contained is value or contained == value:
                 return True
         return False
     
+    def _element(self, nskey):
+        return self.mapping[nskey]
+    
     def __iter__(self):
-        yield from (self.mapping[nskey] for nskey in self.submap)
+        yield from (self.mapping[nskey] for nskey in self._iterkeys())
 
 @export
 class NamespaceWalkerViewBase(KeyMapViewBase):
     
-    """ A view abstract base class tailored to NamespaceWalker types;
-        specifically, it overrides “__len__(…)” to better utilize
-        the underlying mapping types’ “walk(…)” method.
+    """ A view abstract base class tailored to NamespaceWalker types.
+        
+        Unlike the KeyMap views, NamespaceWalker views consider a key to
+        be within a namespace only if the key’s own namespace matches –
+        so e.g. a key “yo:dogg” is within the namespace “yo” but a key
+        “yo” is not. Un-namespaced views iterate using the underlying
+        mapping types’ “walk(…)” method, and defer to their “__len__(…)”
+        – which will use the namespaced-key index, for NamespaceWalker
+        types that have one.
     """
     
-    def __len__(self):
+    inclusive = False
+    
+    def _matches(self, nskey):
+        """ Return True if a namespaced key falls within the view’s namespaces """
         if not self.namespaces:
-            return iterlen(self.mapping.walk())
-        return len(self.submap)
+            return True
+        namespace, _ = get_ns_and_key(nskey)
+        return any(namespace_matches(namespace, prefix) \
+               for prefix in self.namespaces)
 
 @export
 @collections.abc.KeysView.register
@@ -161,21 +258,13 @@ class NamespaceWalkerKeysView(NamespaceWalkerViewBase,
     _from_iterable = classmethod(set_returner)
     
     def __contains__(self, nskey):
-        namespace, key = get_ns_and_key(nskey)
-        if not self.namespaces:
-            return nskey in self.mapping
-        if any(namespace_matches(namespace, ns) for ns in self.namespaces):
-            return nskey in self.submap
-        return False
+        return self._haskey(nskey)
     
     def __iter__(self):
         if not self.namespaces:
             yield from (pack_ns(key, *frags) for *frags, key, _ in self.mapping.walk())
         else:
-            for *fragments, key, value in self.mapping.walk():
-                ns = concatenate_ns(*fragments)
-                if any(namespace_matches(ns, prefix) for prefix in self.namespaces):
-                    yield pack_ns(key, *fragments)
+            yield from self._iterkeys()
 
 @export
 @collections.abc.ItemsView.register
@@ -188,23 +277,19 @@ class NamespaceWalkerItemsView(NamespaceWalkerViewBase,
     
     def __contains__(self, item):
         nskey, putative = item
-        key, *fragments = unpack_ns(nskey)
-        thing = ...
-        if not self.namespaces:
-            thing = self.mapping.get(key, *fragments, default=None)
-        ns = concatenate_ns(*fragments)
-        if any(namespace_matches(ns, prefix) for prefix in self.namespaces):
-            thing = self.submap.get(key, *fragments, default=None)
-        return thing == putative
+        if not self._haskey(nskey):
+            return False
+        thing = self.mapping[nskey]
+        return thing is putative or thing == putative
+    
+    def _element(self, nskey):
+        return (nskey, self.mapping[nskey])
     
     def __iter__(self):
         if not self.namespaces:
             yield from ((pack_ns(key, *frags), val) for *frags, key, val in self.mapping.walk())
         else:
-            for *fragments, key, value in self.mapping.walk():
-                ns = concatenate_ns(*fragments)
-                if any(namespace_matches(ns, prefix) for prefix in self.namespaces):
-                    yield (pack_ns(key, *fragments), value)
+            yield from ((nskey, self.mapping[nskey]) for nskey in self._iterkeys())
 
 @export
 @collections.abc.ValuesView.register
@@ -214,20 +299,16 @@ class NamespaceWalkerValuesView(NamespaceWalkerViewBase,
     """ A values view specifically tailored to NamespaceWalker types. """
     
     def __contains__(self, putative):
-        for *fragments, _, value in self.mapping.walk():
+        for value in self:
             if putative is value or putative == value:
-                ns = concatenate_ns(*fragments)
-                if any(namespace_matches(ns, prefix) for prefix in self.namespaces):
-                    return True
-                if not self.namespaces:
-                    return True
+                return True
         return False
     
+    def _element(self, nskey):
+        return self.mapping[nskey]
+    
     def __iter__(self):
         if not self.namespaces:
             yield from (value for *_, _, value in self.mapping.walk())
         else:
-            for *fragments, _, value in self.mapping.walk():
-                ns = concatenate_ns(*fragments)
-                if any(namespace_matches(ns, prefix) for prefix in self.namespaces):
-                    yield value
\ No newline at end of file
+            yield from (self.mapping[nskey] for nskey in self._iterkeys())
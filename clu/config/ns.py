@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function
+from functools import lru_cache
 from itertools import chain, zip_longest
 
 import re
@@ -12,6 +13,9 @@ from clu.exporting import Exporter
 exporter = Exporter(path=__file__)
 export = exporter.decorator()
 
+# Bounded memoization for the namespaced-key parsing functions:
+cache = lambda function: lru_cache(maxsize=4096, typed=False)(function)
+
 # Some REGULAR EXPRESSIONS, for CLEANING NAMESPACED KEYS:
 
 sepmatcher = re.compile(rf"({NAMESPACE_SEP})+", re.IGNORECASE)
@@ -24,22 +28,59 @@ septrimmer = Partial(endmatcher.sub, '')
 spacenixer = Partial(nilmatcher.sub, '')
 sepreducer = Partial(sepmatcher.sub, NAMESPACE_SEP)
 
+doublesep = NAMESPACE_SEP * 2
+
 # THE NAMESPACE-MANIPULATION FUNCTION API:
 
 @export
+def canonical_ns(nskey):
+    """ Return True if a namespaced key is already clean – that is, if
+        “clean_ns(…)” would return it unchanged.
+        
+        This is checked without using any regular expressions: a key with
+        no whitespace, no repeated namespace separators, and no separators
+        at either end is canonical. N.B. “str.isprintable()” is False for
+        all whitespace characters besides the ASCII space.
+    """
+    return nskey.isprintable() \
+       and ' ' not in nskey \
+       and doublesep not in nskey \
+       and not nskey.startswith(NAMESPACE_SEP) \
+       and not nskey.endswith(NAMESPACE_SEP)
+
+@export
+@cache
 def clean_ns(nskey):
     """ Clean a namespaced key.
         
         This means reducing multiple namespace separators (“:”) to single
         occurrences, stripping any separators off the ends of the string,
         and trimming whitespace.
+        
+        Keys that are already canonical are returned as-is, without being
+        run through the regex substitutions; results are memoized.
     """
+    if canonical_ns(nskey):
+        return nskey
     out = nskey.strip(NAMESPACE_SEP)
     out = spacenixer(out)
     out = sepreducer(out)
     return out
 
 @export
+@cache
+def parse_ns(nskey):
+    """ Parse a namespaced key into a key name and a tuple of namespaces.
+        
+        This is the memoized fast path behind “unpack_ns(…)” – it returns
+        the same values, only with the namespaces as an immutable tuple
+        rather than a list. Prefer it in code that looks up keys often.
+    """
+    *namespaces, key = clean_ns(nskey).split(NAMESPACE_SEP)
+    return key, tuple(namespaces)
+
+@export
+@cache
 def get_ns_and_key(nskey):
     """ Get the namespace and key portion of a namespaced key, as a packed
         string and a bare key, respectively.
@@ -126,8 +167,8 @@ def unpack_ns(nskey):
         If the key is not namespaced (like e.g. “wat”) the “unpack_ns(…)”
         call will return the tuple ('wat', tuple()).
     """
-    *namespaces, key = split_ns(nskey)
-    return key, namespaces
+    key, namespaces = parse_ns(nskey)
+    return key, list(namespaces)
 
 @export
 def pack_ns(key, *fragments):
@@ -144,6 +185,7 @@ def pack_ns(key, *fragments):
     return NAMESPACE_SEP.join(chain(fragments, tuplize(key, expand=False)))
 
 @export
+@cache
 def get_ns(nskey):
     """ Get the namespace portion of a namespaced key as a packed string. """
     return clean_ns(nskey).rpartition(NAMESPACE_SEP)[0]
@@ -354,6 +396,67 @@ def test():
         assert baseline == clean_ns(dupes_and_end)
         assert baseline == clean_ns(dupes_and_both_ends)
     
+    @inline
+    def test_canonical_ns():
+        assert canonical_ns(baseline)
+        assert not canonical_ns(dupes)
+        assert not canonical_ns(dupes_and_end)
+        assert not canonical_ns(dupes_and_both_ends)
+        assert not canonical_ns('yo:dogg: iheard')
+        assert not canonical_ns('yo:dogg:\tiheard')
+        assert not canonical_ns('yo:dogg:\u00a0iheard')
+    
+    def clean_ns_regexes(nskey):
+        """ The pre-memoization “clean_ns(…)” implementation """
+        out = nskey.strip(NAMESPACE_SEP)
+        out = spacenixer(out)
+        out = sepreducer(out)
+        return out
+    
+    lookups = tuple(nskey for nskey in flat) * 10
+    
+    @inline
+    def test_clean_ns_regexes():
+        """ Benchmark: clean keys with regexes (the old way) """
+        for nskey in lookups:
+            clean_ns_regexes(nskey)
+    
+    @inline
+    def test_clean_ns_canonical():
+        """ Benchmark: clean keys with the canonical-key fast path """
+        for nskey in lookups:
+            clean_ns.__wrapped__(nskey)
+    
+    @inline
+    def test_clean_ns_memoized():
+        """ Benchmark: clean keys with the memoized “clean_ns(…)” """
+        for nskey in lookups:
+            clean_ns(nskey)
+    
+    @inline
+    def test_unpack_ns_memoized():
+        """ Benchmark: unpack keys with the memoized “parse_ns(…)” """
+        for nskey in lookups:
+            parse_ns(nskey)
+    
+    nestedkeys = tuple(nskey for nskey in nested) * 10
+    
+    @inline
+    def test_nested_lookups_regexes():
+        """ Benchmark: look up Nested keys, unpacked with regexes (the old way) """
+        for nskey in nestedkeys:
+            *namespaces, key = clean_ns_regexes(nskey).split(NAMESPACE_SEP)
+            d = nested.tree
+            for namespace in namespaces:
+                d = d[namespace]
+            d[key]
+    
+    @inline
+    def test_nested_lookups_memoized():
+        """ Benchmark: look up Nested keys, unpacked with “parse_ns(…)” """
+        for nskey in nestedkeys:
+            nested[nskey]
+    
     appname = 'testing'
     envkey = "TESTING_YO_DOGG_IHEARD"
     
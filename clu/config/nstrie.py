@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+import clu.abstract
+import collections.abc
+import sys
+
+from clu.config.ns import split_ns
+from clu.exporting import Exporter
+
+exporter = Exporter(path=__file__)
+export = exporter.decorator()
+
+@export
+class NamespaceNode(metaclass=clu.abstract.Slotted):
+    
+    """ A single node in a NamespaceTrie (q.v. class definition sub.)
+        
+        Each node has an ordered dict of child nodes, keyed by namespace
+        fragment, and an optional “nskey” – which, if not None, is the
+        namespaced key (as it appears in the source mapping) for which
+        this node is the terminal node.
+    """
+    
+    __slots__ = ('nskey', 'children')
+    
+    def __init__(self):
+        self.nskey = None
+        self.children = {}
+    
+    def descendants(self):
+        """ Iterate over the namespaced keys of all descendant nodes,
+            depth-first, in insertion order – without recursion.
+        """
+        stack = [iter(self.children.values())]
+        while stack:
+            for child in stack[-1]:
+                if child.nskey is not None:
+                    yield child.nskey
+                if child.children:
+                    stack.append(iter(child.children.values()))
+                    break
+            else:
+                stack.pop()
+
+@export
+class NamespaceTrie(collections.abc.Sized,
+                    collections.abc.Iterable,
+                    collections.abc.Container,
+                    clu.abstract.ReprWrapper,
+                    metaclass=clu.abstract.Slotted):
+    
+    """ A prefix index over the namespaced keys of a KeyMap.
+        
+        Each namespace fragment in a namespaced key corresponds to a node
+        in the trie, so finding all of the keys under a given namespace
+        costs one step per fragment of the namespace, plus one step per
+        key found – that is to say, it takes time proportional to the
+        size of the output, rather than the size of the mapping.
+        
+        The trie stores the namespaced keys exactly as they appear in the
+        source mapping, so they can be used to look up values therein.
+        Iteration order follows the insertion order of the keys, grouped
+        by namespace; for a nested tree of dicts this is the same as the
+        order in which “mapwalk(…)” yields its items.
+        
+        The “version” attribute is incremented each time a key is added
+        or removed – consumers may use it to check the validity of any
+        data they derive from the trie (q.v. “KeyMapViewBase” et al.)
+    """
+    
+    __slots__ = ('root', 'count', 'version')
+    
+    def __init__(self, nskeys=None):
+        """ Initialize a NamespaceTrie, optionally from an iterable
+            of namespaced keys (e.g. a KeyMap instance)
+        """
+        self.root = NamespaceNode()
+        self.count = 0
+        self.version = 0
+        if nskeys is not None:
+            for nskey in nskeys:
+                self.add(nskey)
+    
+    def node_for(self, namespace):
+        """ Return the node for a namespace (or namespaced key),
+            or None if there is no such node in the trie.
+        """
+        node = self.root
+        for fragment in split_ns(namespace):
+            node = node.children.get(fragment)
+            if node is None:
+                return None
+        return node
+    
+    def add(self, nskey):
+        """ Add a namespaced key to the trie """
+        node = self.root
+        for fragment in split_ns(nskey):
+            child = node.children.get(fragment)
+            if child is None:
+                child = node.children[fragment] = NamespaceNode()
+            node = child
+        if node.nskey is None:
+            self.count += 1
+            self.version += 1
+        node.nskey = nskey
+    
+    def discard(self, nskey):
+        """ Remove a namespaced key from the trie, if present – pruning
+            any nodes left empty by the removal. Returns True if the
+            key was found, and False otherwise.
+        """
+        node = self.root
+        path = []
+        for fragment in split_ns(nskey):
+            child = node.children.get(fragment)
+            if child is None:
+                return False
+            path.append((node, fragment))
+            node = child
+        if node.nskey is None:
+            return False
+        node.nskey = None
+        self.count -= 1
+        self.version += 1
+        for parent, fragment in reversed(path):
+            child = parent.children[fragment]
+            if child.nskey is not None or child.children:
+                break
+            del parent.children[fragment]
+        return True
+    
+    def hasnamespace(self, namespace):
+        """ Return True if there are any keys in the given namespace """
+        node = self.node_for(namespace)
+        return node is not None and bool(node.children)
+    
+    def keys(self, *namespaces, inclusive=False):
+        """ Iterate over the namespaced keys in the trie – either all of
+            them, or just those in the specified namespaces.
+            
+            Keys are “in” a namespace if they begin with that namespace,
+            followed by a separator. If “inclusive” is True, any key that
+            is exactly equal to a given namespace is also included.
+        """
+        if not namespaces:
+            yield from self.root.descendants()
+            return
+        seen = None
+        if len(namespaces) > 1:
+            seen = set()
+        for namespace in namespaces:
+            node = self.node_for(namespace)
+            if node is None:
+                continue
+            if inclusive and node.nskey is not None:
+                candidates = (node.nskey,)
+            else:
+                candidates = tuple()
+            for nskey in (*candidates, *node.descendants()):
+                if seen is None:
+                    yield nskey
+                elif nskey not in seen:
+                    seen.add(nskey)
+                    yield nskey
+    
+    def unprefixed(self):
+        """ Iterate over all keys in the trie that have no namespace """
+        for child in self.root.children.values():
+            if child.nskey is not None:
+                yield child.nskey
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        yield from self.root.descendants()
+    
+    def __contains__(self, nskey):
+        node = self.node_for(nskey)
+        return node is not None and node.nskey is not None
+    
+    def inner_repr(self):
+        return f"[keys={self.count}, toplevel={len(self.root.children)}]"
+
+# Assign the modules’ `__all__` and `__dir__` using the exporter:
+__all__, __dir__ = exporter.all_and_dir()
+
+def test():
+    
+    from clu.testing.utils import inline
+    from clu.config.keymap import Flat, Nested
+    from clu.config.keymap import nestedmaps, flatdict
+    from clu.config.ns import namespace_matches
+    
+    @inline
+    def test_nstrie_keys():
+        """ NamespaceTrie keys, in “mapwalk(…)” order """
+        nested = Nested(nestedmaps())
+        trie = NamespaceTrie(nested)
+        assert len(trie) == len(nested)
+        assert tuple(trie) == tuple(nested)
+        assert tuple(trie.unprefixed()) == ('type',)
+        for nskey in nested:
+            assert nskey in trie
+    
+    @inline
+    def test_nstrie_namespaces():
+        """ NamespaceTrie namespace queries """
+        flat = Flat(flatdict())
+        trie = NamespaceTrie(flat)
+        for namespace in flat.namespaces():
+            assert trie.hasnamespace(namespace)
+            assert tuple(trie.keys(namespace)) == \
+                   tuple(nskey for nskey in flat \
+                          if namespace_matches(nskey, namespace) \
+                         and nskey != namespace)
+    
+    @inline
+    def test_nstrie_discard():
+        """ NamespaceTrie removal and pruning """
+        trie = NamespaceTrie(('yo:dogg', 'yo:dogg:iheard', 'wat'))
+        assert trie.discard('yo:dogg:iheard')
+        assert not trie.discard('yo:dogg:iheard')
+        assert tuple(trie) == ('yo:dogg', 'wat')
+        assert trie.discard('yo:dogg')
+        assert not trie.hasnamespace('yo')
+        assert 'yo' not in trie.root.children
+        assert len(trie) == 1
+    
+    @inline.fixture
+    def bigflat():
+        """ A Flat instance with 64 namespaces of 64 keys each """
+        flat = Flat({ f"ns{idx}:sub{jdx % 4}:key{jdx}" : jdx \
+                      for idx in range(64) \
+                      for jdx in range(64) })
+        flat.namespace_trie()
+        return flat
+    
+    @inline
+    def test_flat_namespace_scan():
+        """ Baseline: scan every key for the namespace """
+        flat = bigflat()
+        out = { nskey : flat[nskey] for nskey in flat \
+                 if namespace_matches(nskey, 'ns32:sub1') }
+        assert len(out) == 16
+    
+    @inline
+    def test_flat_namespace_trie():
+        """ Trie: descend directly to the namespace node """
+        flat = bigflat()
+        out = { nskey : flat[nskey] for nskey \
+                 in flat.namespace_trie().keys('ns32:sub1') }
+        assert len(out) == 16
+    
+    # Run all inline tests:
+    return inline.test(100)
+
+if __name__ == '__main__':
+    sys.exit(test())
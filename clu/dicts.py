@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function
-from itertools import chain
+from itertools import chain, islice
 from reprlib import Repr
 
 iterchain = chain.from_iterable
@@ -33,6 +33,56 @@ export = exporter.decorator()
 
 # DICT VIEWS: OrderedMappingView and friends
 
+def snapshotfor(mapping):
+    """ Return the cached key sequence for a mapping whose type defines
+        a “snapshot()” method – or None, for any other mapping.
+    """
+    # N.B. look at the type, lest namespace-ish mappings hand
+    # back one of their items named “snapshot”:
+    snapshot = getattr(type(mapping), 'snapshot', None)
+    if callable(snapshot):
+        return snapshot(mapping)
+    return None
+
+@export
+def keyat(mapping, idx):
+    """ Return the key at position “idx” in an ordered mapping.
+        
+        Mappings furnishing a “snapshot()” method (q.v. “Directory”
+        in “clu.fs.filesystem”) are indexed directly, in O(1) time;
+        all others are iterated – forwards for positive indexes and
+        backwards for negative ones – only as far as the position
+        in question, and never materialized in full.
+    """
+    snapshot = snapshotfor(mapping)
+    if snapshot is not None:
+        return snapshot[idx]
+    if idx < 0:
+        iterator, offset = reversed(mapping), -idx - 1
+    else:
+        iterator, offset = iter(mapping), idx
+    for key in islice(iterator, offset, None):
+        return key
+    raise IndexError(f"mapping index out of range: {idx}")
+
+@export
+def keyslice(mapping, slicer):
+    """ Return a tuple of the keys in a slice of an ordered mapping.
+        
+        As with “keyat(…)” (q.v. supra.) mappings with a “snapshot()”
+        method are sliced directly; for all others, slices with non-
+        negative bounds and steps are taken lazily with “islice(…)”,
+        and anything else falls back to slicing a tuple of the keys.
+    """
+    snapshot = snapshotfor(mapping)
+    if snapshot is not None:
+        return tuple(snapshot[slicer])
+    start, stop, step = slicer.start, slicer.stop, slicer.step
+    if all(bound is None or bound >= 0 for bound in (start, stop)) and \
+      (step is None or step > 0):
+        return tuple(islice(mapping, start, stop, step))
+    return tuple(mapping)[slicer]
+
 @export
 class OrderedMappingView(collections.abc.MappingView,
                          collections.abc.Sequence,
@@ -41,36 +91,43 @@ class OrderedMappingView(collections.abc.MappingView,
     
     """ A mapping view class implementing “collections.abc.Sequence”
         and “collections.abc.Reversible”
+        
+        Indexing and slicing go through “keyat(…)” and “keyslice(…)”
+        (q.v. supra.) rather than a tuple of the whole view; subclasses
+        need only map keys to their own elements in “element(…)”.
     """
     
+    def element(self, key):
+        """ Return the view element corresponding to a given key """
+        return key
+    
+    def __iter__(self): # pragma: no cover
+        yield from self._mapping
+    
     def __reversed__(self): # pragma: no cover
         yield from reversed(self._mapping)
     
-    def __getitem__(self, idx): # pragma: no cover
-        return tuple(self)[idx]
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return tuple(self.element(key) for key in keyslice(self._mapping, idx))
+        return self.element(keyat(self._mapping, idx))
 
 @export
-class OrderedItemsView(collections.abc.ItemsView,
-                       collections.abc.Sequence,
-                       collections.abc.Reversible,
-                       clu.abstract.MappingViewRepr):
+class OrderedItemsView(collections.abc.ItemsView, OrderedMappingView):
     
     """ An items-view class implementing “collections.abc.Sequence”
         and “collections.abc.Reversible”
     """
     
+    def element(self, key):
+        return (key, self._mapping[key])
+    
     def __reversed__(self):
         for key in reversed(self._mapping):
             yield (key, self._mapping[key])
-    
-    def __getitem__(self, idx):
-        return tuple(self)[idx]
 
 @export
-class OrderedKeysView(collections.abc.KeysView,
-                      collections.abc.Sequence,
-                      collections.abc.Reversible,
-                      clu.abstract.MappingViewRepr):
+class OrderedKeysView(collections.abc.KeysView, OrderedMappingView):
     
     """ A keys-view class implementing “collections.abc.Sequence”
         and “collections.abc.Reversible”
@@ -78,26 +135,20 @@ class OrderedKeysView(collections.abc.KeysView,
     
     def __reversed__(self):
         yield from reversed(self._mapping)
-    
-    def __getitem__(self, idx):
-        return tuple(self)[idx]
 
 @export
-class OrderedValuesView(collections.abc.ValuesView,
-                        collections.abc.Sequence,
-                        collections.abc.Reversible,
-                        clu.abstract.MappingViewRepr):
+class OrderedValuesView(collections.abc.ValuesView, OrderedMappingView):
     
     """ A values-view class implementing “collections.abc.Sequence”
         and “collections.abc.Reversible”
     """
     
+    def element(self, key):
+        return self._mapping[key]
+    
     def __reversed__(self):
         for key in reversed(self._mapping):
             yield self._mapping[key]
-    
-    def __getitem__(self, idx):
-        return tuple(self)[idx]
 
 # CHAINMAP: custom reprlib.Repr subclass
 
@@ -303,7 +354,12 @@ class ChainMap(collections.abc.MutableMapping,
                clu.abstract.Cloneable,
                metaclass=clu.abstract.Slotted):
     
-    __slots__ = ('maps', '__weakref__')
+    __slots__ = ('maps', 'cache', '__weakref__')
+    
+    # Set “indexed” to True in a subclass to have lookups go through
+    # “layerfor(…)”, which keeps a cached “key → layer” index up to date
+    # (q.v. the “layerindex()” method sub.):
+    indexed = False
     
     @classmethod
     def fromkeys(cls, iterable, *args, **overrides): # pragma: no cover
@@ -361,19 +417,83 @@ class ChainMap(collections.abc.MutableMapping,
     def __missing__(self, key):
         raise KeyError(key)
     
+    def signature(self):
+        """ Return a cheaply-computed signature for the state of the
+            ChainMap’s internal map stack: the identities and lengths
+            of each of its constituent mappings.
+        """
+        maps = self.maps
+        return (tuple(map(id, maps)), tuple(map(len, maps)))
+    
+    def layerindex(self):
+        """ Return the cached “key → layer” index – a dict mapping each
+            key in the ChainMap to the first mapping in which it’s found –
+            rebuilding it first if it’s missing or stale.
+            
+            Writes through the ChainMap invalidate the index outright; a
+            change made to the constituent mappings directly is caught here
+            only if it changes the length of a mapping (q.v. “signature()”
+            supra.) – which is why “layerfor(…)” always answers from the
+            mappings themselves, discarding the index if it disagrees.
+        """
+        signature = self.signature()
+        cache = getattr(self, 'cache', None)
+        if cache is not None and cache[0] == signature:
+            return cache[1]
+        index = {}
+        for layer in reversed(self.maps):
+            index.update(dict.fromkeys(layer, layer))
+        self.cache = (signature, index)
+        return index
+    
+    def layerfor(self, key):
+        """ Return the first mapping containing “key”, or None.
+            
+            The mappings themselves are consulted in order, as with an
+            unindexed ChainMap, so the answer is never stale – even for
+            keys added to, or removed from, the mappings directly. If the
+            cached index disagrees with the answer, it’s discarded, to be
+            rebuilt the next time it’s asked for.
+        """
+        for layer in self.maps:
+            if key in layer:
+                break
+        else:
+            layer = None
+        cache = getattr(self, 'cache', None)
+        if cache is not None and cache[1].get(key) is not layer:
+            self.cache = None
+        return layer
+    
+    def invalidate(self):
+        """ Discard the cached “key → layer” index, if there is one """
+        self.cache = None
+    
     def __getitem__(self, key):
+        if self.indexed:
+            layer = self.layerfor(key)
+            if layer is None:
+                return self.__missing__(key)
+            return layer[key]
         try:
             return try_items(key, *self.maps)
         except KeyError:
             return self.__missing__(key)
     
     def __len__(self):
-        return sum(len(mapping) for mapping in self.maps)
+        return len(frozenset().union(*self.maps))
     
     def __iter__(self):
-        yield from iterchain(mapping.keys() for mapping in self.maps)
+        seen = set()
+        for mapping in self.maps:
+            for key in mapping:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
     
     def __contains__(self, key):
+        if self.indexed:
+            return self.layerfor(key) is not None
         return any(key in mapping for mapping in self.maps)
     
     def __bool__(self):
@@ -434,9 +554,11 @@ class ChainMap(collections.abc.MutableMapping,
         return type(self)(mapping or {}, *self.maps)
     
     def __setitem__(self, key, value):
+        self.cache = None
         self.top[key] = value
     
     def __delitem__(self, key):
+        self.cache = None
         try:
             del self.top[key]
         except KeyError as exc:
@@ -447,6 +569,7 @@ class ChainMap(collections.abc.MutableMapping,
             pair, nondeterministically, as a 2-tuple; but raise a KeyError
             if the top mapping of the ChainMap (aka ‘self.maps[0]’) is empty.
         """
+        self.cache = None
         try:
             return self.top.popitem()
         except KeyError as exc:
@@ -460,12 +583,14 @@ class ChainMap(collections.abc.MutableMapping,
             If “key” is not found, “default” is returned if given –
             otherwise a KeyError is raised.
         """
+        self.cache = None
         if default is NoDefault:
             return self.top.pop(key)
         return self.top.pop(key, default)
     
     def clear(self):
         """ Remove all items from the top mapping of the ChainMap. """
+        self.cache = None
         self.top.clear()
         return self
     
@@ -486,7 +611,7 @@ class ChainMap(collections.abc.MutableMapping,
         """ Dearticulate the ChainMap instances’ internal map stack
             into a new, single, flat dictionary instance.
         """
-        return merge_fast(*reversed(self.maps))
+        return merge_layers(*self.maps)
     
     def clone(self, deep=False, memo=None):
         """ Return a cloned copy of the ChainMap instance """
@@ -511,8 +636,24 @@ class ChainMapPlusPlus(ChainMap):
         I would looooooooove to know all about how, where, when – most of
         all *why* – and I’ll buy you a pizza, if you do alert me to all
         or at least some of these.
+        
+        ChainMapPlusPlus is also a working multimapping: each of the
+        mappings in its chain may hold a value for a given key, and the
+        “getall(…)”, “add(…)”, “popall(…)” et al. methods (q.v. the
+        “multidict.MutableMultiMapping” interface) deal with these values
+        in order, via a cached “key → layers” index. N.B. that unlike the
+        plain ChainMap, which only ever changes its top mapping, these
+        methods will change whichever mappings hold the values at hand.
+        
+        Also unlike a “multidict.MultiDict”, the “len(…)”, iteration and
+        “keys()”, “values()” and “items()” of a ChainMapPlusPlus are those
+        of a plain ChainMap: each key is counted and yielded once, along
+        with its first value – use “getall(…)” for the rest.
     """
     
+    __slots__ = ('owned', 'multicache')
+    indexed = True
+    
     @classmethod
     def expand(cls, *dicts, seen=None):
         """ Iterate over some mappings, yielding them out uniquely
@@ -541,38 +682,180 @@ class ChainMapPlusPlus(ChainMap):
         """
         # Operate directly on the instance member:
         self.maps = []
+        self.owned = set()
+        self.multicache = None
         
         # Just deal with the overrides:
         if overrides:
-            dicts.insert(0, dict(overrides))
+            dicts = (dict(overrides), *dicts)
         
         # The action (recursive, I might add) is all right here:
         self.maps.extend(self.expand(*dicts))
     
+    def multiindex(self):
+        """ Return the cached “key → layers” index – a dict mapping each
+            key to a list of all of the mappings containing it, in order –
+            rebuilding it first if it’s missing or stale (q.v. the
+            “ChainMap.layerindex()” method supra.)
+        """
+        signature = self.signature()
+        cache = getattr(self, 'multicache', None)
+        if cache is not None and cache[0] == signature:
+            return cache[1]
+        index = {}
+        for layer in self.maps:
+            for key in layer:
+                if key in index:
+                    index[key].append(layer)
+                else:
+                    index[key] = [layer]
+        self.multicache = (signature, index)
+        return index
+    
+    def layersfor(self, key):
+        """ Return a list of all the mappings containing “key”, in order
+            – or an empty list, if there are none.
+            
+            As with “ChainMap.layerfor(…)”, the mappings themselves are
+            always consulted, and the cached “key → layers” index is
+            discarded if it disagrees with the answer.
+        """
+        layers = [layer for layer in self.maps if key in layer]
+        cache = getattr(self, 'multicache', None)
+        if cache is not None:
+            indexed = cache[1].get(key, [])
+            if len(indexed) != len(layers) or \
+                any(one is not two for one, two in zip(indexed, layers)):
+                self.multicache = None
+        return layers
+    
+    def invalidate(self):
+        """ Discard both the “key → layer” and “key → layers” indexes """
+        self.cache = None
+        self.multicache = None
+    
     def getone(self, key, default=NoDefault):
         """ Return the first value for a key. """
         return self.get(key, default)
     
     def getall(self, key, default=NoDefault):
-        """ Return all values for a key. """
+        """ Return a list of all values for a key, from each of the
+            mappings containing it, in order.
+        """
+        layers = self.layersfor(key)
+        if layers:
+            return [layer[key] for layer in layers]
         if default is NoDefault:
-            return item_across(key, *self.dicts) or self.__missing__(key)
-        return item_across(key, *self.dicts, default=default)
+            return self.__missing__(key)
+        return default
     
     def add(self, key, value):
-        pass
+        """ Add a value for a key, after any and all existing values.
+            
+            If the key is new, the value goes into the top mapping, as
+            with “chainmap[key] = value”; otherwise it goes into the first
+            mapping after the last one containing the key that was created
+            by the ChainMapPlusPlus itself – appending a new such mapping
+            to the chain, if need be.
+        """
+        layers = self.layersfor(key)
+        if not layers:
+            self.invalidate()
+            self.top[key] = value
+            return
+        last = layers[-1]
+        position = next(idx for idx, layer in enumerate(self.maps) if layer is last)
+        for layer in self.maps[position+1:]:
+            if id(layer) in self.owned:
+                break
+        else:
+            layer = {}
+            self.maps.append(layer)
+            self.owned.add(id(layer))
+        self.invalidate()
+        layer[key] = value
+    
+    def extend(self, *args, **kwargs):
+        """ Add all of the key-value pairs from a mapping, an iterable of
+            pairs, and/or the keyword arguments – q.v. “add(…)” supra.
+        """
+        for key, value in iterpairs(*args, **kwargs):
+            self.add(key, value)
+    
+    def update(self, *args, **kwargs):
+        """ Update the ChainMapPlusPlus from a mapping, an iterable of
+            pairs, and/or the keyword arguments. The first value given
+            for a key replaces all of its existing values; any further
+            values given for that key are added after it.
+        """
+        seen = set()
+        for key, value in iterpairs(*args, **kwargs):
+            if key in seen:
+                self.add(key, value)
+                continue
+            seen.add(key)
+            self[key] = value
     
-    def extend(self, iter):
-        pass
+    def __setitem__(self, key, value):
+        """ Set the value for a key, replacing all of its existing values
+            (unlike “ChainMap.__setitem__(…)”, this removes the key from
+            any mappings besides the top one that may contain it)
+        """
+        for layer in tuple(self.layersfor(key)):
+            if layer is not self.top:
+                del layer[key]
+        self.invalidate()
+        self.top[key] = value
     
-    def update(self, dictish=NoDefault, **updates):
-        pass
+    def __delitem__(self, key):
+        """ Remove all values for a key, from whichever mappings hold them """
+        self.popall(key)
     
     def popone(self, key, default=NoDefault):
-        pass
+        """ Remove and return the first value for a key """
+        layers = self.layersfor(key)
+        if layers:
+            self.invalidate()
+            return layers[0].pop(key)
+        if default is NoDefault:
+            return self.__missing__(key)
+        return default
+    
+    def popall(self, key, default=NoDefault):
+        """ Remove all values for a key, returning them as a list """
+        layers = tuple(self.layersfor(key))
+        if layers:
+            self.invalidate()
+            return [layer.pop(key) for layer in layers]
+        if default is NoDefault:
+            return self.__missing__(key)
+        return default
+    
+    def pop(self, key, default=NoDefault):
+        """ Remove and return the first value for a key – same as
+            “popone(…)” (q.v. supra.)
+        """
+        return self.popone(key, default)
     
-    def popall(self, key, default=tuple()):
-        pass
+    def clear(self):
+        """ Remove all items from all of the mappings in the chain """
+        self.invalidate()
+        for layer in self.maps:
+            layer.clear()
+        return self
+
+def iterpairs(*args, **kwargs):
+    """ Iterate over the key-value pairs from an optional positional
+        mapping or iterable of pairs, followed by any keyword arguments
+    """
+    if len(args) > 1:
+        raise TypeError(f"expected at most 1 positional argument, got {len(args)}")
+    for arg in args:
+        if ismapping(arg):
+            yield from arg.items()
+        else:
+            yield from arg
+    yield from kwargs.items()
 
 @export
 def ischainmap(thing):
@@ -647,11 +930,46 @@ def merge_fast(*dicts, **extras):
         return { **extras,   **dicts[1], **dicts[0] }
     elif length == 1:
         return { **extras,   **dicts[0] }
-    else:
-        merged = { **extras }
-        for d in dicts:
-            merged = { **merged, **d }
-    return merged
+    # N.B. past ten dicts, later dicts have always beaten earlier ones
+    # (the reverse of the above) – with the extras still losing to all:
+    return merge_layers(*reversed(dicts), extras)
+
+@export
+def merge_layers(*dicts, cls=dict, deep=False, **overrides):
+    """ Merge any number of dictionary arguments into a new instance of
+        the specified class, in a single pass over all of their items.
+        
+        Precedence works as it does with “merge_as(…)” – keyword overrides
+        beat everything, and any given dict beats the dicts that follow it
+        in the argument list – except that values in higher-precedence dicts
+        always win, even if they happen to be falsey.
+        
+        If “deep” is True, nested mappings found under the same key in more
+        than one layer are themselves merged (recursively, with the same
+        precedence) into new dicts, rather than the highest-precedence
+        mapping simply winning outright. Nested mappings present in only one
+        layer are passed through as-is; none of the arguments is modified.
+    """
+    cls = typeof(cls or (dicts and dicts[0] or dict))
+    layers = overrides and (overrides, *dicts) or dicts
+    
+    # Lowest precedence first: each update overwrites what came before:
+    merged = {}
+    for layer in reversed(layers):
+        merged.update(layer)
+    
+    if deep:
+        # Gather up the nested mappings under any key whose winning
+        # value is itself a mapping, and merge those recursively:
+        for key in [key for key, value in merged.items() if ismapping(value)]:
+            nested = [layer[key] for layer in layers \
+                                  if key in layer and ismapping(layer[key])]
+            if len(nested) > 1:
+                merged[key] = merge_layers(*nested, deep=True)
+    
+    if cls is dict:
+        return merged
+    return cls(merged)
 
 @export
 def merge_two(one, two, *, cls=dict, **overrides):
@@ -967,6 +1285,155 @@ def test():
             assert key == key0
             assert val == val0
     
+    @inline.fixture
+    def layered():
+        """ Return 256 layered configuration-ish dicts """
+        return [{ f"key{jdx}" : f"value{idx}" \
+                   for jdx in range(idx % 16, 64, 4) } \
+                   for idx in range(256)]
+    
+    @inline.precheck
+    def check_merge_layers():
+        """ Check “merge_layers(…)” against “merge_as(…)” """
+        layers = layered()
+        assert merge_layers(*layers) == merge_as(*layers)
+        assert merge_layers(*layers, deep=True) == merge_as(*layers)
+        assert merge_layers(*layers[:10]) == merge_fast(*layers[:10])
+        assert merge_layers(*layers, wat='yo') == merge_as(*layers, wat='yo')
+    
+    @inline
+    def test_merge_as_layered():
+        """ Baseline: merge 256 dicts with “merge_as(…)” """
+        merged = merge_as(*layered())
+        assert merged['key0'] == "value0"
+    
+    @inline
+    def test_merge_fast_layered():
+        """ Baseline: merge 256 dicts with the old “merge_fast(…)” loop """
+        merged = {}
+        for d in layered():
+            merged = { **merged, **d }
+        assert merged['key0'] == "value240"
+    
+    @inline
+    def test_merge_layers_layered():
+        """ Single-pass: merge 256 dicts with “merge_layers(…)” """
+        merged = merge_layers(*layered())
+        assert merged['key0'] == "value0"
+    
+    @inline
+    def test_merge_layers_deep():
+        """ Single-pass: deep-merge 256 nested dicts with “merge_layers(…)” """
+        merged = merge_layers(*({ 'nested' : layer } for layer in layered()), deep=True)
+        assert merged['nested']['key0'] == "value0"
+        assert len(merged['nested']) == 64
+    
+    class IndexedChainMap(ChainMap):
+        indexed = True
+    
+    @inline.fixture
+    def moduledicts():
+        """ Return the “__dict__” mappings of 24 CLU and stdlib modules """
+        modules = (module for name, module in sorted(sys.modules.items()) \
+                                           if module is not None \
+                                          and hasattr(module, '__dict__'))
+        return [module.__dict__ for module, _ in zip(modules, range(24))]
+    
+    @inline.precheck
+    def check_chainmap_layerindex():
+        """ Check indexed ChainMap lookups against unindexed ones """
+        dicts = moduledicts()
+        chain0 = ChainMap(*dicts)
+        chainI = IndexedChainMap(*dicts)
+        assert len(chain0) == len(chainI) == len(frozenset(chainI))
+        assert frozenset(chain0) == frozenset(chainI)
+        for key in chain0:
+            assert chain0[key] is chainI[key]
+        assert chain0.flatten() == chainI.flatten()
+    
+    @inline
+    def test_chainmap_lookups():
+        """ Baseline: look up every key across 24 module dicts """
+        chain0 = ChainMap(*moduledicts())
+        for key in tuple(iterchain(chain0.maps)):
+            chain0[key]
+    
+    @inline
+    def test_chainmap_lookups_indexed():
+        """ Indexed: look up every key across 24 module dicts """
+        chainI = IndexedChainMap(*moduledicts())
+        for key in tuple(iterchain(chainI.maps)):
+            chainI[key]
+    
+    @inline
+    def test_chainmapplusplus_getall_scan():
+        """ Baseline: collect all values for every key across 24 module dicts """
+        dicts = moduledicts()
+        for key in tuple(iterchain(dicts)):
+            item_across(key, *dicts)
+    
+    @inline
+    def test_chainmapplusplus_getall_indexed():
+        """ Indexed: collect all values for every key across 24 module dicts """
+        chainP = ChainMapPlusPlus(*moduledicts())
+        for key in tuple(iterchain(chainP.maps)):
+            chainP.getall(key)
+    
+    @inline.fixture
+    def bigdict():
+        """ Return a flat dictionary of 4096 items """
+        return { f"key{idx}" : f"value{idx}" for idx in range(4096) }
+    
+    @inline.precheck
+    def check_ordered_view_indexing():
+        """ Check ordered-view indexing and slicing against tuples """
+        mapping = bigdict()
+        for view in (OrderedKeysView(mapping),
+                     OrderedValuesView(mapping),
+                     OrderedItemsView(mapping)):
+            elements = tuple(view)
+            for idx in (0, 1, 2047, 4095, -1, -2, -4096):
+                assert view[idx] == elements[idx]
+            for slicer in (slice(10, 20), slice(None, 5), slice(4090, None, 2),
+                           slice(-5, None), slice(None, None, -512)):
+                assert view[slicer] == elements[slicer]
+        directory = fsdata()
+        keys = directory.keys()
+        assert tuple(keys) == directory.snapshot()
+        assert keys[0] == keys[:][0] == tuple(keys)[0]
+    
+    @inline
+    def test_ordered_view_index_tuple():
+        """ Baseline: index an ordered view of 4096 items via “tuple(…)” """
+        view = OrderedItemsView(bigdict())
+        for idx in range(0, 4096, 512):
+            tuple(view)[idx]
+            tuple(view)[-idx-1]
+    
+    @inline
+    def test_ordered_view_index_lazy():
+        """ Lazy: index an ordered view of 4096 items via “keyat(…)” """
+        view = OrderedItemsView(bigdict())
+        for idx in range(0, 4096, 512):
+            view[idx]
+            view[-idx-1]
+    
+    @inline
+    def test_directory_keys_index_scan():
+        """ Baseline: index directory keys with a scan per subscript """
+        directory = fsdata()
+        keys = directory.keys()
+        for idx in range(len(keys)):
+            assert tuple(keys)[idx] in directory
+    
+    @inline
+    def test_directory_keys_index_snapshot():
+        """ Snapshot: index directory keys via “Directory.snapshot()” """
+        directory = fsdata()
+        keys = directory.keys()
+        for idx in range(len(keys)):
+            assert keys[idx] in directory
+    
     @inline.diagnostic
     def restore_environment():
         """ Restore environment from stashed values """
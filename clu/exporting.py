@@ -15,6 +15,7 @@ import inspect
 import itertools
 import shelve
 import sys, os, re
+import types
 import warnings
 import weakref
 
@@ -27,8 +28,9 @@ from clu.constants.consts import (λ, φ, # type: ignore
                                   EXPORTER_NAME, QUALIFIER, ROOT_PATH,
                                   NoDefault, pytuple)
 from clu.constants.exceptions import BadDotpathWarning, ExportError, ExportWarning
+from clu import profiling
 
-# Q.v. `search_by_id(…)` function sub.
+# Q.v. `stringhash(…)` function sub.
 cache = lambda function: lru_cache(maxsize=128, typed=False)(function)
 
 # Not what you are looking for
@@ -97,29 +99,200 @@ class Modulespace(object):
             raise AttributeError("could not import module: %s" % key) from exc
         return module
 
-@cache
+IndexInfo = collections.namedtuple('IndexInfo', ('hits', 'misses',
+                                                  'refreshes',
+                                                  'modules', 'ids'))
+
+class ModuleIndex(object):
+    
+    """ An incrementally-maintained reverse index, mapping the `id()`
+        values of things found in imported modules to the names of
+        those modules, and the names of those things therein.
+        
+        Modules are indexed as they are encountered in `sys.modules`,
+        and re-indexed when they visibly change – which is to say, when
+        the module object bound to a name in `sys.modules` changes, or
+        when the number of items in that modules’ `__dict__` changes.
+        That cheap check can’t see a module attribute being rebound, so
+        a search that still misses after it scans the modules directly (as
+        the unindexed search did) before giving up, re-indexing the module
+        in which the thing is found. IDs found nowhere are remembered, in a
+        bounded negative cache, until the set of indexed modules changes.
+        Modules that have been removed from `sys.modules` are dropped
+        from the index, along with all of their entries – so the size
+        of the index is bounded by the contents of the live modules.
+        
+        Every answer is validated against the current contents of the
+        module in question before it is returned, so the index never
+        returns a stale answer for a reused `id()` value.
+    """
+    
+    # These modules are consulted last – q.v. the note on “sysmods” supra.
+    mainmodules = frozenset({ '__main__', '__console__' })
+    
+    # The most IDs to remember as having been found nowhere:
+    maxnegatives = 1024
+    
+    def __init__(self):
+        self.signatures = {}    # module name → (module ID, dict length)
+        self.modulekeys = {}    # module name → { thing ID : name }
+        self.homes = {}         # thing ID → [module name, …]
+        self.negatives = {}     # thing ID → generation, for IDs found nowhere
+        self.generation = 0     # bumped when a refresh changes the index
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+    
+    @staticmethod
+    def signature(module):
+        """ Return a cheap signature for the state of a module """
+        return id(module), len(getattr(module, '__dict__', None) or tuple())
+    
+    def forget(self, modname):
+        """ Remove a module, and all of its entries, from the index """
+        self.signatures.pop(modname, None)
+        for thingID in self.modulekeys.pop(modname, {}):
+            homes = self.homes.get(thingID)
+            if homes is not None:
+                homes.remove(modname)
+                if not homes:
+                    del self.homes[thingID]
+    
+    def index(self, modname, module):
+        """ (Re-)index the contents of a module """
+        self.forget(modname)
+        self.signatures[modname] = self.signature(module)
+        keys = self.modulekeys[modname] = {}
+        for key, thing in itermodule(module):
+            thingID = id(thing)
+            if thingID in keys:
+                continue
+            keys[thingID] = key
+            homes = self.homes.setdefault(thingID, [])
+            # Prefer the module in which a thing was defined, and
+            # disfavor the interactive and main-script modules:
+            try:
+                defined = getattr(thing, '__module__', None)
+            except Exception: # pragma: no cover
+                defined = None
+            if type(defined) is str and defined == modname:
+                homes.insert(0, modname)
+            elif modname in type(self).mainmodules:
+                homes.append(modname)
+            else:
+                position = len(homes)
+                while position and homes[position - 1] in type(self).mainmodules:
+                    position -= 1
+                homes.insert(position, modname)
+    
+    def refresh(self):
+        """ Index all new or changed modules, and forget any modules
+            that are no longer present in `sys.modules`
+        """
+        self.refreshes += 1
+        generation = self.generation
+        modules = dict(sys.modules)
+        for modname in tuple(self.signatures):
+            if modname not in modules:
+                self.forget(modname)
+                self.generation = generation + 1
+        for modname, module in modules.items():
+            if module is None:
+                continue
+            if self.signatures.get(modname) != self.signature(module):
+                self.index(modname, module)
+                self.generation = generation + 1
+    
+    def scan(self, thingID):
+        """ Scan the modules directly for a thing’s ID, re-indexing the
+            first module in which it’s found – which must have had something
+            rebound since it was last indexed – and return a validated
+            `(module, name)` tuple, or `(None, None)` if none can be found
+        """
+        mainmodules = type(self).mainmodules
+        modules = sorted(tuple(sys.modules.items()),
+                         key=lambda item: item[0] in mainmodules)
+        for modname, module in modules:
+            if module is None:
+                continue
+            for _, valueID in itermoduleids(module):
+                if valueID == thingID:
+                    self.index(modname, module)
+                    return self.lookup(thingID)
+        return None, None
+    
+    def lookup(self, thingID):
+        """ Return a validated `(module, name)` tuple for a thing’s ID
+            from the index, or `(None, None)` if none can be found
+        """
+        for modname in tuple(self.homes.get(thingID, tuple())):
+            module = sys.modules.get(modname)
+            key = self.modulekeys.get(modname, {}).get(thingID)
+            if module is None or key is None:
+                continue
+            if id(getattr(module, key, NotYourThing)) == thingID:
+                return module, key
+        return None, None
+    
+    def search(self, thingID):
+        """ Find the module containing a thing, and the thing’s name
+            therein, by the thing’s ID – refreshing the index only
+            if the thing can’t be found amongst its current entries,
+            and scanning the modules directly if it still can’t be found
+            (unless it wasn’t found by a scan since the last refresh that
+            changed the index)
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            out = self.lookup(thingID)
+            if out[0] is not None:
+                self.hits += 1
+                return out
+            self.misses += 1
+            self.refresh()
+            out = self.lookup(thingID)
+            negatives = self.negatives
+            if out[0] is not None:
+                negatives.pop(thingID, None)
+                return out
+            if negatives.get(thingID) == self.generation:
+                return out
+            out = self.scan(thingID)
+            if out[0] is None:
+                negatives.pop(thingID, None)
+                negatives[thingID] = self.generation
+                if len(negatives) > type(self).maxnegatives:
+                    del negatives[next(iter(negatives))]
+            else:
+                negatives.pop(thingID, None)
+            return out
+    
+    def info(self):
+        """ Return an “IndexInfo” namedtuple of index statistics """
+        return IndexInfo(self.hits, self.misses,
+                         self.refreshes,
+                         len(self.signatures),
+                         len(self.homes))
+
+# Q.v. `search_by_id(…)` function sub.
+moduleindex = ModuleIndex()
+
 def search_by_id(thingID):
-    """ Cached function to find the name of a thing, according
-        to what it is called in the context of a module in which
-        it resides – searching across all currently imported
-        modules in entirely, as indicated from the inspection of
-        `sys.modules.values()` (which is potentially completely
-        fucking enormous).
+    """ Function to find the name of a thing, according to what
+        it is called in the context of a module in which it resides –
+        searching across all currently imported modules in entirely,
+        as indicated from the inspection of `sys.modules.values()`
+        (which is potentially completely fucking enormous).
         
         This function helps implement `search_for_name(…)` – q.v.
         the calling function code sub., and is also used in the
         implementation of `search_for_module(…)`, - also q.v.
         the calling function code sub.
         
-        Caching courtesy the `functools.lru_cache(…)` decorator.
+        Searches are served from an incrementally-maintained reverse
+        index of module contents – q.v. “ModuleIndex” supra.
     """
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        for module in sysmods():
-            for key, valueID in itermoduleids(module):
-                if valueID == thingID:
-                    return module, key
-    return None, None
+    return moduleindex.search(thingID)
 
 def search_for_name(thing):
     """ Attempt to find the name for “thing”, using the logic from
@@ -286,6 +459,43 @@ def path_to_dotpath(path, relative_to=None,
     
     return dotpath
 
+def lazy_attributes(modulename, manifest, *additionals):
+    """ Return a module-level `__getattr__(…)` function (q.v. PEP 562)
+        and a matching `__dir__()` function for the named module, which
+        together resolve the names listed in a “manifest” lazily – that
+        is to say, the module defining a given name is only imported
+        upon the first access of that name:
+        
+            >>> __getattr__, __dir__ = lazy_attributes(__name__, manifest)
+        
+        The manifest maps names to the dotpaths of their defining modules
+        (q.v. “ExporterBase.manifest()” sub.) – it may also be a callable
+        returning such a mapping, in which case it’ll be called once, upon
+        the first attribute miss.
+    """
+    manifests = []
+    
+    def resolved():
+        if not manifests:
+            manifests.append(manifest() if callable(manifest) else manifest)
+        return manifests[0]
+    
+    def __getattr__(name):
+        dotpath = resolved().get(name)
+        if dotpath is None:
+            raise AttributeError(f"module “{modulename}” has no attribute “{name}”")
+        thing = getattr(importlib.import_module(dotpath), name)
+        # Stash the thing in the module, to bypass future lookups:
+        module = sys.modules.get(modulename)
+        if module is not None:
+            setattr(module, name, thing)
+        return thing
+    
+    def __dir__():
+        return sorted(frozenset(chain(resolved().keys(), additionals)))
+    
+    return __getattr__, __dir__
+
 # One-off private versions of “ismergeable” and “isstring” – NOT FOR EXPORT:
 ismergeable = lambda thing: isinstance(thing, collections.abc.Mapping)
 isstring = lambda thing: isinstance(thing, str)
@@ -325,6 +535,9 @@ class Registry(abc.ABC, metaclass=clu.abstract.Slotted):
         super().__init_subclass__(**kwargs) # type: ignore
         cls.instances = weakref.WeakValueDictionary()
         cls.appname = clu.abstract.ValueDescriptor(appname)
+        cls.exportindex = {}        # thing ID → [(dotpath, name), …]
+        cls.modulecache = None      # (signature, modules) – q.v. “modules()”
+        cls.registrations = 0
     
     @staticmethod
     def all_appnames():
@@ -377,19 +590,37 @@ class Registry(abc.ABC, metaclass=clu.abstract.Slotted):
                      for modules in (classes[appname].modules \
                      for appname in cls.all_appnames()))
     
+    @classmethod
+    def all_classes(cls):
+        """ Return a generator over all currently registered subclasses """
+        for appname in cls.all_appnames():
+            subcls = classes.get(appname)
+            if subcls is not None:
+                yield subcls
+    
     @classmethod
     def nameof(cls, thing):
         """ Find and return the name of a thing, if that thing
-            should be found to reside in one of the exported modules
+            should be found amongst the exports of the registered
+            subclasses’ exporter instances
         """
-        return search_modules(thing, *cls.all_modules())[1]
+        for subcls in cls.all_classes():
+            name = subcls.nameof(thing)
+            if name is not None:
+                return name
+        return None
     
     @classmethod
     def moduleof(cls, thing):
         """ Find and return the module for a thing, if that thing
-            should be found to reside in one of the exported modules
+            should be found amongst the exports of the registered
+            subclasses’ exporter instances
         """
-        return search_modules(thing, *cls.all_modules())[0]
+        for subcls in cls.all_classes():
+            module = subcls.moduleof(thing)
+            if module is not None:
+                return module
+        return None
 
 class ExporterTypeRepr(clu.abstract.BasePath):
     
@@ -428,6 +659,10 @@ class ExporterBase(collections.abc.MutableMapping,
     
     __slots__ = pytuple('exports', 'weakref') + ('path', 'dotpath')
     
+    # The default “data()” backend, and the datafile suffixes per backend:
+    datastore = 'shelve'
+    datafile_suffixes = { 'shelve' : 'pkl', 'sqlite' : 'sqlite3' }
+    
     def __new__(cls, *args, path=None, dotpath=None, **kwargs):
         
         putative = path_to_dotpath(path,
@@ -446,6 +681,7 @@ class ExporterBase(collections.abc.MutableMapping,
         
         if instance.dotpath is not None:
             cls.instances[instance.dotpath] = instance
+            cls.registrations += 1
         
         return instance
     
@@ -478,7 +714,12 @@ class ExporterBase(collections.abc.MutableMapping,
             
             Returns the successfully unregistered instance in question.
         """
-        return cls.instances.pop(dotpath, None)
+        instance = cls.instances.pop(dotpath, None)
+        if instance is not None:
+            cls.registrations += 1
+            for name, thing in instance.__exports__.items():
+                instance.unindex_export(name, thing)
+        return instance
     
     @classmethod
     def modulenames(cls):
@@ -489,42 +730,137 @@ class ExporterBase(collections.abc.MutableMapping,
     
     @classmethod
     def modules(cls):
-        """ Get a dictionary of actual modules corresponding to the
-            currently registered Exporter instances
+        """ Get a read-only mapping of actual modules corresponding to
+            the currently registered Exporter instances.
+            
+            The mapping is rebuilt only when instances have been
+            registered or unregistered since the last call.
+        """
+        signature = (cls.registrations, len(cls.instances))
+        if cls.modulecache is None or cls.modulecache[0] != signature:
+            modules = { modulename : sys.modules.get(modulename) or \
+                                     importlib.import_module(modulename) \
+                                                       for modulename \
+                                                    in cls.modulenames() }
+            cls.modulecache = (signature, types.MappingProxyType(modules))
+        return cls.modulecache[1]
+    
+    @classmethod
+    def manifest(cls):
+        """ Return a “manifest” dictionary, mapping the names of all the
+            things exported by the registered instances to the dotpaths
+            of the modules exporting them. When a name is exported by more
+            than one module, the module defining the thing is preferred –
+            and when several modules define like-named things, the first
+            module (in dotpath order) wins.
+            
+            Manifests are suitable for serialization, e.g. as JSON, and
+            for use with “lazy_attributes(…)” (q.v. function definition
+            supra.) – or, equivalently, the “getattr_and_dir(…)” method.
+        """
+        out = {}
+        defined = set()
+        for dotpath in cls.modulenames():
+            instance = cls.instances.get(dotpath)
+            if instance is None:
+                continue
+            for name, thing in instance.__exports__.items():
+                if name in defined:
+                    continue
+                try:
+                    module = getattr(thing, '__module__', None)
+                except Exception: # pragma: no cover
+                    module = None
+                if type(module) is str and module == dotpath:
+                    defined.add(name)
+                elif name in out:
+                    continue
+                out[name] = dotpath
+        return out
+    
+    @classmethod
+    def lookup(cls, thing):
+        """ Return a `(dotpath, name)` tuple for an exported thing,
+            from the export identity index – or `(None, None)` if
+            the thing has not been exported by a registered instance
         """
-        return { modulename : importlib.import_module(modulename) \
-                                                  for modulename \
-                                               in cls.modulenames() }
+        homes = cls.exportindex.get(id(thing))
+        if homes is not None:
+            for dotpath, name in tuple(homes):
+                instance = cls.instances.get(dotpath)
+                if instance is not None and \
+                   instance.__exports__.get(name, NotYourThing) is thing:
+                    return dotpath, name
+                # Prune entries left behind by defunct instances:
+                homes.remove((dotpath, name))
+            if not homes:
+                cls.exportindex.pop(id(thing), None)
+        return None, None
     
     @classmethod
     def nameof(cls, thing):
         """ Find and return the name of a thing, if that thing
-            should be found to reside in one of the exported modules
+            should be found amongst the registered instances’ exports
         """
-        return search_modules(thing, *cls.modules().values())[1]
+        return cls.lookup(thing)[1]
     
     @classmethod
     def moduleof(cls, thing):
         """ Find and return the module for a thing, if that thing
-            should be found to reside in one of the exported modules
+            should be found amongst the registered instances’ exports
+        """
+        dotpath = cls.lookup(thing)[0]
+        if dotpath is None:
+            return None
+        return cls.modules().get(dotpath) or \
+               importlib.import_module(dotpath)
+    
+    def index_export(self, name, thing):
+        """ Add an exported thing to the export identity index,
+            replacing any thing previously exported under its name
         """
-        return search_modules(thing, *cls.modules().values())[0]
+        if self.dotpath is None:
+            return
+        previous = self.__exports__.get(name, NotYourThing)
+        if previous is not NotYourThing:
+            self.unindex_export(name, previous)
+        homes = type(self).exportindex.setdefault(id(thing), [])
+        # Prefer the module in which a thing was defined:
+        try:
+            defined = getattr(thing, '__module__', None)
+        except Exception: # pragma: no cover
+            defined = None
+        if type(defined) is str and defined == self.dotpath:
+            homes.insert(0, (self.dotpath, name))
+        else:
+            homes.append((self.dotpath, name))
+    
+    def unindex_export(self, name, thing):
+        """ Remove an exported thing from the export identity index """
+        homes = type(self).exportindex.get(id(thing))
+        if homes is not None:
+            if (self.dotpath, name) in homes:
+                homes.remove((self.dotpath, name))
+            if not homes:
+                del type(self).exportindex[id(thing)]
     
     def __init__(self, *args, path=None, dotpath=None, **kwargs):
+        # Let the import profiler know, if it’s running:
+        profiling.exporter_created(self)
         for arg in args:
             if hasattr(arg, '__exports__'):
-                self.__exports__.update(arg.__exports__)
+                self.update(arg.__exports__)
             elif hasattr(arg, '_asdict'):
-                self.__exports__.update(arg._asdict())
+                self.update(arg._asdict())
             elif hasattr(arg, 'to_dict'):
-                self.__exports__.update(arg.to_dict())
+                self.update(arg.to_dict())
             else:
                 try:
                     d = dict(arg)
                 except (TypeError, ValueError):
                     pass
                 else:
-                    self.__exports__.update(d)
+                    self.update(d)
     
     def hash(self):
         """ Return a stringified hash value corresponding to this
@@ -532,7 +868,7 @@ class ExporterBase(collections.abc.MutableMapping,
         """
         return self.dotpath and stringhash(self.dotpath) or None
     
-    def datafile(self):
+    def datafile(self, suffix='pkl'):
         """ Return a unique filename for this instance """
         from clu.fs.appdirectories import AppDirs        
         # Initialize an AppDirs instance:
@@ -546,17 +882,36 @@ class ExporterBase(collections.abc.MutableMapping,
         selfhash = self.hash()
         if not selfhash:
             raise AttributeError("Could not hash the exporter instances’ dotpath")
-        return Path(appdirs.user_config / selfhash + ".pkl")
+        return Path(appdirs.user_config / selfhash + f".{suffix}")
     
     @contextlib.contextmanager
-    def data(self, path=NoDefault):
+    def data(self, path=NoDefault, backend=NoDefault):
         """ Context manager for opening a shelving database, corresponding
             to this particular exporter instances’ dotpath.
+            
+            The “backend” argument – which defaults to the “datastore” class
+            attribute – chooses the database: “shelve” opens a write-back
+            “shelve” database, as per the standard library; “sqlite” opens
+            a “clu.shelving.sqlite.SQLiteShelf”, which loads values lazily
+            and allows reads from many processes at once. The block runs in
+            a single write transaction on the SQLiteShelf, holding its write
+            lock throughout: changes are committed when the block exits, or
+            rolled back if it raises.
         """
+        if backend is NoDefault:
+            backend = type(self).datastore
+        if backend not in self.datafile_suffixes:
+            raise ValueError(f"unknown data backend: {backend!r}")
         if path is NoDefault:
-            path = self.datafile()
+            path = self.datafile(suffix=self.datafile_suffixes[backend])
         
         # Yield out a proper shelving database instance:
+        if backend == 'sqlite':
+            from clu.shelving.sqlite import SQLiteShelf
+            with SQLiteShelf(path, writeback=True) as shelving:
+                with shelving.transaction():
+                    yield shelving
+            return
         with contextlib.closing(shelve.open(os.fspath(path), writeback=True)) as shelving:
             yield shelving
     
@@ -711,7 +1066,8 @@ class ExporterBase(collections.abc.MutableMapping,
                 warnings.warn(type(self).messages['docstr'] % (named, typename),
                               ExportWarning, stacklevel=2)
         
-        # Stow the item in the global __exports__ dict:
+        # Index and stow the item in the global __exports__ dict:
+        self.index_export(named, thing)
         self.__exports__[named] = thing
         
         # Return the thing, unchanged (that’s how we decorate).
@@ -766,14 +1122,27 @@ class ExporterBase(collections.abc.MutableMapping,
         return self.dir_function(*additionals), \
                self.all_tuple(*additionals) # OPPOSITE!
     
+    def getattr_and_dir(self, manifest, *additionals):
+        """ Assign a modules’ __getattr__ and __dir__ values, such that
+            the names in the manifest are imported lazily, e.g.:
+            
+                >>> __getattr__, __dir__ = exporter.getattr_and_dir(manifest)
+            
+            … q.v. the “lazy_attributes(…)” function and the “manifest()”
+            class method supra. The names of this instances’ own exports
+            are included in the values returned by “__dir__()”.
+        """
+        return lazy_attributes(self.dotpath, manifest, *chain(self.keys(),
+                                                              additionals))
+    
     @staticmethod
     def cache_info():
-        """ Shortcut to get the CacheInfo namedtuple from the
-            cached internal `search_by_id(…)` function,
+        """ Shortcut to get the IndexInfo namedtuple from the
+            reverse module index behind `search_by_id(…)`,
             which is used in last-resort name lookups made by
             `determine_name(…)` during `export(…)` calls.
         """
-        return search_by_id.cache_info()
+        return moduleindex.info()
     
     def module(self):
         """ Shortcut to get the parent module for the exporter. """
@@ -818,9 +1187,11 @@ class ExporterBase(collections.abc.MutableMapping,
         return self.__exports__[key]
     
     def __setitem__(self, key, value):
+        self.index_export(key, value)
         self.__exports__[key] = value
     
     def __delitem__(self, key):
+        self.unindex_export(key, self.__exports__[key])
         del self.__exports__[key]
     
     def __add__(self, operand):
@@ -859,6 +1230,7 @@ class ExporterBase(collections.abc.MutableMapping,
     def __dir__(self):
         return list(filter(lambda name: name not in ('all_appnames',
                                                      'all_modules',
+                                                     'all_classes',
                                                      'has_appname',
                                                      'for_appname',
                                                      'unregister'),
@@ -908,10 +1280,12 @@ with exporter as export:
     export(moduleids)
     export(itermoduleids)
     export(Modulespace)
+    export(ModuleIndex)
     export(search_by_id)
     export(search_for_name)
     export(search_for_module)
     export(search_modules)
+    export(lazy_attributes)
     export(stringhash)
     export(determine_name)
     export(path_to_dotpath)
@@ -997,6 +1371,70 @@ def test():
         format_environment_module = search_for_module(utils.format_environment)
         assert utils == format_environment_module
     
+    def scan_by_id(thingID):
+        """ The exhaustive module scan, formerly used by “search_by_id(…)” """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for module in sysmods():
+                for key, valueID in itermoduleids(module):
+                    if valueID == thingID:
+                        return module, key
+        return None, None
+    
+    @inline.fixture
+    def searchables():
+        """ A tuple of things to search for, by ID """
+        from clu.testing import utils
+        return (utils.InlineTester, Registry, stringhash, consts.BUILTINS)
+    
+    @inline
+    def test_search_by_id_scanning():
+        """ Baseline: search by ID, scanning all modules """
+        for thing in searchables():
+            assert scan_by_id(id(thing))[0] is not None
+    
+    @inline
+    def test_search_by_id_indexed():
+        """ Search by ID, with the reverse module index """
+        for thing in searchables():
+            assert search_by_id(id(thing))[0] is not None
+    
+    # N.B. when run as “__main__”, this modules’ registry is a copy:
+    from clu import exporting
+    
+    def scan_registry(thing):
+        """ The exhaustive registry search, formerly used by “Registry.nameof(…)” """
+        modules = (importlib.import_module(modulename) \
+                             for subcls in exporting.Registry.all_classes() \
+                         for modulename in subcls.modulenames())
+        return search_modules(thing, *modules)[1]
+    
+    @inline.fixture
+    def exportables():
+        """ A tuple of exported things to look up """
+        from clu import naming, predicates, typology
+        return (naming.nameof, naming.qualified_name,
+                predicates.isiterable, typology.ismapping)
+    
+    @inline.precheck
+    def check_registry_nameof():
+        """ Check indexed registry lookups against exhaustive searches """
+        for thing in exportables():
+            assert exporting.Registry.nameof(thing) == scan_registry(thing)
+            assert exporting.Registry.moduleof(thing).__name__ == thing.__module__
+    
+    @inline
+    def test_registry_nameof_scanning():
+        """ Baseline: registry name lookups, scanning exported modules """
+        for thing in exportables():
+            assert scan_registry(thing) is not None
+    
+    @inline
+    def test_registry_nameof_indexed():
+        """ Registry name lookups, with the export identity index """
+        for thing in exportables():
+            assert exporting.Registry.nameof(thing) is not None
+    
     @inline
     def test_hash():
         """ Test the string-hashing of the exporters’ dotpath """
@@ -1021,6 +1459,22 @@ def test():
         
         assert not os.path.exists(tempname)
     
+    @inline
+    def test_shelving_sqlite():
+        """ Test the data-shelving context manager with the SQLite backend """
+        from clu.fs.filesystem import TemporaryName
+        
+        with TemporaryName(randomized=True, suffix='sqlite3') as tempfile:
+            with exporter.data(path=tempfile.name, backend='sqlite') as database:
+                database['yo'] = 'dogg'
+                database['i_heard'] = ['you like dicts']
+            with exporter.data(path=tempfile.name, backend='sqlite') as database:
+                database['i_heard'].append('and lists')
+            with exporter.data(path=tempfile.name, backend='sqlite') as database:
+                assert database['yo'] == 'dogg'
+                assert database['i_heard'] == ['you like dicts', 'and lists']
+                assert len(database) == 2
+    
     @inline.diagnostic
     def show_search_by_id_cache_info():
         print("SEARCH-BY-ID CACHE INFO:")
@@ -973,6 +973,32 @@ class Directory(BaseFSName,
                                          source=source,
                                        excludes=excludes).keys()
     
+    def snapshot(self):
+        """ Return a tuple of the names of the directory’s entries, in the
+            order in which “os.scandir(…)” yields them, cached between calls.
+            
+            The ordered views returned by “keys()”, “values()” and “items()”
+            use this snapshot to index and slice the directory without a full
+            directory scan per subscript. The cache is keyed on the resolved
+            path and its modification time, and is rescanned when either one
+            changes – but as changes within the timestamp resolution of the
+            filesystem can slip past, call “invalidate()” (q.v. sub.) after
+            modifying the directory contents, to be sure.
+        """
+        if not self.exists:
+            return tuple()
+        path = os.path.realpath(self.name)
+        stamp = (path, os.stat(path).st_mtime_ns)
+        cache = getattr(self, 'snapshotcache', None)
+        if cache is None or cache[0] != stamp:
+            with os.scandir(path) as iterscan:
+                cache = self.snapshotcache = (stamp, tuple(k.name for k in iterscan))
+        return cache[1]
+    
+    def invalidate(self):
+        """ Discard the cached directory snapshot (q.v. “snapshot()” supra.) """
+        self.snapshotcache = None
+    
     @wraps(dict.items)
     def items(self):
         return clu.dicts.OrderedItemsView(self)
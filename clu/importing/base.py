@@ -30,6 +30,7 @@ except ImportError:
     import importlib_metadata as _metadata
     importlib.metadata = _metadata
 
+from clu import profiling
 from clu.constants import consts
 from clu.extending import Extensible
 from clu.naming import nameof, dotpath_split, dotpath_join, qualified_name
@@ -345,6 +346,10 @@ class LoaderBase(clu.abstract.AppName,
         function decorator.
     """
     
+    # The “exec_module(…)” method reports to the import profiler
+    # directly – q.v. “clu.profiling.ImportProfiler.instrument(…)”:
+    selfprofiling = True
+    
     @classmethod
     def __init_subclass__(cls, **kwargs):
         """ Initialize a new LoaderBase subclass, registering it
@@ -421,16 +426,17 @@ class LoaderBase(clu.abstract.AppName,
             An “__execute__()” method shouldn’t return anything.
         """
         if not getattr(module, '_executed', False):
-            if hasattr(module, '__execute__'):
-                if callable(module.__execute__):
-                    try:
-                        module.__execute__()
-                    finally:
-                        module._executed = True
+            with profiling.timing(module.__name__, kind='class-module'):
+                if hasattr(module, '__execute__'):
+                    if callable(module.__execute__):
+                        try:
+                            module.__execute__()
+                        finally:
+                            module._executed = True
+                    else:
+                        raise TypeError("__execute__() method not callable")
                 else:
-                    raise TypeError("__execute__() method not callable")
-            else:
-                module._executed = True
+                    module._executed = True
     
     def __reduce__(self):
         return (polymers.get_loader,
@@ -486,6 +492,7 @@ class FinderBase(clu.abstract.AppName,
             embedded loader instance.
         """
         out = cls.cache[fullname] = ModuleSpec(fullname, cls.loader)
+        profiling.annotate(fullname, kind='class-module')
         return out
     
     @classmethod
@@ -1,7 +1,15 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function
 
+import builtins
+import collections.abc
+import marshal
+import mmap
+import os
 import plistlib
+import struct
+import sys
+import threading
 import zict # type: ignore
 
 from clu.constants.consts import APPNAME, ENCODING, NoDefault
@@ -17,6 +25,368 @@ from clu.exporting import Exporter
 exporter = Exporter(path=__file__)
 export = exporter.decorator()
 
+def marshal_loads(data):
+    """ Unmarshal a value – or, if it was written with the “plist”
+        serializer, load it with “plistlib” instead.
+    """
+    if bytes(data[:8]).startswith((b'<?xml', b'bplist00')):
+        return plistlib.loads(data)
+    return marshal.loads(data)
+
+# Serializers for CLUInterface values, as “(dump, load)” pairs:
+serializers = {
+    'plist'     : (attr(plistlib, 'dumps', 'writePlistToString'),
+                   attr(plistlib, 'loads', 'readPlistFromString')),
+    'marshal'   : (marshal.dumps, marshal_loads)
+}
+
+@export
+class LogStore(collections.abc.MutableMapping):
+    
+    """ A log-structured mapping of string keys to bytes values, kept in
+        a single append-only segment file within a directory – for use as
+        an alternative to the one-file-per-key “zict.File” mapping, which
+        is what CLUInterface uses by default.
+        
+        Sets and deletions append records to the segment file; an in-memory
+        hash index maps each live key to the offset and length of its value,
+        which is read through a memory map of the segment. The index is
+        written out to a compact index file on “flush()” and “close()”, and
+        rebuilt from it on open – replaying only those records appended
+        after it was written, if any.
+        
+        Overwritten and deleted records are garbage, reclaimed by “compact()”
+        – which rewrites the live records to a new segment, in a background
+        thread unless told to wait, while the store remains usable. This
+        happens automatically once the garbage outweighs the live data, and
+        the segment exceeds “threshold” bytes.
+        
+        N.B. only one process at a time should open a given LogStore.
+    """
+    
+    SEGMENT = 'store.log'
+    INDEX = 'store.idx'
+    MAGIC = b'CLULOGX1'
+    
+    # Record headers: a deletion flag, the key length, and the value length:
+    header = struct.Struct('<BII')
+    indexheader = struct.Struct('<8sQ')
+    
+    def __init__(self, directory, threshold=2**20):
+        self.directory = os.fspath(directory)
+        self.threshold = threshold
+        self.segment = os.path.join(self.directory, type(self).SEGMENT)
+        self.indexfile = os.path.join(self.directory, type(self).INDEX)
+        self.lock = threading.RLock()
+        self.index = {}
+        self.garbage = 0
+        self.mapping = None
+        self.compactor = None
+        os.makedirs(self.directory, exist_ok=True)
+        self.handle = open(self.segment, 'ab')
+        self.load()
+    
+    @classmethod
+    def recordsize(cls, key, length):
+        return cls.header.size + len(key.encode(ENCODING)) + length
+    
+    def size(self):
+        """ Return the size of the segment file, in bytes """
+        return self.handle.tell()
+    
+    def view(self, end):
+        """ Return a memory map of the segment, covering at least “end” bytes """
+        if self.mapping is None or len(self.mapping) < end:
+            self.handle.flush()
+            if self.mapping is not None:
+                self.mapping.close()
+            with open(self.segment, 'rb') as handle:
+                self.mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.mapping
+    
+    def unmap(self):
+        if self.mapping is not None:
+            self.mapping.close()
+            self.mapping = None
+    
+    def replay(self, start, index):
+        """ Apply the records in the segment from “start” onward to an index,
+            returning the garbage thereby created, and the offset after the
+            last complete record.
+        """
+        end = self.size()
+        if start >= end:
+            return 0, start
+        garbage, offset = 0, start
+        view = self.view(end)
+        while offset + self.header.size <= end:
+            deletion, keylength, length = self.header.unpack_from(view, offset)
+            valueoffset = offset + self.header.size + keylength
+            if valueoffset + length > end:
+                break
+            key = str(view[offset + self.header.size:valueoffset], encoding=ENCODING)
+            if key in index:
+                garbage += self.recordsize(key, index[key][1])
+            if deletion:
+                index.pop(key, None)
+                garbage += valueoffset - offset
+            else:
+                index[key] = (valueoffset, length)
+            offset = valueoffset + length
+        return garbage, offset
+    
+    def load(self):
+        """ Rebuild the index from the index file, and the segment """
+        start = 0
+        try:
+            with open(self.indexfile, 'rb') as handle:
+                data = handle.read()
+            magic, start = self.indexheader.unpack_from(data)
+            if magic != type(self).MAGIC or start > self.size():
+                raise ValueError(magic)
+            self.index, self.garbage = marshal.loads(data[self.indexheader.size:])
+        except (OSError, ValueError, EOFError, TypeError, struct.error):
+            start, self.index, self.garbage = 0, {}, 0
+        garbage, end = self.replay(start, self.index)
+        self.garbage += garbage
+        if end < self.size():
+            # Drop an incomplete trailing record:
+            self.unmap()
+            self.handle.truncate(end)
+            self.handle.seek(end)
+    
+    def append(self, key, value, deletion=False):
+        encoded = key.encode(ENCODING)
+        offset = self.size()
+        self.handle.write(self.header.pack(deletion and 1 or 0, len(encoded), len(value)))
+        self.handle.write(encoded)
+        self.handle.write(value)
+        return offset + self.header.size + len(encoded)
+    
+    def __getitem__(self, key):
+        with self.lock:
+            offset, length = self.index[key]
+            return bytes(self.view(offset + length)[offset:offset + length])
+    
+    def __setitem__(self, key, value):
+        value = bytes(value)
+        with self.lock:
+            if key in self.index:
+                self.garbage += self.recordsize(key, self.index[key][1])
+            self.index[key] = (self.append(key, value), len(value))
+        self.maybe_compact()
+    
+    def __delitem__(self, key):
+        with self.lock:
+            length = self.index.pop(key)[1]
+            self.garbage += self.recordsize(key, length)
+            self.garbage += self.recordsize(key, 0)
+            self.append(key, b'', deletion=True)
+        self.maybe_compact()
+    
+    def __contains__(self, key):
+        return key in self.index
+    
+    def __iter__(self):
+        with self.lock:
+            keys = tuple(self.index)
+        yield from keys
+    
+    def __len__(self):
+        return len(self.index)
+    
+    def flush(self):
+        """ Flush the segment, and write out the index file """
+        with self.lock:
+            self.handle.flush()
+            data = self.indexheader.pack(type(self).MAGIC, self.size()) \
+                 + marshal.dumps((self.index, self.garbage))
+            temporary = self.indexfile + '.tmp'
+            with open(temporary, 'wb') as handle:
+                handle.write(data)
+            os.replace(temporary, self.indexfile)
+    
+    def maybe_compact(self):
+        if self.compactor is None and self.size() > self.threshold \
+                                  and self.garbage * 2 > self.size():
+            self.compact(wait=False)
+    
+    def compact(self, wait=True):
+        """ Rewrite the live records to a new segment, reclaiming the space
+            used by garbage – in a background thread, unless “wait” is true.
+            
+            Waiting on a compaction that was already running – which only
+            reclaims the garbage present when it started – is followed by
+            another pass, if any garbage was left behind.
+        """
+        with self.lock:
+            started = self.compactor is None
+            if started:
+                self.handle.flush()
+                self.compactor = threading.Thread(target=self.rewrite,
+                                                  args=(dict(self.index), self.size()),
+                                                  daemon=True)
+                self.compactor.start()
+            compactor = self.compactor
+        if wait:
+            compactor.join()
+            if not started and self.garbage:
+                self.compact(wait=True)
+    
+    def rewrite(self, index, end):
+        """ Copy the live records in “index” from the first “end” bytes of
+            the segment to a new one; then, holding the lock, copy anything
+            appended in the meantime, and swap the new segment into place.
+        """
+        newsegment = self.segment + '.compact'
+        newindex = {}
+        try:
+            with open(self.segment, 'rb') as source, open(newsegment, 'wb') as target:
+                view = mmap.mmap(source.fileno(), end, access=mmap.ACCESS_READ) if end else b''
+                try:
+                    for key, (offset, length) in index.items():
+                        encoded = key.encode(ENCODING)
+                        position = target.tell()
+                        target.write(self.header.pack(0, len(encoded), length))
+                        target.write(encoded)
+                        target.write(view[offset:offset + length])
+                        newindex[key] = (position + self.header.size + len(encoded), length)
+                finally:
+                    if end:
+                        view.close()
+                with self.lock:
+                    self.handle.flush()
+                    # Copy over everything appended since the snapshot:
+                    source.seek(end)
+                    tail = source.read()
+                    base = target.tell()
+                    target.write(tail)
+                    target.flush()
+                    self.unmap()
+                    self.handle.close()
+                    # N.B. drop the index file first, lest a crash pair
+                    # it with the new segment:
+                    if os.path.exists(self.indexfile):
+                        os.remove(self.indexfile)
+                    os.replace(newsegment, self.segment)
+                    self.handle = open(self.segment, 'ab')
+                    garbage, _ = self.replay(base, newindex)
+                    self.index, self.garbage = newindex, garbage
+                    self.compactor = None
+                    self.flush()
+        except BaseException:
+            with self.lock:
+                self.compactor = None
+            raise
+    
+    def close(self):
+        """ Finish any compaction, flush, and close the segment """
+        compactor = self.compactor
+        if compactor is not None:
+            compactor.join()
+        with self.lock:
+            if not self.handle.closed:
+                self.flush()
+                self.unmap()
+                self.handle.close()
+
+@export
+class TieredStore(collections.abc.MutableMapping):
+    
+    """ A tiered mapping over a slower, persistent mapping – such as the
+        “zict” stack of a CLUInterface – with an optional in-memory
+        “zict.LRU” layer of up to “cache” values, and optional write-behind
+        buffering of sets and deletions.
+        
+        With “buffer=None” (the default) writes go straight through to the
+        persistent mapping. Otherwise they’re held in memory until either
+        “flush()” is called, or – if “buffer” is nonzero – until that many
+        writes are pending. Closing the store flushes it.
+    """
+    
+    def __init__(self, store, cache=0, buffer=None):
+        self.store = store
+        self.cache = zict.LRU(cache, {}) if cache else None
+        self.buffer = buffer
+        self.pending = {}
+        self.deleted = builtins.set() # N.B. “set(…)” is defined sub.
+    
+    @property
+    def buffering(self):
+        return self.buffer is not None
+    
+    def flush(self):
+        """ Write all buffered sets and deletions to the persistent mapping """
+        for key in self.deleted:
+            if key in self.store:
+                del self.store[key]
+        self.store.update(self.pending)
+        self.deleted.clear()
+        self.pending.clear()
+    
+    def close(self):
+        """ Flush the store (q.v. “flush()” supra.) """
+        self.flush()
+    
+    def __getitem__(self, key):
+        if key in self.deleted:
+            raise KeyError(key)
+        if key in self.pending:
+            return self.pending[key]
+        if self.cache is not None:
+            if key in self.cache:
+                return self.cache[key]
+            value = self.cache[key] = self.store[key]
+            return value
+        return self.store[key]
+    
+    def __setitem__(self, key, value):
+        if self.cache is not None:
+            self.cache[key] = value
+        if not self.buffering:
+            self.store[key] = value
+            return
+        self.deleted.discard(key)
+        self.pending[key] = value
+        if self.buffer and len(self.pending) >= self.buffer:
+            self.flush()
+    
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if self.cache is not None:
+            self.cache.pop(key, None)
+        if not self.buffering:
+            del self.store[key]
+            return
+        self.pending.pop(key, None)
+        self.deleted.add(key)
+    
+    def __contains__(self, key):
+        if key in self.deleted:
+            return False
+        if key in self.pending:
+            return True
+        if self.cache is not None and key in self.cache:
+            return True
+        return key in self.store
+    
+    def __iter__(self):
+        keys = dict.fromkeys(self.store)
+        keys.update(dict.fromkeys(self.pending))
+        yield from (key for key in keys if key not in self.deleted)
+    
+    def __len__(self):
+        if not self.pending and not self.deleted:
+            return len(self.store)
+        return sum(1 for key in self)
+
+# Backends for CLUInterface storage, by name:
+backends = {
+    'files'     : zict.File,
+    'log'       : LogStore
+}
+
 @export
 class CLUInterface(AppDirs):
     
@@ -24,6 +394,8 @@ class CLUInterface(AppDirs):
                                 'version',
                                 'version_info',
                                 'datadir',
+                                'serializer',
+                                'backend',
                                 'count',
                                 'closed',
               
@@ -34,11 +406,31 @@ class CLUInterface(AppDirs):
     
     def __init__(self, appname=None,
                        version=None,
-                       datadir=None):
+                       datadir=None, *,
+                       serializer='plist',
+                       backend='files',
+                       cache=0,
+                       buffer=None):
         """ Initialize a key-value store with a default “appname” parameter `clu` –
             q.v. ``clu.constants.consts``, the “PROJECT_NAME” constant supra. –
-            and set up all required I/O interfaces based on this name:
+            and set up all required I/O interfaces based on this name.
+            
+            The “serializer” may be “plist” (the default) or “marshal”, which
+            is a good deal faster – and which can still read values written
+            with “plist”. Nonzero “cache” and non-None “buffer” values set up
+            a “TieredStore” (q.v. class definition supra.) over the files,
+            with an LRU cache of that many values and write-behind buffering,
+            respectively; use “flush()” to write out buffered changes.
+            
+            The “backend” may be “files” (the default) which stores each value
+            in its own file, via “zict.File” – or “log”, which stores them all
+            in a single log-structured segment file (q.v. “LogStore” supra.)
         """
+        if serializer not in serializers:
+            raise KeyValueError(f"Unknown serializer: {serializer}")
+        if backend not in backends:
+            raise KeyValueError(f"Unknown backend: {backend}")
+        
         # Get CLU’s version, if necessary:
         import clu
         
@@ -47,9 +439,9 @@ class CLUInterface(AppDirs):
                                            version=version or clu.version_info.to_string(),
                                             system=System.LINUX2)
         
-        # Use passed-in “datadir” or “user_config”
-        self.datadir = datadir and Directory(datadir) \
-                                or self.user_config
+        # Use passed-in “datadir” or “user_config” – N.B. a Directory
+        # that doesn’t exist yet is falsey, hence the conditional:
+        self.datadir = Directory(datadir) if datadir else self.user_config
         
         # Create the “datadir” directory if necessary:
         if not self.datadir.exists:
@@ -58,14 +450,23 @@ class CLUInterface(AppDirs):
                 self.migrate_from_previous()
         
         # Configure zicts for key-value I/O:
-        self.zfile = zict.File(str(self.datadir))
-        self.zutf8 = zict.Func(dump=attr(plistlib, 'dumps', 'writePlistToString'),
-                               load=attr(plistlib, 'loads', 'readPlistFromString'),
+        dump, load = serializers[serializer]
+        self.serializer = serializer
+        self.backend = backend
+        self.zfile = backends[backend](str(self.datadir))
+        self.zutf8 = zict.Func(dump=dump,
+                               load=load,
                                d=self.zfile)
         self.zfunc = zict.Func(dump=lambda value: isstring(value) and value.encode(ENCODING) or value,
                                load=lambda value: isbytes(value) and value.decode(ENCODING) or value,
                                d=self.zutf8)
         
+        # Set up the tiered store, if need be:
+        self.zdict = self.zfunc
+        if cache or buffer is not None:
+            self.zdict = TieredStore(self.zfunc, cache=cache,
+                                                 buffer=buffer)
+        
         # WE ARE *NOT* CLOSED
         self._closed = False
     
@@ -81,18 +482,18 @@ class CLUInterface(AppDirs):
     
     def has(self, key):
         """ Test if a key is contained in this key-value store. """
-        return key in self.zfunc
+        return key in self.zdict
     
     def count(self):
         """ Return the number of items in this key-value store. """
-        return len(self.zfunc)
+        return len(self.zdict)
     
     def get(self, key, default=NoDefault):
         """ Return a value from this key-value store. """
         if default is NoDefault:
-            return self.zfunc[key]
+            return self.zdict[key]
         try:
-            return self.zfunc[key]
+            return self.zdict[key]
         except KeyError:
             return default
     
@@ -102,38 +503,38 @@ class CLUInterface(AppDirs):
             raise KeyValueError("Non-Falsey key required (k: %s, v: %s)" % (key, value))
         if not value:
             raise KeyValueError("Non-Falsey value required (k: %s, v: %s)" % (key, value))
-        self.zfunc[key] = value
+        self.zdict[key] = value
         return self.get(key)
     
     def delete(self, key):
         """ Delete a value from this key-value store. """
         if not key:
             raise KeyValueError("Non-Falsey key required for deletion (k: %s)" % key)
-        del self.zfunc[key]
+        del self.zdict[key]
     
     def iterate(self):
         """ Return an iterator for this key-value store. """
-        yield from self.zfunc
+        yield from self.zdict
     
     def update(self, dictish=NoDefault, **updates):
         """ Update the key-value store with key/value pairs and/or an iterator;
             q.v. `dict.update(…)` docstring supra.
         """
         if dictish is NoDefault:
-            return self.zfunc.update(**updates)
-        return self.zfunc.update(dictish, **updates)
+            return self.zdict.update(**updates)
+        return self.zdict.update(dictish, **updates)
     
     def keys(self):
         """ Return an iterable with all of the keys in this key-value store. """
-        yield from self.zfunc.keys()
+        yield from self.zdict.keys()
     
     def values(self):
         """ Return an iterable with all of the values in this key-value store. """
-        yield from self.zfunc.values()
+        yield from self.zdict.values()
     
     def items(self):
         """ Return an iterable yielding (key, value) for all items in this key-value store. """
-        yield from self.zfunc.items()
+        yield from self.zdict.items()
     
     def as_dict(self):
         """ Return a plain dict with the key-value stores’ contents. """
@@ -142,9 +543,15 @@ class CLUInterface(AppDirs):
             out[key] = self[key]
         return out
     
+    def flush(self):
+        """ Write out any buffered changes """
+        self.zdict.flush()
+    
     def close(self):
         """ Attept to close zicts """
         from zict.common import close as closer # type: ignore
+        if self.zdict is not self.zfunc:
+            closer(self.zdict)
         closer(self.zfunc)
         closer(self.zutf8)
         closer(self.zfile)
@@ -177,7 +584,7 @@ class CLUInterface(AppDirs):
         return exc_type is None
     
     def __len__(self):
-        return len(self.zfunc)
+        return len(self.zdict)
     
     def __fspath__(self):
         return str(self.datadir.name)
@@ -186,19 +593,19 @@ class CLUInterface(AppDirs):
         return len(self) > 0
     
     def __iter__(self):
-        yield from self.zfunc
+        yield from self.zdict
     
     def __contains__(self, key):
-        return key in self.zfunc
+        return key in self.zdict
     
     def __getitem__(self, key):
-        return self.zfunc[key]
+        return self.zdict[key]
     
     def __setitem__(self, key, value):
-        self.zfunc[key] = value
+        self.zdict[key] = value
     
     def __delitem__(self, key):
-        del self.zfunc[key]
+        del self.zdict[key]
 
 # Module-local singleton key-value instance:
 interface = CLUInterface()
@@ -261,4 +668,90 @@ def items():
 export(interface,           name='interface')
 
 # Assign the modules’ `__all__` and `__dir__` using the exporter:
-__all__, __dir__ = exporter.all_and_dir()
\ No newline at end of file
+__all__, __dir__ = exporter.all_and_dir()
+
+def test():
+    
+    from clu.fs.filesystem import TemporaryDirectory
+    from clu.testing.utils import inline
+    
+    @inline.fixture
+    def smallvalues():
+        """ Return 256 small key-value pairs """
+        return { f"key{idx}" : idx % 2 and f"value{idx}" or idx for idx in range(1, 257) }
+    
+    def exercise(**options):
+        """ Set, then get – four times over – 256 small values """
+        with TemporaryDirectory(prefix='keyvalue-') as temporary:
+            with CLUInterface(datadir=temporary, **options) as interface:
+                values = smallvalues()
+                for key, value in values.items():
+                    interface[key] = value
+                for _ in range(4):
+                    for key, value in values.items():
+                        assert interface[key] == value
+            with CLUInterface(datadir=temporary, **options) as interface:
+                assert len(interface) == len(values)
+    
+    @inline
+    def test_keyvalue_plist():
+        """ Baseline: get/set small values with files and plists """
+        exercise()
+    
+    @inline
+    def test_keyvalue_marshal():
+        """ Marshal: get/set small values with files and “marshal” """
+        exercise(serializer='marshal')
+    
+    @inline
+    def test_keyvalue_marshal_tiered():
+        """ Tiered: get/set small values with an LRU cache and write buffer """
+        exercise(serializer='marshal', cache=512, buffer=0)
+    
+    @inline
+    def test_keyvalue_marshal_log():
+        """ Log-structured: get/set small values in a single segment file """
+        exercise(serializer='marshal', backend='log')
+    
+    @inline.fixture
+    def manykeys():
+        """ Return a directory holding a store of 16k small values per backend """
+        if not stores:
+            stores['temporary'] = temporary = TemporaryDirectory(prefix='keyvalue-')
+            values = { f"key{idx}" : idx for idx in range(16384) }
+            for backend in backends:
+                with CLUInterface(datadir=temporary.subpath(backend),
+                                  serializer='marshal',
+                                  backend=backend) as interface:
+                    interface.update(values)
+        return stores['temporary']
+    
+    stores = {}
+    
+    @inline
+    def test_keyvalue_open_iterate_files():
+        """ Baseline: open and iterate a 16k-value store of files """
+        with CLUInterface(datadir=manykeys().subpath('files'),
+                          serializer='marshal') as interface:
+            assert sum(1 for key in interface) == 16384
+            assert interface['key16383'] == 16383
+    
+    @inline
+    def test_keyvalue_open_iterate_log():
+        """ Log-structured: open and iterate a 16k-value log store """
+        with CLUInterface(datadir=manykeys().subpath('log'),
+                          serializer='marshal', backend='log') as interface:
+            assert sum(1 for key in interface) == 16384
+            assert interface['key16383'] == 16383
+    
+    @inline.diagnostic
+    def remove_manykeys():
+        """ Remove the 16k-value stores’ temporary directory """
+        if stores:
+            stores.pop('temporary').close()
+    
+    # Run all inline tests, return POSIX status
+    return inline.test(10)
+
+if __name__ == '__main__':
+    sys.exit(test())
\ No newline at end of file
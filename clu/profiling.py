@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+import contextlib
+import importlib.abc
+import os
+import sys
+import time
+import tracemalloc
+
+# N.B. This module must not import anything from CLU at module level –
+# the import profiler has to be installable before any of CLU’s own
+# modules are imported, in order for it to measure them (q.v. the
+# “CLU_PROFILE_IMPORTS” check in “clu/__init__.py”)
+
+# The environment variable that switches on import profiling:
+ENVIRONMENT_VARIABLE = 'CLU_PROFILE_IMPORTS'
+
+# The active ImportProfiler instance, if any – q.v. “install(…)” sub.
+profiler = None
+
+nanoseconds = time.perf_counter_ns
+nullcontext = contextlib.nullcontext()
+
+class ImportRecord(object):
+    
+    """ The measurements for a single module import:
+        
+        • “name” – the module name;
+        • “parent” – the name of the module whose import pulled
+          this module in, or None if it was imported directly;
+        • “children” – the names of the modules pulled in by this
+          module’s import, in the order in which they were imported;
+        • “cumulative” – wall time in nanoseconds, including the
+          time taken by the imports of all of the children;
+        • “allocated” – the net change in memory allocated during
+          the import, in bytes, as per “tracemalloc” – or None if
+          allocations weren’t traced;
+        • “kind” – either “module”, or “class-module” for the class-
+          based modules of “clu.importing” (q.v. “LoaderBase” et al.);
+        • “exporter” – the qualified name of the type of the exporter
+          instance created by the module, for modules that use the
+          “clu.exporting” machinery; None otherwise.
+    """
+    
+    __slots__ = ('name', 'parent', 'children',
+                 'start', 'cumulative', 'allocated',
+                 'kind', 'exporter')
+    
+    def __init__(self, name, parent=None, kind='module'):
+        self.name = name
+        self.parent = parent
+        self.children = []
+        self.start = 0
+        self.cumulative = 0
+        self.allocated = None
+        self.kind = kind
+        self.exporter = None
+    
+    def __repr__(self):
+        return (f"<ImportRecord “{self.name}” "
+                f"({self.cumulative / 1e6:.3f}ms cumulative) "
+                f"@ {hex(id(self))}>")
+
+class ProfilingFinder(importlib.abc.MetaPathFinder):
+    
+    """ A meta-path finder that fields every import first – delegating
+        the search to the other finders on “sys.meta_path”, and then
+        instrumenting the loader of whatever spec is found, so that
+        the execution of the module gets timed.
+    """
+    
+    def __init__(self, profiler):
+        self.profiler = profiler
+    
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in tuple(sys.meta_path):
+            if finder is self:
+                continue
+            find_spec = getattr(finder, 'find_spec', None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                self.profiler.instrument(spec.loader)
+                return spec
+        return None
+
+class ImportProfiler(object):
+    
+    """ An import-time profiler. Install one with “install(…)”, or by
+        setting the “CLU_PROFILE_IMPORTS” environment variable before
+        importing CLU – q.v. “python -m clu --imports”.
+        
+        The profiler records wall time, net memory allocations (if the
+        “allocations” flag is set, via “tracemalloc”) and the import
+        dependency edges for each module imported while it runs – that
+        is to say, which module’s import pulled in which other modules.
+        
+        N.B. tracing allocations slows everything down considerably;
+        switch it off if you are only interested in the timings.
+    """
+    
+    def __init__(self, allocations=True):
+        self.allocations = allocations
+        self.records = {}
+        self.order = []
+        self.stack = []
+        self.instrumented = []
+        self.finder = ProfilingFinder(self)
+        self.tracing = False
+    
+    def start(self):
+        """ Start profiling: install the profiling finder at the head
+            of “sys.meta_path”, and start tracing allocations
+        """
+        if self.finder not in sys.meta_path:
+            sys.meta_path.insert(0, self.finder)
+        if self.allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.tracing = True
+        return self
+    
+    def stop(self):
+        """ Stop profiling, restoring all instrumented loaders """
+        if self.finder in sys.meta_path:
+            sys.meta_path.remove(self.finder)
+        while self.instrumented:
+            loader = self.instrumented.pop()
+            with contextlib.suppress(AttributeError):
+                del loader.exec_module
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+        return self
+    
+    def instrument(self, loader):
+        """ Wrap the “exec_module(…)” method of a loader instance in
+            a call to “timing(…)” (q.v. method definition sub.)
+            
+            Loaders that are classes – e.g. the builtin and frozen
+            module importers – are left alone, as are loaders that
+            call “timing(…)” on their own (like “LoaderBase”).
+        """
+        if loader is None or isinstance(loader, type):
+            return
+        if getattr(loader, 'selfprofiling', False):
+            return
+        if 'exec_module' in getattr(loader, '__dict__', {}):
+            return
+        exec_module = getattr(loader, 'exec_module', None)
+        if exec_module is None:
+            return
+        
+        def timed_exec_module(module):
+            with self.timing(module.__name__):
+                return exec_module(module)
+        
+        try:
+            loader.exec_module = timed_exec_module
+        except (AttributeError, TypeError): # pragma: no cover
+            return
+        self.instrumented.append(loader)
+    
+    def traced(self):
+        if self.tracing or (self.allocations and tracemalloc.is_tracing()):
+            return tracemalloc.get_traced_memory()[0]
+        return None
+    
+    @contextlib.contextmanager
+    def timing(self, name, kind='module'):
+        """ Context manager measuring the import of the named module,
+            recording the dependency edge from whichever module import
+            is currently in progress, if any
+        """
+        parent = self.stack and self.stack[-1] or None
+        record = self.records.get(name)
+        if record is None:
+            record = self.records[name] = ImportRecord(name, kind=kind)
+            self.order.append(name)
+        if parent is not None:
+            if record.parent is None:
+                record.parent = parent.name
+            if name not in parent.children:
+                parent.children.append(name)
+        record.kind = kind
+        self.stack.append(record)
+        allocated = self.traced()
+        record.start = nanoseconds()
+        try:
+            yield record
+        finally:
+            record.cumulative += nanoseconds() - record.start
+            if allocated is not None:
+                current = self.traced()
+                if current is not None:
+                    record.allocated = (record.allocated or 0) + current - allocated
+            self.stack.pop()
+    
+    def exporter_created(self, exporter):
+        """ Note the creation of an exporter (q.v. “clu.exporting”)
+            in the module whose import is currently in progress
+        """
+        if not self.stack:
+            return
+        record = self.records.get(exporter.dotpath)
+        if record is not None:
+            cls = type(exporter)
+            record.exporter = f"{cls.__module__}.{cls.__qualname__}"
+    
+    def annotate(self, name, **attributes):
+        """ Set attributes on the record for the named module,
+            creating the record if necessary
+        """
+        record = self.records.get(name)
+        if record is None:
+            record = self.records[name] = ImportRecord(name)
+            self.order.append(name)
+        for attribute, value in attributes.items():
+            setattr(record, attribute, value)
+        return record
+    
+    def selftime(self, name):
+        """ Return the “self” time of the named modules’ import, in
+            nanoseconds: its cumulative time, minus the cumulative time
+            of the imports it pulled in
+        """
+        record = self.records[name]
+        return record.cumulative - sum(self.records[child].cumulative \
+                                       for child in record.children)
+    
+    def selfallocated(self, name):
+        """ Return the net allocations made by the named modules’
+            import, not counting those made by the imports it pulled in
+        """
+        record = self.records[name]
+        if record.allocated is None:
+            return None
+        return record.allocated - sum(self.records[child].allocated or 0 \
+                                      for child in record.children)
+    
+    def edges(self):
+        """ Iterate over the import dependency edges, as tuples of
+            “(importer, imported)” module names
+        """
+        for name in self.order:
+            for child in self.records[name].children:
+                yield (name, child)
+    
+    def roots(self):
+        """ Iterate over the records for modules that were not pulled
+            in by any other module profiled
+        """
+        for name in self.order:
+            record = self.records[name]
+            if record.parent is None:
+                yield record
+    
+    def ranked(self, sortby='cumulative', prefix=None):
+        """ Return a list of the import records, sorted in descending
+            order by either “cumulative” or “self” time, optionally
+            restricted to module names beginning with a given prefix
+        """
+        records = (self.records[name] for name in self.order)
+        if prefix is not None:
+            records = (record for record in records \
+                               if record.name == prefix \
+                               or record.name.startswith(f"{prefix}."))
+        if sortby == 'self':
+            key = lambda record: self.selftime(record.name)
+        elif sortby == 'cumulative':
+            key = lambda record: record.cumulative
+        else:
+            raise ValueError(f"can’t sort records by “{sortby}”")
+        return sorted(records, key=key, reverse=True)
+    
+    def report(self, limit=25, sortby='cumulative', prefix=None):
+        """ Return the import profile as a list of lines of text:
+            a table of module imports, with their cumulative and self
+            times and allocations, followed by a listing of the modules
+            that each of the listed modules pulled in.
+        """
+        records = self.ranked(sortby=sortby, prefix=prefix)[:limit]
+        if not records:
+            return []
+        width = max(len(record.name) for record in records)
+        kibibytes = lambda size: size is None and "–" or f"{size / 1024:.1f}"
+        
+        lines = [f"{'module':<{width}}  {'cumul ms':>10}  {'self ms':>10}  "
+                 f"{'cumul KiB':>10}  {'self KiB':>10}  imported by"]
+        for record in records:
+            marker = record.exporter and "*" or " "
+            lines.append(f"{record.name:<{width}}{marker} "
+                         f"{record.cumulative / 1e6:>10.3f}  "
+                         f"{self.selftime(record.name) / 1e6:>10.3f}  "
+                         f"{kibibytes(record.allocated):>10}  "
+                         f"{kibibytes(self.selfallocated(record.name)):>10}  "
+                         f"{record.parent or '–'}")
+        lines.append("")
+        for record in records:
+            if record.children:
+                lines.append(f"{record.name} → {', '.join(record.children)}")
+        return lines
+
+def install(allocations=True):
+    """ Create, start, and return the active import profiler – or
+        just return it, if one is already running
+    """
+    global profiler
+    if profiler is None:
+        profiler = ImportProfiler(allocations=allocations).start()
+    return profiler
+
+def uninstall():
+    """ Stop and discard the active import profiler, returning it """
+    global profiler
+    out, profiler = profiler, None
+    if out is not None:
+        out.stop()
+    return out
+
+def requested(environment=None):
+    """ Return the import-profiling mode requested via the environment
+        variable “CLU_PROFILE_IMPORTS”: “time” for timings alone, “all”
+        for timings and allocations (which any other value besides “0”
+        will also get you) – or None, if no profiling was requested
+    """
+    environment = os.environ if environment is None else environment
+    value = environment.get(ENVIRONMENT_VARIABLE, '0').strip().lower()
+    if value in ('', '0'):
+        return None
+    return value == 'time' and 'time' or 'all'
+
+def install_if_requested(environment=None):
+    """ Install the import profiler if the environment requests it
+        (q.v. “requested(…)” supra.) returning it – or None
+    """
+    mode = requested(environment)
+    if mode is None:
+        return None
+    return install(allocations=(mode == 'all'))
+
+def timing(name, kind='module'):
+    """ Time the import of the named module with the active profiler
+        – or do nothing at all, if no profiler is running
+    """
+    if profiler is None:
+        return nullcontext
+    return profiler.timing(name, kind=kind)
+
+def exporter_created(exporter):
+    """ Hook called by “ExporterBase.__init__(…)” – q.v. “clu.exporting” """
+    if profiler is not None:
+        profiler.exporter_created(exporter)
+
+def annotate(name, **attributes):
+    """ Annotate the named module’s import record, if a profiler is running """
+    if profiler is not None:
+        profiler.annotate(name, **attributes)
+
+__all__ = ('ENVIRONMENT_VARIABLE',
+           'ImportRecord', 'ProfilingFinder', 'ImportProfiler',
+           'install', 'uninstall',
+           'requested', 'install_if_requested',
+           'timing', 'exporter_created', 'annotate')
+
+__dir__ = lambda: list(__all__)
+
+def test():
+    
+    from clu.testing.utils import inline
+    
+    @inline
+    def test_profile_clu_modules():
+        """ Profile the import of all CLU modules, in a subprocess """
+        import subprocess
+        environment = dict(os.environ)
+        environment[ENVIRONMENT_VARIABLE] = '1'
+        output = subprocess.run([sys.executable, '-m', 'clu', '--imports'],
+                                 env=environment,
+                                 capture_output=True,
+                                 check=True,
+                                 text=True).stdout
+        assert 'IMPORT PROFILE' in output
+        assert 'clu.typology' in output
+        assert 'clu.typology →' in output
+    
+    @inline.diagnostic
+    def show_profile():
+        """ Show the import profile of whichever CLU modules remain """
+        from clu.all import import_clu_modules
+        importer = install(allocations=False)
+        try:
+            import_clu_modules()
+        finally:
+            uninstall()
+        print()
+        for line in importer.report(limit=10, prefix='clu'):
+            print(line)
+    
+    # Run all inline tests:
+    return inline.test(1)
+
+if __name__ == '__main__':
+    sys.exit(test())
@@ -0,0 +1,319 @@
+# -*- encoding: utf-8 -*-
+from __future__ import print_function
+
+import clu.abstract
+import collections.abc
+import contextlib
+import os
+import pickle
+import sqlite3
+import sys
+
+from clu.constants.consts import NoDefault
+from clu.exporting import Exporter
+
+exporter = Exporter(path=__file__)
+export = exporter.decorator()
+
+@export
+class SQLiteShelf(clu.abstract.ManagedContext,
+                  collections.abc.MutableMapping):
+    
+    """ A “shelve”-alike persistent mapping of string keys to pickled
+        values, stored in an SQLite database file.
+        
+        Values are unpickled lazily, one at a time, as they’re asked for;
+        changes are held in memory and written out together, in a single
+        transaction, by “sync()” – which is called on “close()”, on a clean
+        exit from a “transaction()” block, and on a clean exit from the
+        SQLiteShelf itself, when it’s used as a context manager. A block
+        that raises discards its pending changes, instead.
+        
+        A “transaction()” block takes the database’s write lock on entry,
+        and holds it until its changes are committed or rolled back – so
+        read-modify-write updates made within the block (appending to a
+        list value, say) can’t be lost to those of other writers. Outside
+        of such a block, values are read without taking the lock.
+        
+        The database runs in SQLite’s write-ahead-log mode, so any number
+        of processes may read from it while another one is writing; writers
+        wait up to “timeout” seconds for one another.
+        
+        With “writeback=True” (the default, as per “ExporterBase.data()”),
+        every value read from the shelf is also held for write-back – so
+        in-place changes to mutable values persist, as with “shelve” – but
+        only those values whose pickles have actually changed are written.
+    """
+    
+    SCHEMA = """CREATE TABLE IF NOT EXISTS shelf (
+                    key TEXT PRIMARY KEY NOT NULL,
+                    value BLOB NOT NULL
+                ) WITHOUT ROWID"""
+    
+    def __init__(self, path, writeback=True,
+                             timeout=30.0,
+                             protocol=pickle.HIGHEST_PROTOCOL):
+        """ Initialize an SQLiteShelf, opening (and, if necessary, creating)
+            the database file at “path”
+        """
+        self.path = os.fspath(path)
+        self.writeback = writeback
+        self.protocol = protocol
+        self.cache = {}     # key → value, for everything read or written
+        self.pickles = {}   # key → pickle as read, for write-back checks
+        self.dirty = set()  # keys assigned since the last sync
+        self.deleted = set()
+        self.locked = False # whether a write transaction is open
+        self.connection = sqlite3.connect(self.path, timeout=timeout,
+                                                     isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(type(self).SCHEMA)
+    
+    @property
+    def closed(self):
+        """ Whether or not the SQLiteShelf has been closed """
+        return self.connection is None
+    
+    def setup(self):
+        return self
+    
+    def teardown(self):
+        self.close()
+    
+    def __exit__(self, exc_type=None,
+                       exc_val=None,
+                       exc_tb=None):
+        if exc_type is not None:
+            self.discard()
+        self.close()
+        return False
+    
+    def execute(self, sql, *parameters):
+        """ Execute a statement on the database connection """
+        if self.connection is None:
+            raise ValueError("invalid operation on closed shelf")
+        return self.connection.execute(sql, parameters)
+    
+    def load(self, key):
+        """ Read, unpickle and return the value for “key” from the database,
+            caching it as need be – or raise a KeyError, if it isn’t there.
+        """
+        row = self.execute("SELECT value FROM shelf WHERE key = ?", key).fetchone()
+        if row is None:
+            raise KeyError(key)
+        value = pickle.loads(row[0])
+        if self.writeback:
+            self.cache[key] = value
+            self.pickles[key] = row[0]
+        return value
+    
+    def changes(self):
+        """ Return a dict of the pickles to be written out on sync – those for
+            assigned keys, plus, in write-back mode, any read values whose
+            pickles differ from those read in.
+        """
+        out = {}
+        for key, value in self.cache.items():
+            if key in self.dirty:
+                out[key] = pickle.dumps(value, protocol=self.protocol)
+            elif key in self.pickles:
+                data = pickle.dumps(value, protocol=self.protocol)
+                if data != self.pickles[key]:
+                    out[key] = data
+        return out
+    
+    def begin(self):
+        """ Open a write transaction, if one isn’t open already – taking
+            the database’s write lock until the next “sync()” or “discard()”
+        """
+        if not self.locked:
+            self.execute("BEGIN IMMEDIATE")
+            self.locked = True
+    
+    def sync(self):
+        """ Write all pending changes to the database, in one transaction –
+            committing the open write transaction, if there is one
+        """
+        changes = self.changes()
+        if changes or self.deleted or self.locked:
+            self.begin()
+            try:
+                self.connection.executemany("DELETE FROM shelf WHERE key = ?",
+                                           ((key,) for key in self.deleted))
+                self.connection.executemany("INSERT OR REPLACE INTO shelf (key, value) VALUES (?, ?)",
+                                            changes.items())
+            except BaseException:
+                self.discard()
+                raise
+            else:
+                self.execute("COMMIT")
+                self.locked = False
+        self.discard()
+    
+    def discard(self):
+        """ Drop all pending changes and cached values, rolling back the
+            open write transaction, if there is one
+        """
+        if self.locked:
+            self.locked = False
+            self.execute("ROLLBACK")
+        self.cache.clear()
+        self.pickles.clear()
+        self.dirty.clear()
+        self.deleted.clear()
+    
+    @contextlib.contextmanager
+    def transaction(self):
+        """ Context manager running its block in a single write transaction:
+            the write lock is taken on entry, and the changes made within the
+            block are committed together on a clean exit, or rolled back if
+            the block raises. Nested blocks join the outermost transaction.
+        """
+        if self.locked:
+            yield self
+            return
+        # Write out any earlier changes, and drop any values read before
+        # the lock was taken – they may have changed since:
+        self.sync()
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.discard()
+            raise
+        else:
+            self.sync()
+    
+    def close(self):
+        """ Sync any pending changes, and close the database connection """
+        if self.connection is not None:
+            try:
+                self.sync()
+            finally:
+                self.connection.close()
+                self.connection = None
+    
+    def __getitem__(self, key):
+        if key in self.deleted:
+            raise KeyError(key)
+        if key in self.cache:
+            return self.cache[key]
+        return self.load(key)
+    
+    def __setitem__(self, key, value):
+        self.deleted.discard(key)
+        self.cache[key] = value
+        self.dirty.add(key)
+    
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.cache.pop(key, None)
+        self.pickles.pop(key, None)
+        self.dirty.discard(key)
+        self.deleted.add(key)
+    
+    def __contains__(self, key):
+        if key in self.deleted:
+            return False
+        if key in self.cache:
+            return True
+        return self.execute("SELECT 1 FROM shelf WHERE key = ?", key).fetchone() is not None
+    
+    def __iter__(self):
+        keys = dict.fromkeys(row[0] for row in self.execute("SELECT key FROM shelf"))
+        keys.update(dict.fromkeys(self.dirty))
+        yield from (key for key in keys if key not in self.deleted)
+    
+    def __len__(self):
+        if not self.dirty and not self.deleted:
+            return self.execute("SELECT COUNT(*) FROM shelf").fetchone()[0]
+        return sum(1 for key in self)
+    
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def pop(self, key, default=NoDefault):
+        try:
+            value = self[key]
+        except KeyError:
+            if default is NoDefault:
+                raise
+            return default
+        del self[key]
+        return value
+    
+    def __repr__(self):
+        state = self.closed and "closed" or f"{len(self.dirty)} pending"
+        return f"{type(self).__name__}({self.path!r}) @ {state}"
+
+# Assign the modules’ `__all__` and `__dir__` using the exporter:
+__all__, __dir__ = exporter.all_and_dir()
+
+def test():
+    
+    from clu.fs.filesystem import TemporaryDirectory
+    from clu.testing.utils import inline
+    import shelve
+    
+    @inline.fixture
+    def metadata():
+        """ Return 256 dicts of per-module metadata """
+        return { f"clu.module{idx}" : { 'index'   : idx,
+                                        'exports' : [f"thing{jdx}" for jdx in range(16)] } \
+                                       for idx in range(256) }
+    
+    @inline.precheck
+    def check_sqlite_shelf():
+        """ Check SQLiteShelf write-back, deletion and discarding """
+        with TemporaryDirectory(prefix='sqlite-shelf-') as temporary:
+            path = temporary.subpath('shelf.sqlite3')
+            with SQLiteShelf(path) as shelf:
+                shelf.update(metadata())
+                shelf['history'] = []
+            with SQLiteShelf(path) as shelf:
+                assert len(shelf) == 257
+                shelf['history'].append('yo dogg')
+                del shelf['clu.module0']
+            try:
+                with SQLiteShelf(path) as shelf:
+                    shelf['history'].append('i heard')
+                    raise ValueError()
+            except ValueError:
+                pass
+            with SQLiteShelf(path) as shelf:
+                assert shelf['history'] == ['yo dogg']
+                assert 'clu.module0' not in shelf
+                assert shelf['clu.module1'] == metadata()['clu.module1']
+    
+    @inline
+    def test_shelve_writeback():
+        """ Baseline: write, then update, 256 values with “shelve” """
+        with TemporaryDirectory(prefix='shelve-') as temporary:
+            path = temporary.subpath('shelf.pkl')
+            with contextlib.closing(shelve.open(path, writeback=True)) as shelf:
+                shelf.update(metadata())
+            for key in tuple(metadata())[::16]:
+                with contextlib.closing(shelve.open(path, writeback=True)) as shelf:
+                    shelf[key]['index'] += 1
+    
+    @inline
+    def test_sqlite_shelf_writeback():
+        """ SQLite: write, then update, 256 values with “SQLiteShelf” """
+        with TemporaryDirectory(prefix='sqlite-shelf-') as temporary:
+            path = temporary.subpath('shelf.sqlite3')
+            with SQLiteShelf(path) as shelf:
+                shelf.update(metadata())
+            for key in tuple(metadata())[::16]:
+                with SQLiteShelf(path) as shelf:
+                    shelf[key]['index'] += 1
+    
+    # Run all inline tests, return POSIX status
+    return inline.test(10)
+
+if __name__ == '__main__':
+    sys.exit(test())
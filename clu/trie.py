@@ -1,13 +1,20 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function
 
+from array import array
+from bisect import bisect_left
 from collections import defaultdict as DefaultDict
 from functools import lru_cache
+from itertools import islice
 from copy import copy
 
+import collections
 import collections.abc
 import clu.abstract
 import clu.enums
+import mmap
+import os
+import struct
 import sys
 
 from clu.naming import moduleof
@@ -23,15 +30,44 @@ cache = lambda function: lru_cache(maxsize=128, typed=False)(function)
 @export
 class BaseTrie(clu.abstract.Unhashable, metaclass=clu.abstract.Slotted):
     
+    """ A character trie, which doubles as an Aho–Corasick automaton.
+        
+        The “failure” links and “outputs” – the lengths of the strings that
+        end at each node, either directly or by way of its failure links –
+        are built lazily by the root node, upon the first “search(…)” or
+        “matches(…)” call after any “add(…)” call (q.v. “build()” sub.)
+        Searches then run in time linear in the length of the searched
+        string, plus the number of matches, regardless of the number of
+        strings in the trie.
+        
+        Searching from a node other than the root searches only the subtrie
+        below that node – as if it were a trie of its own – by scanning the
+        string from each position in turn, without the automaton.
+    """
+    
     __slots__ = ('is_final',
                  'identity', 'parent',
-                 'children')
+                 'children',
+                 'failure', 'outputs')
     
     def __init__(self):
         self.is_final = False
         self.identity = None
         self.parent = None # root nodes have no parents
         self.children = DefaultDict(type(self))
+        self.failure = None # unbuilt nodes have no failure links
+        self.outputs = tuple()
+    
+    def rootnode(self):
+        """ Return the root node of the trie containing this node """
+        trie = self
+        while trie.parent is not None:
+            trie = trie.parent
+        return trie
+    
+    def invalidate(self):
+        """ Discard the failure links, so the next search will rebuild them """
+        self.rootnode().failure = None
     
     def add(self, string):
         if not string:
@@ -43,12 +79,90 @@ class BaseTrie(clu.abstract.Unhashable, metaclass=clu.abstract.Slotted):
             child.parent = trie
             trie = child
         trie.is_final = True
+        self.invalidate()
+    
+    def build(self):
+        """ Build the Aho–Corasick failure links and outputs for the trie,
+            breadth-first from the root node, and return the root node.
+        """
+        root = self.rootnode()
+        root.failure = root
+        root.outputs = tuple()
+        queue = collections.deque()
+        for child in root.children.values():
+            child.failure = root
+            child.outputs = child.is_final and (1,) or tuple()
+            queue.append((child, 1))
+        while queue:
+            node, depth = queue.popleft()
+            for character, child in node.children.items():
+                failure = node.failure
+                while failure is not root and character not in failure.children:
+                    failure = failure.failure
+                child.failure = failure.children.get(character, root)
+                child.outputs = child.is_final and (depth + 1,) + child.failure.outputs \
+                                                or child.failure.outputs
+                queue.append((child, depth + 1))
+        return root
+    
+    def automaton(self):
+        """ Return the root node, with its failure links built as need be """
+        root = self.rootnode()
+        if root.failure is None:
+            root.build()
+        return root
+    
+    def iterfinal(self, string):
+        """ Iterate over “(end, outputs)” pairs, one for each position in
+            “string” at which one or more of the strings in the trie end –
+            where “outputs” is a tuple of the lengths of those strings.
+        """
+        if self.parent is not None:
+            # Scan the subtrie below this node from each position:
+            ends = DefaultDict(list)
+            for pos in range(len(string)):
+                trie = self
+                for idx, character in enumerate(islice(string, pos, None), pos):
+                    trie = trie.children.get(character)
+                    if trie is None:
+                        break
+                    if trie.is_final:
+                        ends[idx + 1].append(idx + 1 - pos)
+            for end in sorted(ends):
+                yield end, tuple(ends[end])
+            return
+        root = trie = self.automaton()
+        for idx, character in enumerate(string):
+            while trie is not root and character not in trie.children:
+                trie = trie.failure
+            trie = trie.children.get(character, root)
+            if trie.failure is None:
+                # A node created since the build – say, by indexing into
+                # the “children” DefaultDict – means the links are stale:
+                root.build()
+            if trie.outputs:
+                yield idx + 1, trie.outputs
+    
+    def matches(self, string):
+        """ Iterate over “(start, match)” pairs for every occurrence in
+            “string” of any of the strings in the trie – overlapping ones
+            included – ordered by where they end, longest first.
+        """
+        for end, outputs in self.iterfinal(string):
+            for length in outputs:
+                yield end - length, string[end - length:end]
+    
+    def compile(self):
+        """ Compile the trie into a “CompiledTrie” (q.v. class sub.) """
+        return CompiledTrie.compile(self)
     
     def find(self, string, pos):
         if not string:
             return False
+        if pos < 0:
+            pos = max(len(string) + pos, 0)
         trie = self
-        for character in string[pos:]:
+        for character in islice(string, pos, None):
             if trie.is_final:
                 return True
             if character in trie.children:
@@ -58,7 +172,11 @@ class BaseTrie(clu.abstract.Unhashable, metaclass=clu.abstract.Slotted):
         return trie.is_final
     
     def search(self, string):
-        return any(self.find(string, pos) for pos in range(len(string)))
+        if self.parent is not None:
+            return any(self.find(string, pos) for pos in range(len(string)))
+        for _ in self.iterfinal(string):
+            return True
+        return False
 
 @export
 class Trie(BaseTrie, collections.abc.MutableMapping):
@@ -83,11 +201,13 @@ class Trie(BaseTrie, collections.abc.MutableMapping):
         if not subclasscheck(BaseTrie, typeof(newvalue)):
             raise ValueError(f"what the fuck is this? --> {newvalue}")
         self.children[character] = newvalue
+        self.invalidate()
     
     def __delitem__(self, character):
         if not character:
             raise ValueError(f"can’t index a trie with falsey value: {character}")
         del self.children[character]
+        self.invalidate()
     
     def __iter__(self):
         yield from self.children
@@ -117,6 +237,309 @@ class Trie(BaseTrie, collections.abc.MutableMapping):
         print()
         return super().search(string)
 
+@export
+class CompiledTrie(clu.abstract.ReprWrapper, metaclass=clu.abstract.Slotted):
+    
+    """ A frozen, compact form of a trie and its Aho–Corasick automaton,
+        stored in flat parallel arrays of unsigned 32-bit integers rather
+        than as a graph of node objects.
+        
+        Nodes are numbered breadth-first, with the root node as zero; the
+        edges out of node “n” are at “offsets[n]” up to “offsets[n + 1]”
+        in the “labels” (character codepoints, sorted) and “targets” (node
+        numbers) arrays. Per-node arrays hold the failure links, the length
+        of the string ending at each node (zero for non-final nodes), the
+        next final node along the failure links (again, zero for none), and
+        the parent node and codepoint for each node, for “whoami(…)”.
+        
+        As its nodes are numbers, node-level methods like “whoami(node)”
+        take a node number – whereas “handle(string)” returns a handle on
+        a node (q.v. “CompiledNode” infra.) whose “whoami()” does not, as
+        with the trie nodes themselves.
+        
+        Use “CompiledTrie.compile(trie)” (or “trie.compile()”) to create
+        one; “search(…)”, “find(…)” and “matches(…)” work as they do with
+        the trie itself. CompiledTrie instances pickle, and can also be
+        written to disk with “dump(…)” and loaded – memory-mapped, by
+        default – with “CompiledTrie.load(…)”.
+    """
+    
+    __slots__ = ('offsets', 'labels', 'targets',
+                 'failures', 'finals', 'dictlinks',
+                 'parents', 'identities',
+                 'buffer')
+    
+    fields = ('offsets', 'labels', 'targets',
+              'failures', 'finals', 'dictlinks',
+              'parents', 'identities')
+    
+    typecode = 'I'
+    magic = b'CLUTRIE1'
+    header = struct.Struct('=8sQQ')
+    
+    def __init__(self, *arrays, buffer=None):
+        for field, values in zip(type(self).fields, arrays):
+            setattr(self, field, values)
+        self.buffer = buffer
+    
+    @classmethod
+    def compile(cls, trie):
+        """ Compile a trie (any “BaseTrie” node will do, as its root node
+            is what gets compiled) into a new CompiledTrie instance.
+        """
+        root = trie.automaton()
+        nodes = [root]
+        numbers = { id(root) : 0 }
+        arrays = { field : array(cls.typecode) for field in cls.fields }
+        offsets, labels, targets = arrays['offsets'], arrays['labels'], arrays['targets']
+        finals, parents, identities = arrays['finals'], arrays['parents'], arrays['identities']
+        parents.append(0)
+        identities.append(0)
+        offsets.append(0)
+        
+        # Number the nodes breadth-first, laying out the edges:
+        for number, node in enumerate(nodes):
+            for character in sorted(node.children):
+                child = node.children[character]
+                numbers[id(child)] = len(nodes)
+                nodes.append(child)
+                labels.append(ord(character))
+                targets.append(numbers[id(child)])
+                parents.append(number)
+                identities.append(ord(character))
+            offsets.append(len(labels))
+        
+        # Rebuild the links, if any node was created since the last build:
+        if any(node.failure is None for node in nodes):
+            root.build()
+        
+        # The lengths of the strings ending at each node:
+        depths = [0]
+        finals.append(0)
+        for number in range(1, len(nodes)):
+            depths.append(depths[parents[number]] + 1)
+            finals.append(nodes[number].is_final and depths[number] or 0)
+        
+        # The failure links and dictionary links – as failure links
+        # always lead to shallower nodes, these are all available in
+        # breadth-first order:
+        failures, dictlinks = arrays['failures'], arrays['dictlinks']
+        for number, node in enumerate(nodes):
+            failure = numbers[id(node.failure)]
+            failures.append(failure)
+            if number == 0:
+                dictlinks.append(0)
+            else:
+                dictlinks.append(finals[failure] and failure or dictlinks[failure])
+        
+        return cls(*(arrays[field] for field in cls.fields))
+    
+    def __getstate__(self):
+        out = {}
+        for field in type(self).fields:
+            values = getattr(self, field)
+            if not isinstance(values, array):
+                values = array(self.typecode, values.tobytes())
+            out[field] = values
+        return out
+    
+    def __setstate__(self, state):
+        for field in type(self).fields:
+            setattr(self, field, state[field])
+        self.buffer = None
+    
+    def dump(self, path):
+        """ Write the compiled trie out to a file at “path” """
+        with open(path, 'wb') as handle:
+            handle.write(type(self).header.pack(type(self).magic,
+                                                len(self.finals),
+                                                len(self.labels)))
+            for field in type(self).fields:
+                handle.write(getattr(self, field).tobytes())
+    
+    @classmethod
+    def load(cls, path, mapped=True):
+        """ Load a compiled trie from a file at “path”, as written by
+            “dump(…)” (q.v. supra.) – using a read-only memory map of the
+            file by default, or copying its contents if “mapped” is false.
+        """
+        with open(path, 'rb') as handle:
+            if mapped:
+                buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                view = memoryview(buffer)
+            else:
+                buffer = None
+                view = memoryview(handle.read())
+        magic, nodecount, edgecount = cls.header.unpack_from(view)
+        if magic != cls.magic:
+            raise ValueError(f"not a compiled trie file: {path}")
+        itemsize = array(cls.typecode).itemsize
+        lengths = { 'offsets' : nodecount + 1,
+                    'labels'  : edgecount,
+                    'targets' : edgecount }
+        arrays = []
+        start = cls.header.size
+        for field in cls.fields:
+            end = start + lengths.get(field, nodecount) * itemsize
+            values = view[start:end].cast(cls.typecode)
+            if not mapped:
+                values = array(cls.typecode, values.tobytes())
+            arrays.append(values)
+            start = end
+        return cls(*arrays, buffer=buffer)
+    
+    def close(self):
+        """ Release the memory map backing a loaded compiled trie, if any """
+        if self.buffer is not None:
+            for field in type(self).fields:
+                getattr(self, field).release()
+            self.buffer.close()
+            self.buffer = None
+    
+    def nbytes(self):
+        """ Return the size of the compiled trie’s arrays, in bytes """
+        return sum(len(getattr(self, field)) for field in type(self).fields) \
+                 * array(self.typecode).itemsize
+    
+    def __len__(self):
+        return len(self.finals)
+    
+    def inner_repr(self):
+        return f"nodes={len(self.finals)}, edges={len(self.labels)}"
+    
+    def child(self, node, codepoint):
+        """ Return the number of the child of a node along the edge labeled
+            with a given codepoint – or zero, if there is no such child.
+        """
+        start, end = self.offsets[node], self.offsets[node + 1]
+        idx = bisect_left(self.labels, codepoint, start, end)
+        if idx < end and self.labels[idx] == codepoint:
+            return self.targets[idx]
+        return 0
+    
+    def node(self, string):
+        """ Return the number of the node for a string – or None, if the
+            string isn’t in the trie, not even as a prefix.
+        """
+        node = 0
+        for character in string:
+            node = self.child(node, ord(character))
+            if not node:
+                return None
+        return node
+    
+    def handle(self, string):
+        """ Return a handle on the node for a string (q.v. “CompiledNode”
+            infra.) – or None, if the string isn’t in the trie, not even
+            as a prefix.
+        """
+        node = self.node(string)
+        if node is None:
+            return None
+        return CompiledNode(self, node)
+    
+    def whoami(self, node):
+        """ Return the string leading to a given node """
+        out = []
+        while node:
+            out.append(chr(self.identities[node]))
+            node = self.parents[node]
+        return ''.join(reversed(out))
+    
+    def outputs(self, node):
+        """ Return a tuple of the lengths of the strings ending at a node,
+            either directly or by way of its failure links
+        """
+        out = []
+        if self.finals[node]:
+            out.append(self.finals[node])
+        link = self.dictlinks[node]
+        while link:
+            out.append(self.finals[link])
+            link = self.dictlinks[link]
+        return tuple(out)
+    
+    def iterfinal(self, string):
+        """ Iterate over “(end, outputs)” pairs, as per the trie method
+            of the same name (q.v. “BaseTrie.iterfinal(…)” supra.)
+        """
+        # N.B. this inlines “child(…)” (q.v. supra.) for speed:
+        offsets, labels, targets = self.offsets, self.labels, self.targets
+        failures, finals, dictlinks = self.failures, self.finals, self.dictlinks
+        node = 0
+        for idx, character in enumerate(string):
+            codepoint = ord(character)
+            while True:
+                start, end = offsets[node], offsets[node + 1]
+                if end - start == 1:
+                    target = labels[start] == codepoint and targets[start] or 0
+                else:
+                    edge = bisect_left(labels, codepoint, start, end)
+                    target = edge < end and labels[edge] == codepoint and targets[edge] or 0
+                if target or not node:
+                    break
+                node = failures[node]
+            node = target
+            if finals[node] or dictlinks[node]:
+                yield idx + 1, self.outputs(node)
+    
+    def matches(self, string):
+        """ Iterate over “(start, match)” pairs, as per the trie method
+            of the same name (q.v. “BaseTrie.matches(…)” supra.)
+        """
+        for end, outputs in self.iterfinal(string):
+            for length in outputs:
+                yield end - length, string[end - length:end]
+    
+    def find(self, string, pos):
+        if not string:
+            return False
+        if pos < 0:
+            pos = max(len(string) + pos, 0)
+        node = 0
+        for character in islice(string, pos, None):
+            if self.finals[node]:
+                return True
+            node = self.child(node, ord(character))
+            if not node:
+                return False
+        return bool(self.finals[node])
+    
+    def search(self, string):
+        for _ in self.iterfinal(string):
+            return True
+        return False
+
+@export
+class CompiledNode(clu.abstract.ReprWrapper, metaclass=clu.abstract.Slotted):
+    
+    """ A handle on a node of a CompiledTrie – as returned by the method
+        “CompiledTrie.handle(…)” – whose methods, like those of the trie
+        nodes, take no node-number argument.
+    """
+    
+    __slots__ = ('trie', 'number')
+    
+    def __init__(self, trie, number):
+        self.trie = trie
+        self.number = number
+    
+    @property
+    def is_final(self):
+        return bool(self.trie.finals[self.number])
+    
+    def is_rootnode(self):
+        return not self.number
+    
+    def whoami(self):
+        return self.trie.whoami(self.number)
+    
+    def outputs(self):
+        return self.trie.outputs(self.number)
+    
+    def inner_repr(self):
+        return f"{self.number}: {self.whoami()!r}"
+
 @export
 class Status(clu.enums.AliasingEnum):
     
@@ -161,10 +584,23 @@ class Status(clu.enums.AliasingEnum):
     def group_label(self):
         return str(self.value)
 
+# The compiled trie searched by “TrieSearcher” worker processes –
+# q.v. “TrieSearcher.iterbatches(…)” sub.
+worker_automaton = None
+
+def worker_initialize(path):
+    """ Load the shared compiled trie in a worker process, memory-mapped """
+    global worker_automaton
+    worker_automaton = CompiledTrie.load(path)
+
+def worker_search(terms):
+    """ Search a chunk of terms in a worker process """
+    return tuple(term for term in terms if worker_automaton.search(term))
+
 @export
 class TrieSearcher(clu.abstract.ReprWrapper, metaclass=clu.abstract.Slotted):
     
-    __slots__ = ('search_space', 'search_sets', 'root_node')
+    __slots__ = ('search_space', 'search_sets', 'root_node', 'compiled')
     
     def __init__(self, *strings):
         if not isstringlist(strings):
@@ -172,13 +608,35 @@ class TrieSearcher(clu.abstract.ReprWrapper, metaclass=clu.abstract.Slotted):
         self.search_space = list()
         self.search_sets = list()
         self.root_node = Trie()
+        self.compiled = None
         for string in strings:
             self.search_space.append(string)
             self.root_node.add(string)
     
+    def inner_repr(self):
+        return repr(self.search_space)
+    
+    def compile(self):
+        """ Compile the search space into a “CompiledTrie” (q.v. supra.),
+            which all subsequent searches will use – until the search space
+            grows. The node trie remains available as “root_node”.
+        """
+        if self.compiled is None:
+            self.compiled = self.root_node.compile()
+        return self.compiled
+    
+    def automaton(self):
+        """ Return the compiled trie, if there is one – or else the root
+            node of the trie – for searching.
+        """
+        if self.compiled is not None:
+            return self.compiled
+        return self.root_node
+    
     def add_to_search_space(self, *strings):
         if not isstringlist(strings):
             raise ValueError(f"these are not strings: {stringlist}")
+        self.compiled = None
         for string in strings:
             self.search_space.append(string)
             self.root_node.add(string)
@@ -186,7 +644,8 @@ class TrieSearcher(clu.abstract.ReprWrapper, metaclass=clu.abstract.Slotted):
     def _do_search(self, infodict):
         infodict['status'] = Status.RUNNING
         terms = infodict['terms']
-        out = tuple(term for term in terms if self.root_node.search(term))
+        automaton = self.automaton()
+        out = tuple(term for term in terms if automaton.search(term))
         infodict['results'] = out
         infodict['status'] = Status.COMPLETE
         return out
@@ -201,7 +660,151 @@ class TrieSearcher(clu.abstract.ReprWrapper, metaclass=clu.abstract.Slotted):
         }
         response = self._do_search(query)
         return response
+    
+    def iterbatches(self, terms, processes=None, chunksize=256):
+        """ Search an iterable (or stream) of terms in chunks, spread across
+            a pool of worker processes, yielding a tuple of the matching
+            terms from each chunk as soon as it finishes – so in no
+            particular order.
+            
+            The workers share the compiled trie, which is written out to a
+            temporary file and memory-mapped by each of them. At most two
+            chunks per process are in flight at once, so streams are consumed
+            only as fast as they’re searched. Passing “processes=0” searches
+            the chunks in this process instead, without a pool.
+            
+            Each batch search registers a dict in “search_sets”, tracking its
+            status – PENDING, RUNNING, then COMPLETE, or INCOMPLETE if the
+            search is abandoned or fails – and the numbers of terms submitted
+            and searched, and the results so far. The dict is registered as
+            soon as this is called, and the search stays PENDING until its
+            first batch is requested.
+        """
+        infodict = {
+            'status': Status.PENDING,
+            'submitted': 0,
+            'searched': 0,
+            'results': []
+        }
+        self.search_sets.append(infodict)
+        return self.searchbatches(terms, processes, chunksize, infodict)
+    
+    def searchbatches(self, terms, processes, chunksize, infodict):
+        """ Run a batch search, updating its “search_sets” entry as it goes
+            (q.v. “iterbatches(…)” supra.)
+        """
+        from clu.fs.filesystem import TemporaryName
+        iterator = iter(terms)
+        chunks = iter(lambda: tuple(islice(iterator, chunksize)), tuple())
+        
+        def finish(chunk, results):
+            infodict['searched'] += len(chunk)
+            infodict['results'].extend(results)
+            return results
+        
+        try:
+            infodict['status'] = Status.RUNNING
+            if processes == 0:
+                automaton = self.automaton()
+                for chunk in chunks:
+                    infodict['submitted'] += len(chunk)
+                    yield finish(chunk, tuple(term for term in chunk if automaton.search(term)))
+            else:
+                compiled = self.compiled
+                if compiled is None:
+                    compiled = self.root_node.compile()
+                with TemporaryName(suffix='trie') as tempfile:
+                    compiled.dump(tempfile.name)
+                    yield from self.iterpool(chunks, tempfile.name, processes, infodict, finish)
+        except BaseException:
+            infodict['status'] = Status.INCOMPLETE
+            raise
+        else:
+            infodict['status'] = Status.COMPLETE
+    
+    def iterpool(self, chunks, path, processes, infodict, finish):
+        """ Run the pooled part of a batch search (q.v. “iterbatches(…)” supra.) """
+        from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+        processes = processes or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=processes,
+                                 initializer=worker_initialize,
+                                 initargs=(path,)) as pool:
+            limit = 2 * processes
+            pending = {}
+            try:
+                while True:
+                    for chunk in islice(chunks, limit - len(pending)):
+                        infodict['submitted'] += len(chunk)
+                        pending[pool.submit(worker_search, chunk)] = chunk
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield finish(pending.pop(future), future.result())
+            finally:
+                for future in pending:
+                    future.cancel()
+    
+    def perform_batch_search(self, terms, processes=None, chunksize=256):
+        """ Search an iterable (or stream) of terms, across a pool of
+            worker processes, yielding the matching terms as they’re found
+            – q.v. “iterbatches(…)” supra. for the details.
+        """
+        batches = self.iterbatches(terms, processes=processes,
+                                          chunksize=chunksize)
+        
+        def search():
+            try:
+                for results in batches:
+                    yield from results
+            finally:
+                batches.close()
+        
+        return search()
+    
+    def perform_async_search(self, terms, processes=None, chunksize=256):
+        """ An asynchronous-generator version of “perform_batch_search(…)”,
+            which waits for each chunk of results in the event loop’s
+            default executor, rather than blocking the event loop.
+        """
+        import asyncio
+        batches = self.iterbatches(terms, processes=processes,
+                                          chunksize=chunksize)
         
+        async def search():
+            loop = asyncio.get_running_loop()
+            future = None
+            try:
+                while True:
+                    # Shield the executor future, so a cancellation doesn’t
+                    # orphan a “next(…)” call that is still running:
+                    future = loop.run_in_executor(None, next, batches, None)
+                    if (results := await asyncio.shield(future)) is None:
+                        break
+                    for term in results:
+                        yield term
+            finally:
+                # Closing the batches while “next(…)” is executing would raise
+                # “ValueError: generator already executing” – so wait for it:
+                if future is not None:
+                    await asyncio.wait((future,))
+                    if not future.cancelled():
+                        future.exception()
+                await loop.run_in_executor(None, batches.close)
+        
+        return search()
+    
+    def perform_match_search(self, string):
+        """ Search a string for all of the strings in the search space,
+            returning a dict mapping each string found to a tuple of the
+            positions at which it was found.
+        """
+        if not isstring(string := str(string)):
+            raise ValueError(f"argument couldn’t be stringged")
+        out = {}
+        for start, match in self.automaton().matches(string):
+            out.setdefault(match, []).append(start)
+        return { match : tuple(sorted(starts)) for match, starts in out.items() }
 
 # Assign the modules’ `__all__` and `__dir__` using the exporter:
 __all__, __dir__ = exporter.all_and_dir()
@@ -237,9 +840,156 @@ def test():
         assert len(bt.children) == 2
         assert len(bt.children['y'].children) == 1
     
-    # …
+    haystacks = {}
+    
+    @inline.fixture
+    def haystack():
+        """ Return a trie of 2048 log-message needles, plus the needles
+            themselves, and a haystack of 2048 log messages
+        """
+        if not haystacks:
+            import random
+            randomizer = random.Random(2048)
+            prefixes = ('GET /api/v1/users/', 'POST /api/v1/items/', 'ERROR worker-')
+            message = lambda: randomizer.choice(prefixes) + str(randomizer.randint(0, 99999))
+            needles = tuple(message() for _ in range(2048))
+            bt = BaseTrie()
+            for needle in needles:
+                bt.add(needle)
+            haystacks.update(trie=bt.build(),
+                             needles=needles,
+                             text='\n'.join(message() for _ in range(2048)))
+        return haystacks['trie'], haystacks['needles'], haystacks['text']
+    
+    def sliced_find(trie, string, pos):
+        """ The former “BaseTrie.find(…)” implementation, which slices """
+        for character in string[pos:]:
+            if trie.is_final:
+                return True
+            if character in trie.children:
+                trie = trie.children[character]
+            else:
+                return False
+        return trie.is_final
+    
+    def scan_matches(trie, string):
+        """ Find all matches by walking the trie from every position """
+        for pos in range(len(string)):
+            node = trie
+            for idx in range(pos, len(string)):
+                node = node.children.get(string[idx])
+                if node is None:
+                    break
+                if node.is_final:
+                    yield pos, string[pos:idx+1]
+    
+    @inline.precheck
+    def check_automaton_matches():
+        """ Check automaton matches against trie walks from every position """
+        bt, needles, text = haystack()
+        assert sorted(bt.matches(text)) == sorted(scan_matches(bt, text))
+        assert all(match in needles for _, match in bt.matches(text))
+        for pos in range(0, len(text), 128):
+            assert bt.find(text, pos) == sliced_find(bt, text, pos)
+        
+        searcher = TrieSearcher('yo', 'dogg', 'yo dogg')
+        assert searcher.perform_match_search('yo dogg, yo') == { 'yo'       : (0, 9),
+                                                                 'dogg'     : (3,),
+                                                                 'yo dogg'  : (0,) }
+        searcher.add_to_search_space('og')
+        assert searcher.perform_match_search('yo dogg')['og'] == (4,)
+    
+    @inline
+    def test_search_scanning():
+        """ Baseline: find all matches of 2048 needles, scanning per position """
+        bt, _, text = haystack()
+        assert any(sliced_find(bt, text, pos) for pos in range(len(text)))
+        assert len(tuple(scan_matches(bt, text))) > 0
+    
+    @inline
+    def test_search_automaton():
+        """ Aho–Corasick: find all matches of 2048 needles, in one pass """
+        bt, _, text = haystack()
+        assert bt.search(text)
+        assert len(tuple(bt.matches(text))) > 0
+    
+    @inline.precheck
+    def check_compiled_trie():
+        """ Check compiled trie searches, and pickling, against the trie """
+        import pickle
+        bt, needles, text = haystack()
+        compiled = bt.compile()
+        assert tuple(compiled.matches(text)) == tuple(bt.matches(text))
+        assert compiled.search(text) and not compiled.search('yo dogg')
+        for needle in needles[:64]:
+            assert compiled.whoami(compiled.node(needle)) == needle
+        for pos in range(-64, len(text), 97):
+            assert compiled.find(text, pos) == bt.find(text, pos)
+        unpickled = pickle.loads(pickle.dumps(compiled))
+        assert tuple(unpickled.matches(text)) == tuple(compiled.matches(text))
+    
+    @inline
+    def test_search_automaton_compiled():
+        """ Compiled: find all matches of 2048 needles, in one pass """
+        _, _, text = haystack()
+        if 'compiled' not in haystacks:
+            haystacks['compiled'] = haystacks['trie'].compile()
+        compiled = haystacks['compiled']
+        assert compiled.search(text)
+        assert len(tuple(compiled.matches(text))) > 0
+    
+    @inline.fixture
+    def logterms():
+        """ Return the haystack log messages, as separate search terms """
+        _, _, text = haystack()
+        return text.splitlines()
+    
+    @inline
+    def test_searcher_terms_serial():
+        """ Baseline: search 2048 terms one at a time """
+        _, needles, _ = haystack()
+        searcher = TrieSearcher(*needles)
+        results = [term for term in logterms() if searcher.perform_simple_search(term)]
+        assert len(results) > 0
     
-    return inline.test(100)
+    @inline
+    def test_searcher_terms_batch():
+        """ Batch: search 2048 terms in chunks, in-process """
+        _, needles, _ = haystack()
+        searcher = TrieSearcher(*needles)
+        results = tuple(searcher.perform_batch_search(logterms(), processes=0))
+        assert len(results) > 0
+        assert searcher.search_sets[-1]['status'] == Status.COMPLETE
+    
+    @inline
+    def test_searcher_terms_pooled():
+        """ Pooled: search 2048 terms in chunks, across a process pool """
+        _, needles, _ = haystack()
+        searcher = TrieSearcher(*needles)
+        results = tuple(searcher.perform_batch_search(logterms(), processes=2))
+        assert len(results) > 0
+        assert searcher.search_sets[-1]['searched'] == 2048
+    
+    @inline.diagnostic
+    def show_compiled_trie_memory():
+        """ Show the memory used by a trie of 25k strings, before and after compiling """
+        import random, tracemalloc
+        randomizer = random.Random(25000)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            bt = BaseTrie()
+            for _ in range(25000):
+                bt.add(f"{randomizer.randint(0, 10**12):x}")
+            nodebytes = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        compiled = bt.compile()
+        print(f"TRIE OF 25k STRINGS: {len(compiled)} nodes")
+        print(f"•   node trie: {nodebytes / 2**20:8.2f} MiB")
+        print(f"• compiled:    {compiled.nbytes() / 2**20:8.2f} MiB")
+    
+    return inline.test(10)
 
 if __name__ == '__main__':
     sys.exit(test())
\ No newline at end of file
@@ -12,6 +12,8 @@ import decimal
 import io
 import operator
 import os
+import sys
+import weakref
 
 from clu.constants.consts import λ, φ, SINGLETON_TYPES # type: ignore
 from clu.constants.polyfills import long, unicode, numpy
@@ -121,6 +123,65 @@ metaclasscheck = lambda putative, *thinglist: predicate_any(
 # LEGACY CODE SUPPORT:
 graceful_issubclass = subclasscheck
 
+# TYPE DECISION CACHES: the results of `subclasscheck(…)` for the unary
+# predicates sub. depend only on the type of their operand (or the operand
+# itself, for class types) – so they are cached per type, keyed by type ID,
+# and purged when the type in question is garbage-collected. All of the
+# caches are cleared whenever an ABC registers a virtual subclass, as
+# reported by `abc.get_cache_token()`:
+
+decision_caches = []
+decision_typerefs = {}
+decision_token = [abc.get_cache_token()]
+
+def forget_decisions(typeid):
+    """ Purge the cached decisions for a type, by ID """
+    decision_typerefs.pop(typeid, None)
+    for cache in decision_caches:
+        cache.pop(typeid, None)
+
+@export
+def clear_decisions():
+    """ clear_decisions() → Clear all cached `subclasschecker(…)` decisions """
+    decision_typerefs.clear()
+    for cache in decision_caches:
+        cache.clear()
+    decision_token[0] = abc.get_cache_token()
+
+@export
+def subclasschecker(*thinglist):
+    """ subclasschecker(*cls_or_tuple) → Return a unary predicate, equivalent to
+        `subclasscheck(thing, *cls_or_tuple)`, that caches its decisions per type.
+        
+        Once a type has been seen, each call costs one dictionary lookup.
+        Operands whose “__class__” differs from their type (e.g. proxies)
+        bypass the cache, as `isinstance(…)` may answer differently for them.
+    """
+    classes = {}
+    instances = {}
+    decision_caches.extend((classes, instances))
+    
+    def predicate(thing):
+        if decision_token[0] != abc.get_cache_token():
+            clear_decisions()
+        if isinstance(thing, type):
+            cache, cls = classes, thing
+        else:
+            cache, cls = instances, type(thing)
+            if getattr(thing, '__class__', cls) is not cls:
+                return subclasscheck(thing, *thinglist)
+        typeid = id(cls)
+        try:
+            return cache[typeid]
+        except KeyError:
+            pass
+        out = cache[typeid] = subclasscheck(thing, *thinglist)
+        if typeid not in decision_typerefs:
+            decision_typerefs[typeid] = weakref.ref(cls, lambda ref: forget_decisions(typeid))
+        return out
+    
+    return predicate
+
 # TYPELISTS: manual assemblages of types, used for predicate testing
 # and other similar stuff.
 
@@ -200,7 +261,7 @@ hasaliases = lambda thing: isenum(thing) and haspyattr(thing, 'aliases')
 
 # MappingView → KeysView, ValuesView, ItemsView types –
 # These predicates work for the extension types returned by e.g. {}.keys():
-isview       = lambda thing: subclasscheck(thing, collections.abc.MappingView)
+isview       = subclasschecker(collections.abc.MappingView)
 iskeysview   = lambda thing: isinstance(thing,    collections.abc.KeysView)
 isvaluesview = lambda thing: isinstance(thing,    collections.abc.ValuesView)
 isitemsview  = lambda thing: isinstance(thing,    collections.abc.ItemsView)
@@ -210,23 +271,23 @@ isslottedtype = lambda thing: metaclasscheck(thing, Slotted)
 isextensibletype = lambda thing: metaclasscheck(thing, Extensible)
 
 # Typelist predicates:
-isnumber = lambda thing: subclasscheck(thing, numeric_types)
-isnumeric = lambda thing: subclasscheck(thing, numeric_types)
-iscomplex = lambda thing: subclasscheck(thing, complex)
-ismapping = lambda thing: subclasscheck(thing, mapping_classes)
-isarray = lambda thing: subclasscheck(thing, array_types)
-isscalar = lambda thing: subclasscheck(thing, scalar_types)
-isset = lambda thing: subclasscheck(thing, set_types)
-isstring = lambda thing: subclasscheck(thing, string_types)
-isbytes = lambda thing: subclasscheck(thing, bytes_types)
-ismodule = lambda thing: subclasscheck(thing, types.Module)
+isnumber = subclasschecker(numeric_types)
+isnumeric = subclasschecker(numeric_types)
+iscomplex = subclasschecker(complex)
+ismapping = subclasschecker(mapping_classes)
+isarray = subclasschecker(array_types)
+isscalar = subclasschecker(scalar_types)
+isset = subclasschecker(set_types)
+isstring = subclasschecker(string_types)
+isbytes = subclasschecker(bytes_types)
+ismodule = subclasschecker(types.Module)
 isfunction = ΛΛ = lambda thing: isinstance(thing, Λ) and nopyattr(thing, 'mro')
 islambda = λλ = lambda thing: pyattr(thing, 'lambda_name', 'name', 'qualname') in (λ, φ)
 iscallable = lambda thing: haspyattr(thing, 'call') and nopyattr(thing, 'code')
 iscallabletype = lambda thing: isinstance(thing, callable_types) and nopyattr(thing, 'mro')
-issequence = lambda thing: subclasscheck(thing, collections.abc.Sequence)
-ishashable = lambda thing: subclasscheck(thing, collections.abc.Hashable)
-issingleton = lambda thing: subclasscheck(thing, SINGLETON_TYPES)
+issequence = subclasschecker(collections.abc.Sequence)
+ishashable = subclasschecker(collections.abc.Hashable)
+issingleton = subclasschecker(SINGLETON_TYPES)
 
 # Helper predicates for composing sequence-based predicates:
 isxlist = lambda predicate, thinglist: issequence(thinglist) and predicate_all(predicate, thinglist)
@@ -382,3 +443,55 @@ export(issingletonlist, name='issingletonlist', doc="issingletonlist(thinglist)
 
 # Assign the modules’ `__all__` and `__dir__` using the exporter:
 __all__, __dir__ = exporter.all_and_dir()
+
+def test():
+    
+    from clu.testing.utils import inline
+    from clu.config.keymap import Flat, Nested
+    
+    predicates = (isnumber, iscomplex, ismapping, isarray, isscalar, isset,
+                  isstring, isbytes, ismodule, issequence, ishashable,
+                  issingleton, isview)
+    
+    typelists = (numeric_types, complex, mapping_classes, array_types,
+                 scalar_types, set_types, string_types, bytes_types,
+                 types.Module, collections.abc.Sequence,
+                 collections.abc.Hashable, SINGLETON_TYPES,
+                 collections.abc.MappingView)
+    
+    # The uncached predicates, as they were once defined:
+    baselines = tuple((lambda typelist: lambda thing: subclasscheck(thing, typelist))(typelist) \
+                                                      for typelist in typelists)
+    
+    # A mixed bag of operands, repeated, as per a typical tree walk:
+    operands = (1, 1.0, 1j, decimal.Decimal(1), "yo", b"dogg", bytearray(b"i heard"),
+                None, True, Ellipsis, {}, { 'wat' : 'hax' }.keys(), set(), frozenset(),
+                [], tuple(), collections.OrderedDict(), Flat(), Nested(), os,
+                dict, str, int, list, Flat, Nested) * 16
+    
+    @inline.precheck
+    def check_cached_predicates():
+        """ Check cached predicates against uncached baselines """
+        for predicate, baseline in zip(predicates, baselines):
+            for operand in operands:
+                assert predicate(operand) == baseline(operand)
+    
+    @inline
+    def test_predicates_uncached():
+        """ Baseline: uncached “subclasscheck(…)” predicates """
+        for baseline in baselines:
+            for operand in operands:
+                baseline(operand)
+    
+    @inline
+    def test_predicates_cached():
+        """ Per-type cached “subclasschecker(…)” predicates """
+        for predicate in predicates:
+            for operand in operands:
+                predicate(operand)
+    
+    # Run all inline tests:
+    return inline.test(100)
+
+if __name__ == '__main__':
+    sys.exit(test())
@@ -20,3 +20,24 @@ class TestAll(object):
             assert inspect.isfunction(test_fn)
             code_nm = attrs(test_fn, *code_attrs)
             assert any('inline' in name for name in code_nm)
+    
+    def test_export_manifest(self, temporaryname):
+        from clu.all import write_manifest, load_manifest
+        from clu.exporting import Exporter
+        
+        path = temporaryname(suffix='json')
+        manifest = write_manifest(path.name)
+        assert path.exists
+        assert load_manifest(path.name) == manifest
+        assert manifest['nameof'] == 'clu.naming'
+        assert manifest['Nested'] == 'clu.config.keymap'
+        
+        # Names shadowing top-level modules are omitted:
+        for name in ('exporting', 'typology', 'dicts', 'config'):
+            assert name not in manifest
+        
+        # Every name resolves to the thing exported by its module:
+        for name, dotpath in manifest.items():
+            assert name in Exporter[dotpath]
+        
+        assert load_manifest('/yo/dogg/nonexistant.json') == {}
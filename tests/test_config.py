@@ -89,6 +89,362 @@ class TestConfigKeyMaps(object):
         assert flat == nested
         assert renestified == nested
     
+    def test_indexed_NamespaceWalker(self):
+        from clu.config.abc import NamespaceWalker, KeyMap
+        from clu.config.keymap import flatwalk
+        
+        class Walker(NamespaceWalker, KeyMap, indexed=True):
+            
+            __slots__ = ('dictionary', 'walks')
+            
+            def __init__(self, dictionary):
+                self.dictionary = dict(dictionary)
+                self.walks = 0
+            
+            def walk(self):
+                self.walks += 1
+                yield from flatwalk(self.dictionary)
+            
+            def freeze(self):
+                return self
+            
+            def __setitem__(self, nskey, value):
+                self.dictionary[nskey] = value
+            
+            def __delitem__(self, nskey):
+                del self.dictionary[nskey]
+        
+        walker = Walker({ 'yo'          : "dogg",
+                          'i:heard'     : "you like",
+                          'i:heard:you' : "like indexes" })
+        
+        assert Walker.indexed
+        assert not NamespaceWalker.indexed
+        
+        # Lookups, containment and length are all served from
+        # an index that is built with a single walk:
+        assert len(walker) == 3
+        assert walker['yo'] == "dogg"
+        assert walker['i:heard'] == "you like"
+        assert walker['::i:heard::you'] == "like indexes"
+        assert 'i:heard:you' in walker
+        assert 'i:heard:me' not in walker
+        assert tuple(walker) == ('yo', 'i:heard', 'i:heard:you')
+        assert walker.walks == 1
+        
+        with pytest.raises(KeyError):
+            walker['i:heard:me']
+        
+        # Mutation invalidates the index:
+        walker['i:heard:me'] = "like indexes too"
+        assert walker.nsindex is None
+        assert len(walker) == 4
+        assert walker['i:heard:me'] == "like indexes too"
+        assert walker.walks == 2
+        
+        del walker['yo']
+        assert 'yo' not in walker
+        assert len(walker) == 3
+        assert walker.walks == 3
+        
+        walker.update({ 'wat' : "hax" })
+        assert walker.get('wat') == "hax"
+        
+        walker.clear()
+        assert len(walker) == 0
+    
+    def test_namespace_trie_views(self):
+        from clu.config.keymap import Flat, Nested
+        from clu.config.nstrie import NamespaceTrie
+        
+        flat = Flat({ 'yo'              : "dogg",
+                      'i:heard'         : "you like",
+                      'i:heard:you'     : "like tries",
+                      'i:wat'           : "hax",
+                      'wat:hax'         : "nope" })
+        
+        nested = Nested({ 'yo'  : "dogg",
+                          'i'   : { 'heard' : { 'you' : "like tries",
+                                                'me'  : "too" },
+                                    'wat'   : "hax" },
+                          'wat' : { 'hax'   : "nope" } })
+        
+        for keymap in (flat, nested):
+            trie = keymap.namespace_trie()
+            assert type(trie) is NamespaceTrie
+            assert keymap.namespace_trie() is trie
+            assert len(trie) == len(keymap)
+            assert tuple(trie) == tuple(keymap)
+            assert tuple(trie.unprefixed()) == ('yo',)
+            assert 'i:heard:you' in trie
+            assert 'i:heard:you' in tuple(trie.keys('i'))
+            assert 'i:heard:you' in tuple(trie.keys('i:heard'))
+            assert 'i:heard:you' in tuple(trie.keys('i', 'i:heard', 'wat'))
+            assert tuple(trie.keys('wat', 'wat')) == ('wat:hax',)
+            assert not tuple(trie.keys('no:dogg'))
+        
+        assert tuple(flat.namespace_trie().keys('i')) == ('i:heard', 'i:heard:you', 'i:wat')
+        assert tuple(nested.namespace_trie().keys('i')) == ('i:heard:you', 'i:heard:me', 'i:wat')
+        assert tuple(flat.namespace_trie().keys('i:heard')) == ('i:heard:you',)
+        assert tuple(flat.namespace_trie().keys('i:heard', inclusive=True)) == ('i:heard', 'i:heard:you')
+        
+        # Flat views (and submaps) include keys equal to the namespace;
+        # NamespaceWalker views do not:
+        assert tuple(flat.keys('i:heard')) == ('i:heard', 'i:heard:you')
+        assert tuple(nested.keys('i:heard')) == ('i:heard:you', 'i:heard:me')
+        assert tuple(flat.values('i')) == ("you like", "like tries", "hax")
+        assert dict(nested.items('wat')) == { 'wat:hax' : "nope" }
+        assert len(flat.keys('i')) == 3
+        assert 'i:wat' in flat.keys('i')
+        assert 'wat:hax' not in flat.keys('i')
+        assert ('i:wat', "hax") in nested.items('i')
+        assert ('i:wat', "nope") not in nested.items('i')
+        assert "too" in nested.values('i:heard')
+        assert flat.keys('i')['i:wat'] == "hax"
+        assert flat.submap('i') == { 'i:heard'      : "you like",
+                                     'i:heard:you'  : "like tries",
+                                     'i:wat'        : "hax" }
+        
+        # Mutations are reflected in the tries, and thus in any views:
+        flatview = flat.keys('wat')
+        nestedview = nested.keys('wat')
+        flat['wat:dogg'] = "yo"
+        del flat['wat:hax']
+        nested['wat:dogg'] = "yo"
+        del nested['wat:hax']
+        assert tuple(flatview) == ('wat:dogg',)
+        assert tuple(nestedview) == ('wat:dogg',)
+        assert 'wat:hax' not in flat.namespace_trie()
+        assert 'wat:hax' not in nested.namespace_trie()
+    
+    def test_keymap_view_positional_indexing(self):
+        from clu.config.keymap import Flat, Nested
+        
+        flat = Flat({ 'yo'          : "dogg",
+                      'i:heard'     : "you like",
+                      'i:wat'       : "hax",
+                      'wat:hax'     : "nope" })
+        nested = flat.nestify(cls=Nested)
+        
+        for keymap in (flat, nested):
+            keys = keymap.keys()
+            assert keys[0] == 'yo'
+            assert keys[-1] == 'wat:hax'
+            assert keys[1:3] == ('i:heard', 'i:wat')
+            assert keymap.items()[1] == ('i:heard', "you like")
+            assert keymap.values()[-1] == "nope"
+            assert keymap.values('i')[::-1] == ("hax", "you like")
+            assert tuple(reversed(keys)) == tuple(reversed(tuple(keymap)))
+            assert tuple(reversed(keymap.items('i'))) == (('i:wat',   "hax"),
+                                                          ('i:heard', "you like"))
+            assert keys.index('i:wat') == 2
+            
+            # The ordered key sequence is cached…
+            cached = keys._keyseq()
+            assert keys._keyseq() is cached
+            
+            # … until the mapping’s keys change:
+            keymap['i:dogg'] = "yo"
+            assert keys._keyseq() is not cached
+            assert keymap.keys('i')[-1] == 'i:dogg'
+            assert keys[-1] in ('i:dogg', 'wat:hax')
+            del keymap['i:dogg']
+            assert keys[-1] == 'wat:hax'
+            assert keymap.keys('i')[-1] == 'i:wat'
+            
+            with pytest.raises(IndexError):
+                keymap.keys('wat')[1]
+    
+    def test_keymap_view_positional_indexing_unindexed(self):
+        from clu.config.env import Environ
+        
+        builds = []
+        
+        class ScanningEnviron(Environ, indexed=False):
+            def namespace_trie(self):
+                builds.append(self)
+                return super().namespace_trie()
+        
+        env = ScanningEnviron(environment={ 'YODOGG_YO'         : "dogg",
+                                            'YODOGG_I_HEARD'    : "you like",
+                                            'YODOGG_I_WAT'      : "hax" },
+                              appname='yodogg')
+        keys = env.keys()
+        ikeys = env.keys('i')
+        assert keys[0] == 'yo'
+        assert ikeys[-1] == 'i:wat'
+        assert len(builds) == 2
+        
+        # No trie is kept, so none is built to cache the unnamespaced keys:
+        assert keys.keycache is False
+        assert keys[1:] == ('i:heard', 'i:wat')
+        assert len(builds) == 2
+        
+        # … and the keys are gathered afresh:
+        env['i:dogg'] = "yo"
+        assert keys[-1] == 'i:dogg'
+        assert ikeys[-1] == 'i:dogg'
+        del env['i:heard']
+        assert ikeys[:] == ('i:wat', 'i:dogg')
+    
+    def test_copy_on_write_sharing(self):
+        from clu.config.keymap import Flat, Nested
+        
+        nested = Nested({ 'yo'  : "dogg",
+                          'i'   : { 'heard' : { 'you' : "like sharing" },
+                                    'wat'   : "hax" },
+                          'wat' : { 'hax'   : "nope" } })
+        flat = nested.flatten(cls=Flat)
+        
+        # Freezing and thawing shares the underlying data:
+        frozen = nested.freeze()
+        thawed = frozen.thaw()
+        assert frozen.tree is nested.tree
+        assert thawed.tree is nested.tree
+        assert flat.freeze().dictionary is flat.dictionary
+        assert flat.clone().dictionary is flat.dictionary
+        
+        # Writes copy only the shared dicts along their path:
+        thawed['i:heard:you'] = "like copying"
+        assert thawed.tree is not frozen.tree
+        assert thawed.tree['i'] is not frozen.tree['i']
+        assert thawed.tree['wat'] is frozen.tree['wat']
+        assert frozen['i:heard:you'] == "like sharing"
+        assert nested['i:heard:you'] == "like sharing"
+        assert thawed['i:heard:you'] == "like copying"
+        
+        # … and subsequent writes to the same path copy nothing:
+        tree, inner = thawed.tree, thawed.tree['i']
+        thawed['i:wat'] = "nohax"
+        thawed['i:heard:me'] = "too"
+        assert thawed.tree is tree
+        assert thawed.tree['i'] is inner
+        assert 'i:heard:me' in thawed
+        assert 'i:heard:me' not in frozen
+        
+        # The mutable source copies-on-write after freezing, too:
+        del nested['wat:hax']
+        assert frozen['wat:hax'] == "nope"
+        assert 'wat:hax' not in nested
+        assert len(frozen) == 4
+        
+        # Flat instances copy their whole dictionary, once:
+        frozenflat = flat.freeze()
+        flat['yo'] = "dawg"
+        flat['i:heard:me'] = "too"
+        assert frozenflat['yo'] == "dogg"
+        assert 'i:heard:me' not in frozenflat
+        assert flat.dictionary is not frozenflat.dictionary
+        assert tuple(flat.keys('i:heard')) == ('i:heard:you', 'i:heard:me')
+        assert tuple(frozenflat.keys('i:heard')) == ('i:heard:you',)
+        
+        # Deep clones share nothing:
+        deep = frozen.clone(deep=True)
+        assert deep == frozen
+        assert deep.tree['i'] is not frozen.tree['i']
+    
+    @pytest.mark.parametrize('seed', range(8))
+    def test_nested_keyset_random_mutations(self, seed):
+        from clu.config.keymap import Nested
+        from clu.config.ns import pack_ns
+        import random
+        
+        rng = random.Random(seed)
+        fragments = ('yo', 'dogg', 'i', 'heard')
+        
+        def random_nskey():
+            nskey = pack_ns(*rng.choices(fragments, k=rng.randint(1, 3)))
+            if rng.random() < 0.1:
+                nskey = f"::{nskey}::"
+            return nskey
+        
+        def random_value():
+            if rng.random() < 0.15:
+                return { rng.choice(fragments) : { rng.choice(fragments) : "deep" },
+                                          'wat' : "hax" }
+            return rng.randint(0, 100)
+        
+        nested = Nested({ 'yo' : { 'dogg' : 0 }, 'i' : 1 })
+        frozen = []
+        
+        for step in range(200):
+            operation = rng.random()
+            try:
+                if operation < 0.5:
+                    nested[random_nskey()] = random_value()
+                elif operation < 0.75:
+                    if nested.nskeys:
+                        del nested[rng.choice(sorted(nested.nskeys))]
+                elif operation < 0.85:
+                    nested.update({ random_nskey() : random_value() \
+                                                  for _ in range(3) })
+                elif operation < 0.95:
+                    frozen.append((nested.freeze(), dict(nested.items())))
+                    nested = frozen[-1][0].thaw()
+                else:
+                    nested.clear()
+            except TypeError:
+                # Writing through an existing leaf – nothing changes:
+                pass
+            
+            # The incrementally-maintained keyset matches a full walk:
+            assert nested.nskeys == set(nested.nskeyset())
+            for nskey in nested.nskeyset():
+                assert nskey in nested
+            assert len(nested) == len(nested.nskeys)
+        
+        # Earlier frozen snapshots were never written to:
+        for snapshot, items in frozen:
+            assert dict(snapshot.items()) == items
+            assert snapshot.nskeys == frozenset(snapshot.nskeyset())
+    
+    def test_memoized_namespace_parsing(self):
+        from clu.config.keymap import Flat, Nested
+        from clu.config import ns
+        
+        nskeys = tuple(f"ns{idx}:sub{idx % 4}:key{jdx}" \
+                       for idx in range(16) \
+                       for jdx in range(16))
+        messy = tuple(f" :{nskey}::" for nskey in nskeys)
+        flat = Flat({ nskey : idx for idx, nskey in enumerate(nskeys) })
+        nested = flat.nestify(cls=Nested)
+        
+        def clean_regexes(nskey):
+            out = nskey.strip(ns.NAMESPACE_SEP)
+            out = ns.spacenixer(out)
+            return ns.sepreducer(out)
+        
+        def unpack_regexes(nskey):
+            *namespaces, key = clean_regexes(nskey).split(ns.NAMESPACE_SEP)
+            return key, namespaces
+        
+        def lookup_regexes(nskey):
+            key, fragments = unpack_regexes(nskey)
+            d = nested.tree
+            for fragment in fragments:
+                d = d[fragment]
+            return d[key]
+        
+        # Results must match, canonical keys or otherwise:
+        for nskey in nskeys + messy:
+            assert ns.clean_ns(nskey) == clean_regexes(nskey)
+            assert ns.unpack_ns(nskey) == unpack_regexes(nskey)
+            assert ns.parse_ns(nskey) == (unpack_regexes(nskey)[0],
+                                    tuple(unpack_regexes(nskey)[1]))
+            # … twice over, the second time from the caches:
+            assert ns.parse_ns(nskey) == (unpack_regexes(nskey)[0],
+                                    tuple(unpack_regexes(nskey)[1]))
+        
+        for nskey in nskeys:
+            assert nested[nskey] == flat[nskey] == lookup_regexes(nskey)
+            assert ns.canonical_ns(nskey)
+            assert ns.clean_ns(nskey) is nskey
+        
+        for nskey in messy:
+            assert not ns.canonical_ns(nskey)
+        
+        assert ns.parse_ns.cache_info().hits > 0
+    
     def test_env_get_KeyMaps(self, environment, consts):
         from clu.config.env import Environ
         
@@ -145,6 +501,65 @@ class TestConfigKeyMaps(object):
         
         assert 'envtest0' not in env.namespaces()
     
+    def test_env_index_change_detection(self, environment, consts):
+        from clu.config.env import Environ, FrozenEnviron
+        
+        env = Environ(environment=environment,
+                          appname=consts.PROJECT_NAME)
+        
+        try:
+            environment['CLU_ENVTEST1_YODOGG'] = "Yo Dogg"
+            assert 'envtest1:yodogg' in tuple(env)
+            index = env.nsindex
+            
+            # Unchanged environment, same index:
+            assert len(env) == len(index)
+            assert env.nsindex is index
+            
+            # Changed out from under the instance, rebuilt index:
+            environment['CLU_ENVTEST1_IHEARD'] = "I Heard"
+            assert 'envtest1:iheard' in tuple(env)
+            assert env.nsindex is not index
+            assert tuple(env.keys('envtest1')) == ('envtest1:yodogg',
+                                                   'envtest1:iheard')
+            
+            # Changed values are read afresh, without a rebuild:
+            index = env.nsindex
+            environment['CLU_ENVTEST1_YODOGG'] = "Yo Dawg"
+            assert dict(env.items())['envtest1:yodogg'] == "Yo Dawg"
+            assert dict(env.flatten().items())['envtest1:yodogg'] == "Yo Dawg"
+            assert env.nsindex is index
+            
+            # Renamed variables are caught, despite the unchanged length:
+            environment['CLU_ENVTEST1_RENAMED'] = environment.pop('CLU_ENVTEST1_IHEARD')
+            assert 'envtest1:renamed' in tuple(env)
+            assert 'envtest1:iheard' not in tuple(env)
+            assert len(env) == len(tuple(env))
+            environment['CLU_ENVTEST1_IHEARD'] = environment.pop('CLU_ENVTEST1_RENAMED')
+            
+            # Frozen copies are unaffected by later changes:
+            frozen = env.freeze()
+            assert dict(frozen.items())['envtest1:yodogg'] == "Yo Dawg"
+            env['envtest1:youlike'] = "Indexes"
+            assert 'envtest1:youlike' in tuple(env)
+            assert 'envtest1:youlike' not in tuple(frozen)
+            
+            # … as are those made from a caller-supplied mapping:
+            mapping = { 'CLU_ENVTEST1_YODOGG' : "Yo Dogg" }
+            frozen = FrozenEnviron(environment=mapping,
+                                       appname=consts.PROJECT_NAME)
+            assert tuple(frozen) == ('envtest1:yodogg',)
+            mapping['CLU_ENVTEST1_IHEARD'] = "I Heard"
+            assert tuple(frozen) == ('envtest1:yodogg',)
+        
+        finally:
+            for envkey in ('CLU_ENVTEST1_YODOGG',
+                           'CLU_ENVTEST1_IHEARD',
+                           'CLU_ENVTEST1_YOULIKE'):
+                environment.pop(envkey, None)
+        
+        assert 'envtest1' not in env.namespaces()
+    
     def test_toml_and_file_direct(self, dirname):
         from clu.config.formats import TomlFile
         from clu.predicates import tuplize
@@ -195,6 +610,94 @@ class TestConfigKeyMaps(object):
         print()
         print(repr(flat))
     
+    def test_toml_and_file_lazy(self, dirname):
+        from clu.config.formats import TomlFile
+        
+        cfgs = dirname.subdirectory('data').subdirectory('config')
+        toml_path = cfgs[TomlFile.filename]
+        
+        # Instantiate a TomlFile lazily – the file is found but not read:
+        toml_file = TomlFile(toml_path, lazy=True)
+        assert toml_file.pending == toml_file.filepath
+        
+        # The first read loads and parses the file:
+        assert toml_file['userinfo:user'] == 'fish'
+        assert toml_file.pending is None
+        
+        # … after which the lazy instance is indistinguishable:
+        eager_file = TomlFile(toml_path)
+        assert eager_file.pending is None
+        assert toml_file.tree == eager_file.tree
+        assert toml_file.keys() == eager_file.keys()
+        assert set(toml_file.namespaces()) == { 'userinfo', 'debugging' }
+        
+        # Lazy instances load when written to, too:
+        toml_file = TomlFile(toml_path, lazy=True)
+        toml_file['debugging:debug'] = False
+        assert toml_file.pending is None
+        assert toml_file['debugging:debug'] == False
+        assert toml_file['project'] == 'clu'
+        assert 'debugging:debug' in toml_file
+    
+    def test_toml_and_file_cached(self, datadir, temporarydir, environment):
+        from clu.config.filebase import FileCache
+        from clu.config.formats import TomlFile
+        from clu.predicates import tuplize
+        
+        class CountingTomlFile(TomlFile, filename=TomlFile.filename):
+            loads_count = 0
+            def loads(self, loaded):
+                type(self).loads_count += 1
+                return super().loads(loaded)
+        
+        cfgs = datadir.subdirectory('config')
+        cache = FileCache(temporarydir.subpath('cache'))
+        toml_path = cfgs[TomlFile.filename]
+        
+        # The first instance searches, parses and fills the cache:
+        first = CountingTomlFile(extra_user_dirs=tuplize(cfgs), cached=cache)
+        assert first.filepath == toml_path
+        assert CountingTomlFile.loads_count == 1
+        assert len(os.listdir(cache.directory)) == 1
+        
+        # The second instance is restored from the cache:
+        second = CountingTomlFile(extra_user_dirs=tuplize(cfgs), cached=cache)
+        assert CountingTomlFile.loads_count == 1
+        assert second.filepath == first.filepath
+        assert second.tree == first.tree
+        assert second['userinfo:user'] == 'fish'
+        assert set(second.namespaces()) == { 'userinfo', 'debugging' }
+        
+        # Touching the file, without changing it, keeps the entry valid:
+        stat = os.stat(toml_path)
+        os.utime(toml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        third = CountingTomlFile(extra_user_dirs=tuplize(cfgs), cached=cache)
+        assert CountingTomlFile.loads_count == 1
+        assert third.tree == first.tree
+        
+        # Changing the file invalidates the entry:
+        first['userinfo:user'] = 'dogg'
+        first.dump()
+        fourth = CountingTomlFile(extra_user_dirs=tuplize(cfgs), cached=cache)
+        assert CountingTomlFile.loads_count == 2
+        assert fourth['userinfo:user'] == 'dogg'
+        
+        # Different search arguments use a different entry:
+        CountingTomlFile(toml_path, cached=cache)
+        assert CountingTomlFile.loads_count == 3
+        assert len(os.listdir(cache.directory)) == 2
+        
+        # Unreadable entries are misses, not errors:
+        for entry in os.listdir(cache.directory):
+            with open(os.path.join(cache.directory, entry), "wb") as handle:
+                handle.write(b"nodogg")
+        fifth = CountingTomlFile(toml_path, cached=cache)
+        assert CountingTomlFile.loads_count == 4
+        assert fifth['userinfo:user'] == 'dogg'
+        
+        cache.clear()
+        assert not os.listdir(cache.directory)
+    
     def test_toml_and_file_search(self, dirname, environment):
         # N.B. we use the “environment” fixture here to winnow out
         # any XDG variable definitions, some of which are inspected by
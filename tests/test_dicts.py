@@ -265,4 +265,284 @@ class TestDicts(object):
         for idx in range(len(keys)):
             assert keys[idx] == list(keys)[idx]
             assert keys[idx] in fsdata
-    
\ No newline at end of file
+    
+    def test_ordered_view_indexing(self, arbitrary):
+        from clu.dicts import OrderedItemsView, OrderedKeysView, OrderedValuesView
+        from clu.dicts import keyat, keyslice
+        
+        arbitrary = dict(arbitrary)
+        keys = OrderedKeysView(arbitrary)
+        values = OrderedValuesView(arbitrary)
+        items = OrderedItemsView(arbitrary)
+        
+        # Indexing and slicing match those of tuples:
+        for view in (keys, values, items):
+            elements = tuple(view)
+            for idx in range(-len(view), len(view)):
+                assert view[idx] == elements[idx]
+            for slicer in (slice(1, 3), slice(None, 2), slice(1, None, 2),
+                           slice(-2, None), slice(None, None, -1)):
+                assert view[slicer] == elements[slicer]
+            with pytest.raises(IndexError):
+                view[len(view)]
+            with pytest.raises(IndexError):
+                view[-len(view) - 1]
+        
+        # Indexes are live:
+        arbitrary['yo'] = "nodogg"
+        arbitrary['wat'] = "wat"
+        assert values[0] == "nodogg"
+        assert items[-1] == ('wat', "wat")
+        assert keyat(arbitrary, -1) == 'wat'
+        assert keyslice(arbitrary, slice(0, 2)) == ('yo', 'i')
+    
+    def test_ordered_view_snapshot(self, temporarydir):
+        from clu.dicts import OrderedKeysView, keyat
+        from clu.fs.filesystem import write_to_path
+        import os
+        
+        for filename in ('yo.txt', 'dogg.txt', 'iheard.txt'):
+            write_to_path(filename, temporarydir.subpath(filename))
+        
+        # Views of a Directory index its snapshot:
+        snapshot = temporarydir.snapshot()
+        assert temporarydir.snapshot() is snapshot
+        assert frozenset(snapshot) == { 'yo.txt', 'dogg.txt', 'iheard.txt' }
+        keys = temporarydir.keys()
+        assert type(keys) is OrderedKeysView
+        assert keys[:] == snapshot == tuple(keys)
+        assert keyat(temporarydir, -1) == snapshot[-1]
+        
+        # Explicit invalidation rescans the directory:
+        os.unlink(temporarydir.subpath('yo.txt'))
+        temporarydir.invalidate()
+        assert frozenset(keys[:]) == { 'dogg.txt', 'iheard.txt' }
+        assert len(keys) == 2
+        
+    def test_merge_layers(self, arbitrary):
+        from clu.dicts import merge_layers, merge_as, merge_fast
+        from clu.typespace.namespace import Namespace
+        
+        # Precedence, keyword overrides, and classes:
+        one = { 'yo' : "dogg", 'i' : "heard" }
+        two = { 'yo' : "nodogg", 'you' : "liked" }
+        
+        merged = merge_layers(one, two, arbitrary)
+        assert merged == merge_as(one, two, arbitrary)
+        assert merged['yo'] == "dogg"
+        assert merged['you'] == "liked"
+        assert merged['dict'] == "chains"
+        
+        assert merge_layers(one, two, yo="wat")['yo'] == "wat"
+        assert merge_layers() == {}
+        assert type(merge_layers(one, two, cls=Namespace)) is Namespace
+        
+        # Falsey values in higher-precedence layers still win:
+        assert merge_layers({ 'yo' : 0 }, { 'yo' : 1 })['yo'] == 0
+        
+        # Arbitrary numbers of inputs:
+        layers = [{ f"key{jdx}" : idx for jdx in range(idx % 8, 32, 2) } \
+                                      for idx in range(128)]
+        merged = merge_layers(*layers)
+        assert len(merged) == 32
+        assert all(merged[key] == int(key[3:]) % 2 for key in merged)
+        
+        # Past ten dicts, “merge_fast(…)” keeps its historical precedence –
+        # later dicts win, and keyword extras lose to every dict:
+        assert merge_fast(*layers) == merge_layers(*reversed(layers))
+        assert merge_fast(*[{ 'a' : idx } for idx in range(12)]) == { 'a' : 11 }
+        assert merge_fast(*[{ 'a' : idx } for idx in range(12)], a=-1) == { 'a' : 11 }
+        assert merge_fast(*[{ 'a' : idx } for idx in range(12)], b=-1)['b'] == -1
+        assert merge_fast({ 'a' : 0 }, { 'a' : 1 }, a=-1) == { 'a' : 0 }
+    
+    def test_merge_layers_deep(self):
+        from clu.dicts import merge_layers
+        
+        one = { 'yo' : { 'dogg' : 1, 'nested' : { 'i' : "heard" } }, 'wat' : 1 }
+        two = { 'yo' : "not a mapping" }
+        three = { 'yo' : { 'dogg' : 3, 'you' : 3, 'nested' : { 'like' : "dicts" } } }
+        
+        # Shallow merges take the highest-precedence value wholesale:
+        assert merge_layers(one, two, three)['yo'] is one['yo']
+        
+        # Deep merges recurse into nested mappings:
+        merged = merge_layers(one, two, three, deep=True)
+        assert merged == { 'yo'  : { 'dogg'   : 1,
+                                     'you'    : 3,
+                                     'nested' : { 'i' : "heard", 'like' : "dicts" } },
+                           'wat' : 1 }
+        
+        # None of the arguments were modified:
+        assert one == { 'yo' : { 'dogg' : 1, 'nested' : { 'i' : "heard" } }, 'wat' : 1 }
+        assert three['yo'] == { 'dogg' : 3, 'you' : 3, 'nested' : { 'like' : "dicts" } }
+        
+        # Overrides take part in deep merges too:
+        merged = merge_layers(one, three, deep=True, yo={ 'dogg' : 0 })
+        assert merged['yo']['dogg'] == 0
+        assert merged['yo']['you'] == 3
+    
+    def test_chainmap_deduplication(self, arbitrary):
+        from clu.dicts import ChainMap
+        
+        overlay = { 'yo' : "nodogg", 'wat' : "hax" }
+        chain = ChainMap(overlay, arbitrary)
+        
+        # Keys shared between maps are counted and iterated once:
+        assert len(chain) == len(arbitrary) + 1
+        assert len(tuple(chain)) == len(chain)
+        assert frozenset(chain) == frozenset(arbitrary) | { 'wat' }
+        assert chain['yo'] == "nodogg"
+        assert chain.flatten() == { **arbitrary, **overlay }
+    
+    def test_chainmap_layerindex(self, arbitrary):
+        from clu.dicts import ChainMap
+        
+        class IndexedChainMap(ChainMap):
+            indexed = True
+        
+        overlay = { 'yo' : "nodogg", 'wat' : "hax" }
+        bottom = { 'wat' : "nohax", 'bottom' : "line" }
+        chain = IndexedChainMap(overlay, dict(arbitrary), bottom)
+        
+        index = chain.layerindex()
+        assert index['yo'] is overlay
+        assert index['wat'] is overlay
+        assert index['bottom'] is bottom
+        assert len(chain) == len(index) == len(arbitrary) + 2
+        assert frozenset(chain) == frozenset(ChainMap(*chain.maps))
+        assert chain['yo'] == "nodogg"
+        assert chain['bottom'] == "line"
+        assert chain.flatten() == dict(ChainMap(*chain.maps).items())
+        
+        # Repeated access reuses the index:
+        assert chain.layerindex() is index
+        
+        # Writes through the ChainMap invalidate the index:
+        chain['i'] = "overwrote"
+        assert chain.cache is None
+        assert chain['i'] == "overwrote"
+        assert chain.layerindex()['i'] is overlay
+        del chain['i']
+        assert chain['i'] == "heard"
+        
+        # Changes to the layers themselves are caught by length:
+        bottom['new'] = "key"
+        assert 'new' in chain
+        assert chain['new'] == "key"
+        del bottom['new']
+        assert 'new' not in chain
+        with pytest.raises(KeyError):
+            chain['new']
+        
+        # … as are same-length changes:
+        del overlay['wat']
+        overlay['swapped'] = "in"
+        assert chain['swapped'] == "in"
+        assert 'swapped' in chain
+        assert chain['wat'] == "nohax"
+        assert 'swapped' in frozenset(chain)
+        assert len(chain) == len(frozenset(chain))
+        
+        # … as is shadowing an indexed key in a higher layer:
+        assert chain['bottom'] == "line"
+        overlay['bottom'] = "shadowed"
+        overlay['y'] = 1
+        assert chain['bottom'] == "shadowed"
+        del overlay['swapped']
+        overlay['you'] = "shadowed"
+        assert chain['you'] == "shadowed"
+        assert chain.flatten() == dict(ChainMap(*chain.maps).items())
+    
+    def test_chainmapplusplus_multimapping(self, arbitrary):
+        from clu.dicts import ChainMapPlusPlus
+        import multidict
+        
+        one = { 'yo' : "dogg", 'i' : "heard" }
+        two = { 'yo' : "nodogg", 'you' : "liked" }
+        
+        chain = ChainMapPlusPlus(one, two, dict(arbitrary), wat="hax")
+        multi = multidict.MultiDict()
+        for layer in chain.maps:
+            multi.extend(layer)
+        
+        assert isinstance(chain, multidict.MutableMultiMapping)
+        assert chain['wat'] == "hax"
+        
+        def check(*keys):
+            for key in keys:
+                assert chain.getall(key) == multi.getall(key)
+                assert chain.getone(key) == multi.getone(key)
+                assert chain[key] == multi[key]
+        
+        check('yo', 'i', 'you', 'dict', 'wat')
+        assert chain.getall('yo') == ["dogg", "nodogg", "dogg"]
+        
+        # Adding values:
+        for thing in (chain, multi):
+            thing.add('yo', "dogg4")
+            thing.add('new', "key")
+            thing.extend([('new', "key2"), ('you', "liked2")], more="stuff")
+        check('yo', 'new', 'you', 'more')
+        assert len(chain.owned) == 1
+        assert one == { 'yo' : "dogg", 'i' : "heard" }
+        
+        # Popping values:
+        assert chain.popone('yo') == multi.popone('yo')
+        check('yo')
+        assert chain.popall('new') == multi.popall('new')
+        assert 'new' not in chain
+        assert chain.popall('new', None) is None
+        assert chain.popone('new', "dflt") == "dflt"
+        with pytest.raises(KeyError):
+            chain.getall('new')
+        with pytest.raises(KeyError):
+            chain.popall('new')
+        with pytest.raises(KeyError):
+            chain.popone('new')
+        
+        # Updating and setting values:
+        for thing in (chain, multi):
+            thing.update([('yo', "updated"), ('yo', "updated2"), ('brand', "new")])
+            thing['you'] = "set"
+        check('yo', 'you', 'brand', 'i')
+        
+        # Deleting values:
+        for thing in (chain, multi):
+            del thing['yo']
+        assert 'yo' not in chain
+        assert chain.getall('yo', []) == []
+        check('you', 'brand', 'i', 'more', 'dict')
+    
+    def test_chainmapplusplus_multiindex(self, arbitrary):
+        from clu.dicts import ChainMapPlusPlus
+        
+        one = { 'yo' : "dogg" }
+        two = { 'yo' : "nodogg", 'i' : "heard" }
+        chain = ChainMapPlusPlus(one, two)
+        
+        index = chain.multiindex()
+        assert index['yo'] == [one, two]
+        assert index['i'] == [two]
+        assert chain.multiindex() is index
+        
+        # Direct removals from the layers are caught:
+        del two['yo']
+        assert chain.getall('yo') == ["dogg"]
+        
+        # … as are direct additions of new keys:
+        two['you'] = "liked"
+        assert chain.getall('you') == ["liked"]
+        
+        # … and same-length swaps:
+        del one['yo']
+        one['swapped'] = "in"
+        assert chain.getall('swapped') == ["in"]
+        assert chain.getall('yo', []) == []
+        assert chain.popall('swapped') == ["in"]
+        assert frozenset(chain) == { 'i', 'you' }
+        one['yo'] = "dogg"
+        
+        # … and additions of existing keys to other layers:
+        one['i'] = "heard0"
+        assert chain.getall('i') == ["heard0", "heard"]
+        assert chain['i'] == "heard0"
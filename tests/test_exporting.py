@@ -453,3 +453,150 @@ class TestExporting(object):
         assert 'i_heard' in test_all
         assert 'yo_dogg' in test_dir()
         assert 'i_heard' in test_dir()
+    
+    def test_search_by_id_module_index(self):
+        from clu.exporting import moduleindex, search_by_id
+        import sys, types
+        
+        class Yo(object):
+            pass
+        
+        module = types.ModuleType('yodogg_search_by_id')
+        module.yo = yo = Yo()
+        sys.modules[module.__name__] = module
+        
+        try:
+            # New modules are indexed on the first miss:
+            assert search_by_id(id(yo)) == (module, 'yo')
+            
+            # … and answers are served from the index thereafter:
+            hits = moduleindex.info().hits
+            assert search_by_id(id(yo)) == (module, 'yo')
+            assert moduleindex.info().hits == hits + 1
+            
+            # Changed modules are re-indexed:
+            module.dogg = dogg = Yo()
+            assert search_by_id(id(dogg)) == (module, 'dogg')
+            
+            # Rebound attributes are found, despite the unchanged length:
+            module.yo = wat = Yo()
+            assert search_by_id(id(wat)) == (module, 'yo')
+            module.yo = yo
+            assert search_by_id(id(yo)) == (module, 'yo')
+            
+            # Misses are remembered, until the indexed modules change:
+            nowhere = Yo()
+            assert search_by_id(id(nowhere)) == (None, None)
+            assert moduleindex.negatives[id(nowhere)] == moduleindex.generation
+            module.nowhere = nowhere
+            assert search_by_id(id(nowhere)) == (module, 'nowhere')
+            assert id(nowhere) not in moduleindex.negatives
+            
+            # Answers are validated against the modules’ contents:
+            del module.yo
+            module.heard = Yo()
+            assert search_by_id(id(yo)) == (None, None)
+            
+        finally:
+            del sys.modules[module.__name__]
+        
+        # Removed modules are forgotten:
+        assert search_by_id(id(dogg)) == (None, None)
+        assert module.__name__ not in moduleindex.signatures
+    
+    def test_exporter_identity_index(self):
+        from clu.exporting import Exporter, Registry
+        
+        class Yo(object):
+            pass
+        
+        yo, dogg = Yo(), Yo()
+        exporter = Exporter(dotpath='yodogg.identity.index')
+        
+        try:
+            exporter.export(yo, name='yo')
+            assert Exporter.nameof(yo) == 'yo'
+            assert Registry.nameof(yo) == 'yo'
+            assert Exporter.lookup(yo) == ('yodogg.identity.index', 'yo')
+            
+            # Re-exporting a name replaces its index entry:
+            exporter['yo'] = dogg
+            assert Exporter.nameof(yo) is None
+            assert Exporter.nameof(dogg) == 'yo'
+            
+            # Deleting an export removes its index entry:
+            del exporter['yo']
+            assert Exporter.nameof(dogg) is None
+            
+            exporter['dogg'] = dogg
+            assert Exporter.nameof(dogg) == 'dogg'
+            
+        finally:
+            Exporter.unregister('yodogg.identity.index')
+        
+        # Unregistering an exporter removes its index entries:
+        assert Exporter.nameof(dogg) is None
+        assert id(dogg) not in Exporter.exportindex
+    
+    def test_exporter_modules_cache(self):
+        from clu.exporting import Exporter
+        
+        modules = Exporter.modules()
+        assert Exporter.modules() is modules
+        assert 'clu.exporting' in modules
+        
+        exporter = Exporter(dotpath='clu.exporting.yodogg')
+        
+        try:
+            # Registration invalidates the cached modules:
+            with pytest.raises(ModuleNotFoundError):
+                Exporter.modules()
+        finally:
+            Exporter.unregister(exporter.dotpath)
+        
+        assert 'clu.exporting.yodogg' not in Exporter.modules()
+    
+    def test_lazy_attributes(self, dirname):
+        from clu.exporting import Exporter, lazy_attributes
+        from clu.fs import pypath
+        import sys, types
+        
+        # Ensure “sys.path” contains the “yodogg” package:
+        basepath = dirname.subdirectory('yodogg')
+        pypath.enhance(basepath)
+        
+        module = types.ModuleType('yodogg_lazy')
+        manifest = { 'youlike' : 'yodogg.iheard' }
+        module.__getattr__, module.__dir__ = lazy_attributes(module.__name__, manifest, 'wat')
+        
+        sys.modules[module.__name__] = module
+        iheard = sys.modules.pop('yodogg.iheard', None)
+        
+        try:
+            assert module.__dir__() == ['wat', 'youlike']
+            assert 'youlike' not in vars(module)
+            assert 'yodogg.iheard' not in sys.modules
+            
+            # First access imports the defining module:
+            assert module.youlike() == "registries"
+            assert 'yodogg.iheard' in sys.modules
+            assert vars(module)['youlike'] is sys.modules['yodogg.iheard'].youlike
+            
+            with pytest.raises(AttributeError) as exc:
+                module.nodogg
+            assert "nodogg" in str(exc.value)
+            
+        finally:
+            del sys.modules[module.__name__]
+            if iheard is not None:
+                sys.modules['yodogg.iheard'] = iheard
+        
+        # Exporter instances furnish lazy “__getattr__” and “__dir__” too:
+        exporter = Exporter(dotpath='yodogg_lazy')
+        exporter.export(types, name='yo')
+        try:
+            getattr_, dir_ = exporter.getattr_and_dir(lambda: manifest)
+            assert dir_() == ['yo', 'youlike']
+            assert getattr_('youlike')() == "registries"
+        finally:
+            Exporter.unregister('yodogg_lazy')
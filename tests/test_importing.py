@@ -128,6 +128,30 @@ class TestImporting(object):
             Registry.unregister(overridden.appname,
                                 overridden.qualname)
     
+    def test_chainmodulemap_layer_changes(self):
+        from clu.importing.proxy import ChainModuleMap
+        
+        def fallback(key):
+            if key == 'fallen':
+                return "back"
+            raise KeyError(key)
+        
+        top = { 'a' : 1 }
+        bottom = { 'b' : 2 }
+        chainmap = ChainModuleMap(top, bottom, fallbacks=(fallback,))
+        assert chainmap['a'] == 1
+        
+        # Same-length changes to a layer are seen:
+        del top['a']
+        top['fallen'] = 0
+        assert chainmap['fallen'] == "back"
+        assert 'a' not in chainmap
+        with pytest.raises(KeyError):
+            chainmap['a']
+        top['c'] = 3
+        assert chainmap['c'] == 3
+        assert chainmap['b'] == 2
+    
     def test_module_dict_proxy_idea(self, consts):
         from clu.dicts import ChainMap
         from clu.importing import Module, Registry
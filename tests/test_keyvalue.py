@@ -77,3 +77,215 @@ class TestKeyValue(object):
             assert sidehustle['poe']     == greektext['poe']
         
         assert iterlen(temporarydir.ls()) == 4
+    
+    def test_keyvalue_cluinterface_marshal(self, environment,
+                                                 temporarydir):
+        from clu.constants.exceptions import KeyValueError
+        from clu.keyvalue import CLUInterface
+        import pytest
+        
+        dict_one = { 'compress_level' : 9,
+                           'optimize' : True,
+                             'format' : 'png',
+                                 'yo' : 'dogg' }
+        
+        # Values written with plists can be read back with marshal:
+        with CLUInterface(datadir=temporarydir) as interface:
+            interface.update(dict_one)
+        
+        with CLUInterface(datadir=temporarydir, serializer='marshal') as interface:
+            assert interface.as_dict() == dict_one
+            interface['yo'] = 'nodogg'
+            interface['ratio'] = 1.5
+        
+        with CLUInterface(datadir=temporarydir, serializer='marshal') as interface:
+            assert len(interface) == 5
+            assert interface['yo'] == 'nodogg'
+            assert interface['ratio'] == 1.5
+            assert interface['compress_level'] == 9
+        
+        with pytest.raises(KeyValueError):
+            CLUInterface(datadir=temporarydir, serializer='yaml')
+    
+    def test_keyvalue_cluinterface_tiered(self, environment,
+                                                temporarydir):
+        from clu.typology import iterlen
+        from clu.keyvalue import CLUInterface, TieredStore
+        
+        interface = CLUInterface(datadir=temporarydir, serializer='marshal',
+                                                       cache=2,
+                                                       buffer=0)
+        assert type(interface.zdict) is TieredStore
+        
+        # Buffered writes don’t touch the disk until flushed:
+        interface.update({ 'yo' : 'dogg', 'i' : 'heard', 'you' : 'liked' })
+        assert iterlen(temporarydir.ls()) == 0
+        assert len(interface) == 3
+        assert interface['yo'] == 'dogg'
+        interface.flush()
+        assert iterlen(temporarydir.ls()) == 3
+        
+        # …nor do buffered deletes:
+        interface.delete('yo')
+        assert 'yo' not in interface
+        assert interface.get('yo', None) is None
+        assert len(interface) == 2
+        with CLUInterface(datadir=temporarydir, serializer='marshal') as sidehustle:
+            assert sidehustle['yo'] == 'dogg'
+        
+        # Reads are cached, up to the LRU size:
+        assert interface['i'] == 'heard'
+        assert interface['you'] == 'liked'
+        assert frozenset(interface.zdict.cache) == { 'i', 'you' }
+        
+        # Closing flushes:
+        interface['yo'] = 'nodogg'
+        interface['wat'] = 'wat'
+        interface.close()
+        with CLUInterface(datadir=temporarydir, serializer='marshal') as sidehustle:
+            assert sidehustle.as_dict() == { 'i' : 'heard', 'you' : 'liked',
+                                             'yo' : 'nodogg', 'wat' : 'wat' }
+        
+        # Buffers with a limit flush themselves:
+        with CLUInterface(datadir=temporarydir, serializer='marshal',
+                                                buffer=2) as interface:
+            interface['one'] = 1
+            assert len(interface.zdict.pending) == 1
+            interface['two'] = 2
+            assert len(interface.zdict.pending) == 0
+            assert iterlen(temporarydir.ls()) == 6
+    
+    def test_keyvalue_logstore(self, temporarydir):
+        from clu.keyvalue import LogStore
+        import os
+        
+        store = LogStore(temporarydir.name)
+        for idx in range(100):
+            store[f"key{idx}"] = f"value{idx}".encode()
+        store['key0'] = b'overwritten'
+        del store['key1']
+        assert len(store) == 99
+        assert store['key0'] == b'overwritten'
+        assert store['key99'] == b'value99'
+        assert 'key1' not in store
+        assert store.garbage > 0
+        store.close()
+        assert frozenset(os.listdir(temporarydir.name)) == { 'store.log', 'store.idx' }
+        
+        # Reopening loads the index file:
+        store = LogStore(temporarydir.name)
+        assert len(store) == 99
+        assert store['key0'] == b'overwritten'
+        
+        # Records appended after the index file was written are replayed:
+        store['key100'] = b'value100'
+        del store['key2']
+        store.handle.flush()
+        recovered = LogStore(temporarydir.name)
+        assert len(recovered) == 99
+        assert recovered['key100'] == b'value100'
+        assert 'key2' not in recovered
+        assert recovered.garbage == store.garbage
+        recovered.close()
+        store.handle.close()
+        
+        # An incomplete trailing record is dropped:
+        size = os.path.getsize(store.segment)
+        with open(store.segment, 'ab') as handle:
+            handle.write(LogStore.header.pack(0, 6, 100) + b'key101' + b'x' * 10)
+        store = LogStore(temporarydir.name)
+        assert 'key101' not in store
+        assert os.path.getsize(store.segment) == size
+        store['key101'] = b'value101'
+        store.close()
+        
+        # Without the index file, the segment is replayed in full:
+        os.remove(store.indexfile)
+        store = LogStore(temporarydir.name)
+        assert len(store) == 100
+        assert store['key101'] == b'value101'
+        store.close()
+    
+    def test_keyvalue_logstore_compaction(self, temporarydir):
+        from clu.keyvalue import LogStore
+        import os
+        
+        store = LogStore(temporarydir.name, threshold=2**30)
+        for generation in range(4):
+            for idx in range(256):
+                store[f"key{idx}"] = f"value{idx}-{generation}".encode()
+        for idx in range(128):
+            del store[f"key{idx}"]
+        size = store.size()
+        live = dict((key, store[key]) for key in store)
+        
+        store.compact()
+        assert store.compactor is None
+        assert store.garbage == 0
+        assert store.size() < size / 4
+        assert dict((key, store[key]) for key in store) == live
+        
+        # Writes made during a background compaction are kept – and
+        # waiting on it reclaims the garbage they made, too:
+        with store.lock:
+            store.compact(wait=False)
+            for idx in range(128):
+                store[f"key{idx}"] = b'revived'
+            store['key254'] = b'overwritten'
+            store['key254'] = b'value254-3'
+            del store['key255']
+        store.compact()
+        assert store.compactor is None
+        assert store.garbage == 0
+        assert len(store) == 255
+        assert store['key0'] == b'revived'
+        assert store['key254'] == b'value254-3'
+        store.close()
+        
+        store = LogStore(temporarydir.name)
+        assert len(store) == 255
+        assert 'key255' not in store
+        assert store['key127'] == b'revived'
+        store.close()
+        assert not os.path.exists(store.segment + '.compact')
+        
+        # Compaction kicks in automatically past the threshold:
+        store = LogStore(temporarydir.subpath('auto'), threshold=4096)
+        for _ in range(64):
+            store['key0'] = b'x' * 128
+        store.close()
+        assert os.path.getsize(store.segment) < 64 * 128
+        store = LogStore(temporarydir.subpath('auto'))
+        assert store['key0'] == b'x' * 128
+        store.close()
+    
+    def test_keyvalue_cluinterface_log(self, environment,
+                                             temporarydir,
+                                             greektext):
+        from clu.constants.exceptions import KeyValueError
+        from clu.keyvalue import CLUInterface, LogStore
+        from clu.typology import iterlen
+        import pytest
+        
+        datadir = temporarydir.subpath('log')
+        
+        with CLUInterface(datadir=datadir, backend='log') as interface:
+            assert interface.datadir.name == datadir
+            assert type(interface.zfile) is LogStore
+            interface.update(greektext)
+            interface.set('yo', 'dogg')
+            interface.delete('lorem')
+            assert interface.count() == 4
+        
+        assert iterlen(temporarydir.subdirectory('log').ls()) == 2
+        
+        with CLUInterface(datadir=datadir, backend='log',
+                                           serializer='marshal') as interface:
+            assert frozenset(interface.iterate()) == { 'faust', 'thoreau', 'poe', 'yo' }
+            assert interface.as_dict() == dict(faust=greektext['faust'],
+                                               thoreau=greektext['thoreau'],
+                                               poe=greektext['poe'],
+                                               yo='dogg')
+        
+        with pytest.raises(KeyValueError):
+            CLUInterface(datadir=datadir, backend='lmdb')
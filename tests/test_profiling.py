@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+import sys
+
+class TestProfiling(object):
+    
+    """ Run the tests for the “clu.profiling” module. """
+    
+    def test_requested(self):
+        from clu.profiling import requested, ENVIRONMENT_VARIABLE
+        
+        assert requested({}) is None
+        assert requested({ ENVIRONMENT_VARIABLE : '' }) is None
+        assert requested({ ENVIRONMENT_VARIABLE : '0' }) is None
+        assert requested({ ENVIRONMENT_VARIABLE : '1' }) == 'all'
+        assert requested({ ENVIRONMENT_VARIABLE : 'all' }) == 'all'
+        assert requested({ ENVIRONMENT_VARIABLE : 'TIME' }) == 'time'
+    
+    def test_import_profiler(self, temporarydir):
+        from clu.fs.filesystem import write_to_path
+        from clu import profiling
+        
+        # Write out a small package, the import of which pulls in
+        # one of its submodules, which in turn pulls in another:
+        package = temporarydir.subdirectory('yoprofile')
+        package.makedirs()
+        write_to_path("from yoprofile import dogg\n",
+                      package.subpath('__init__.py'))
+        write_to_path("from yoprofile import iheard\nyo = 'dogg'\n",
+                      package.subpath('dogg.py'))
+        write_to_path("wat = [str(idx) for idx in range(10000)]\n",
+                      package.subpath('iheard.py'))
+        
+        sys.path.insert(0, temporarydir.name)
+        assert profiling.profiler is None
+        profiler = profiling.install()
+        
+        try:
+            assert profiling.install() is profiler
+            import yoprofile
+        finally:
+            assert profiling.uninstall() is profiler
+            sys.path.remove(temporarydir.name)
+            for name in ('yoprofile', 'yoprofile.dogg', 'yoprofile.iheard'):
+                sys.modules.pop(name, None)
+        
+        assert profiling.profiler is None
+        assert profiler.finder not in sys.meta_path
+        assert not profiler.instrumented
+        assert 'exec_module' not in vars(yoprofile.__loader__)
+        
+        # Check the records and the dependency edges:
+        records = profiler.records
+        assert records['yoprofile'].parent is None
+        assert records['yoprofile.dogg'].parent == 'yoprofile'
+        assert records['yoprofile.iheard'].parent == 'yoprofile.dogg'
+        assert tuple(profiler.edges()) == (('yoprofile', 'yoprofile.dogg'),
+                                           ('yoprofile.dogg', 'yoprofile.iheard'))
+        assert [record.name for record in profiler.roots()] == ['yoprofile']
+        
+        # Check the times and allocations:
+        for name in ('yoprofile', 'yoprofile.dogg', 'yoprofile.iheard'):
+            assert records[name].cumulative > 0
+            assert 0 < profiler.selftime(name) <= records[name].cumulative
+            assert records[name].allocated is not None
+        assert records['yoprofile'].cumulative >= records['yoprofile.dogg'].cumulative
+        assert records['yoprofile.iheard'].allocated > 0
+        
+        # Check the report:
+        ranked = profiler.ranked(prefix='yoprofile')
+        assert [record.name for record in ranked] == ['yoprofile',
+                                                      'yoprofile.dogg',
+                                                      'yoprofile.iheard']
+        report = profiler.report(prefix='yoprofile')
+        assert len(report) == 7
+        assert report[0].startswith('module')
+        assert "yoprofile → yoprofile.dogg" in report
+        assert "yoprofile.dogg → yoprofile.iheard" in report
+    
+    def test_import_profiler_exporters(self):
+        from clu.exporting import Exporter
+        from clu import profiling
+        
+        profiler = profiling.ImportProfiler(allocations=False)
+        profiling.profiler = profiler
+        
+        try:
+            # Simulate the import of an exporting module:
+            with profiling.timing('yodogg.profiled'):
+                exporter = Exporter(dotpath='yodogg.profiled')
+            with profiling.timing('yodogg.classmodule', kind='class-module'):
+                pass
+        finally:
+            profiling.profiler = None
+            Exporter.unregister('yodogg.profiled')
+        
+        assert profiling.timing('yodogg.profiled') is profiling.nullcontext
+        record = profiler.records['yodogg.profiled']
+        assert record.exporter == 'clu.exporting.Exporter'
+        assert record.allocated is None
+        assert type(exporter).__name__ == 'Exporter'
+        assert profiler.records['yodogg.classmodule'].kind == 'class-module'
+        assert profiler.records['yodogg.classmodule'].exporter is None
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+import pytest
+
+class TestShelvingSQLite(object):
+    
+    """ Run the tests for the “clu.shelving.sqlite” module. """
+    
+    def test_sqlite_shelf(self, temporarydir):
+        from clu.shelving.sqlite import SQLiteShelf
+        
+        path = temporarydir.subpath('shelf.sqlite3')
+        
+        with SQLiteShelf(path) as shelf:
+            shelf['yo'] = "dogg"
+            shelf['tree'] = { 'i' : "heard" }
+            shelf['history'] = []
+            # Nothing is written before the sync:
+            assert len(shelf) == 3
+            assert 'yo' in shelf
+        
+        with SQLiteShelf(path) as shelf:
+            assert len(shelf) == 3
+            assert frozenset(shelf) == { 'yo', 'tree', 'history' }
+            # Values load lazily, and write back:
+            assert not shelf.cache
+            shelf['tree'].update({ 'you' : "like" })
+            shelf['history'].append('yo dogg')
+            assert frozenset(shelf.cache) == { 'tree', 'history' }
+            # Unchanged values are not rewritten:
+            assert shelf['yo'] == "dogg"
+            assert frozenset(shelf.changes()) == { 'tree', 'history' }
+            del shelf['yo']
+            assert 'yo' not in shelf
+            with pytest.raises(KeyError):
+                shelf['yo']
+        
+        with SQLiteShelf(path) as shelf:
+            assert shelf['tree'] == { 'i' : "heard", 'you' : "like" }
+            assert shelf['history'] == ['yo dogg']
+            assert shelf.get('yo') is None
+            assert len(shelf) == 2
+        
+        assert shelf.closed
+        with pytest.raises(ValueError):
+            shelf['tree']
+    
+    def test_sqlite_shelf_transactions(self, temporarydir):
+        from clu.shelving.sqlite import SQLiteShelf
+        
+        path = temporarydir.subpath('shelf.sqlite3')
+        writer = SQLiteShelf(path)
+        reader = SQLiteShelf(path)
+        
+        try:
+            # Batched writes are invisible to readers until committed:
+            with writer.transaction():
+                writer.update({ f"key{idx}" : idx for idx in range(100) })
+                assert len(reader) == 0
+            assert len(reader) == 100
+            assert reader['key99'] == 99
+            
+            # Changes from a failed batch are discarded:
+            with pytest.raises(ZeroDivisionError):
+                with writer.transaction():
+                    writer['key0'] = 'wat'
+                    del writer['key1']
+                    1 / 0
+            assert writer['key0'] == reader['key0'] == 0
+            assert 'key1' in writer
+            assert 'key1' in reader
+        
+        finally:
+            reader.close()
+            writer.close()
+        
+        # Changes are discarded when the shelf context raises:
+        with pytest.raises(KeyError):
+            with SQLiteShelf(path) as shelf:
+                shelf['key0'] = 'wat'
+                shelf['nope']
+        
+        with SQLiteShelf(path) as shelf:
+            assert shelf['key0'] == 0
+    
+    def test_sqlite_shelf_concurrent_writers(self, temporarydir):
+        from clu.shelving.sqlite import SQLiteShelf
+        import threading
+        
+        path = temporarydir.subpath('shelf.sqlite3')
+        
+        def work(worker):
+            for idx in range(10):
+                with SQLiteShelf(path) as shelf:
+                    shelf[f"worker{worker}-{idx}"] = { 'worker' : worker,
+                                                       'index'  : idx }
+        
+        threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        with SQLiteShelf(path) as shelf:
+            assert len(shelf) == 80
+            assert shelf['worker7-9'] == { 'worker' : 7, 'index' : 9 }
+    
+    def test_sqlite_shelf_concurrent_updates(self, temporarydir):
+        from clu.exporting import Exporter
+        from clu.shelving.sqlite import SQLiteShelf
+        import threading
+        
+        path = temporarydir.subpath('shelf.sqlite3')
+        exporter = Exporter(dotpath='clu.testing.yodogg.concurrent')
+        
+        with SQLiteShelf(path) as shelf:
+            shelf['history'] = []
+        
+        def work(worker):
+            with SQLiteShelf(path) as shelf:
+                for idx in range(10):
+                    with shelf.transaction():
+                        shelf['history'].append((worker, idx))
+            for idx in range(10, 20):
+                with exporter.data(path=path, backend='sqlite') as shelf:
+                    shelf['history'].append((worker, idx))
+        
+        try:
+            threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            Exporter.unregister('clu.testing.yodogg.concurrent')
+        
+        # No read-modify-write update was lost:
+        with SQLiteShelf(path) as shelf:
+            history = shelf['history']
+            assert len(history) == 160
+            assert frozenset(history) == { (worker, idx) for worker in range(8) \
+                                                          for idx in range(20) }
+    
+    def test_exporter_data_backends(self, temporaryname):
+        from clu.exporting import Exporter
+        from clu.shelving.sqlite import SQLiteShelf
+        
+        exporter = Exporter(dotpath='clu.testing.yodogg')
+        
+        try:
+            tempfile = temporaryname(suffix='sqlite3')
+            with exporter.data(path=tempfile.name, backend='sqlite') as database:
+                assert type(database) is SQLiteShelf
+                database['yo'] = "dogg"
+            with exporter.data(path=tempfile.name, backend='sqlite') as database:
+                assert database['yo'] == "dogg"
+            
+            with pytest.raises(ValueError):
+                with exporter.data(path='nowhere', backend='wat'):
+                    pass
+        
+        finally:
+            Exporter.unregister('clu.testing.yodogg')
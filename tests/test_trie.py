@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+import pytest
+
+class TestTrie(object):
+    
+    """ Run the tests for the “clu.trie” module. """
+    
+    @pytest.fixture
+    def needles(self):
+        """ Fixture function providing a tuple of overlapping needles """
+        yield ('he', 'she', 'his', 'hers', 'yo', 'yo dogg')
+    
+    def test_automaton_matches(self, needles):
+        from clu.trie import BaseTrie, Trie
+        
+        for cls in (BaseTrie, Trie):
+            trie = cls()
+            for needle in needles:
+                trie.add(needle)
+            
+            # The failure links are built lazily:
+            assert trie.failure is None
+            matches = tuple(trie.matches('ushers'))
+            assert trie.failure is trie
+            
+            # Overlapping matches, by end position, longest first:
+            assert matches == ((1, 'she'), (2, 'he'), (2, 'hers'))
+            assert tuple(trie.matches('yo dogg yo')) == ((0, 'yo'),
+                                                         (0, 'yo dogg'),
+                                                         (8, 'yo'))
+            assert tuple(trie.matches('nope')) == tuple()
+            assert tuple(trie.matches('')) == tuple()
+            
+            # Adding a string invalidates the failure links:
+            trie.add('us')
+            assert trie.failure is None
+            assert tuple(trie.matches('ushers'))[0] == (0, 'us')
+    
+    def test_automaton_search(self, needles):
+        from clu.trie import BaseTrie, Trie
+        
+        trie = BaseTrie()
+        for needle in needles:
+            trie.add(needle)
+        
+        for string in ('ushers', 'yo', 'ahis', 'yes yo dogg', 'hhhhhhhhe'):
+            assert trie.search(string)
+            assert any(trie.find(string, pos) for pos in range(len(string)))
+        
+        for string in ('', 'h', 'hi', 'yes', 'dogg', 's h e'):
+            assert not trie.search(string)
+            assert not any(trie.find(string, pos) for pos in range(len(string)))
+        
+        # Child nodes search only their own subtries:
+        yo = trie.children['y']
+        assert trie.search('ushers')
+        assert not yo.search('ushers')
+        assert yo.search('o dogg')
+        assert yo.search('xo')
+        assert tuple(yo.matches('oo dogg')) == ((0, 'o'), (1, 'o'),
+                                                (4, 'o'), (1, 'o dogg'))
+        assert tuple(trie.children['h'].matches('ushers')) == ((3, 'e'), (3, 'ers'))
+        assert trie.search('yo')
+        
+        # Nodes created by indexing, rather than by “add(…)”, are no bother:
+        for cls in (BaseTrie, Trie):
+            vivified = cls()
+            vivified.add('yo')
+            assert not vivified.search('x')
+            vivified.children['z']
+            vivified.children['y'].children['q']
+            assert not vivified.search('zq')
+            assert not vivified.search('yq')
+            assert vivified.search('zyo')
+            assert tuple(vivified.compile().matches('zyo')) == ((1, 'yo'),)
+        
+        # Adding through a child node invalidates the root:
+        trie.search('ushers')
+        trie.children['h'].add('at')
+        assert trie.failure is None
+        assert trie.search('chat')
+    
+    def test_perform_match_search(self, needles):
+        from clu.trie import TrieSearcher
+        
+        searcher = TrieSearcher(*needles)
+        assert searcher.perform_simple_search('ushers') == ('ushers',)
+        assert searcher.perform_simple_search('nope') == tuple()
+        
+        assert searcher.perform_match_search('ushers and his yo-yo') == {
+            'she'   : (1,),
+            'he'    : (2,),
+            'hers'  : (2,),
+            'his'   : (11,),
+            'yo'    : (15, 18)
+        }
+        
+        searcher.add_to_search_space('yo-yo')
+        assert searcher.perform_match_search('yo-yo')['yo-yo'] == (0,)
+    
+    def test_compiled_trie(self, needles, temporarydir):
+        from clu.trie import BaseTrie, CompiledTrie
+        import pickle
+        
+        trie = BaseTrie()
+        for needle in needles + ('üñï', 'ü'):
+            trie.add(needle)
+        compiled = trie.compile()
+        assert type(compiled) is CompiledTrie
+        assert trie.children['h'].compile().nbytes() == compiled.nbytes()
+        
+        strings = ('ushers', 'yo dogg yo', 'his üñïcode', 'nope', '', 's h e')
+        
+        def check(compiled):
+            for string in strings:
+                assert tuple(compiled.matches(string)) == tuple(trie.matches(string))
+                assert compiled.search(string) == trie.search(string)
+                for pos in range(-2, len(string)):
+                    assert compiled.find(string, pos) == trie.find(string, pos)
+            for needle in needles:
+                assert compiled.whoami(compiled.node(needle)) == needle
+            assert compiled.node('hx') is None
+            assert compiled.whoami(0) == ''
+            assert compiled.handle('hx') is None
+            assert compiled.handle('').is_rootnode()
+            handle = compiled.handle('hers')
+            assert handle.is_final
+            assert not compiled.handle('he').is_rootnode()
+            assert handle.whoami() == 'hers'
+            assert handle.outputs() == (4,)
+        
+        check(compiled)
+        check(pickle.loads(pickle.dumps(compiled)))
+        
+        # Dump and load, both memory-mapped and not:
+        path = temporarydir.subpath('needles.trie')
+        compiled.dump(path)
+        loaded = CompiledTrie.load(path)
+        assert loaded.buffer is not None
+        assert len(loaded) == len(compiled)
+        check(loaded)
+        check(pickle.loads(pickle.dumps(loaded)))
+        loaded.close()
+        assert loaded.buffer is None
+        check(CompiledTrie.load(path, mapped=False))
+        
+        # Not a compiled trie:
+        with open(path, 'wb') as handle:
+            handle.write(b'yo dogg' * 10)
+        with pytest.raises(ValueError):
+            CompiledTrie.load(path)
+    
+    def test_compiled_trie_searcher(self, needles):
+        from clu.trie import CompiledTrie, TrieSearcher, Trie
+        
+        searcher = TrieSearcher(*needles)
+        assert type(searcher.automaton()) is Trie
+        compiled = searcher.compile()
+        assert searcher.automaton() is compiled
+        assert type(searcher.root_node) is Trie
+        assert searcher.root_node.search('ushers')
+        assert type(compiled) is CompiledTrie
+        assert searcher.perform_simple_search('ushers') == ('ushers',)
+        assert searcher.perform_match_search('yo-yo') == { 'yo' : (0, 3) }
+        
+        # Growing the search space rebuilds the node trie:
+        searcher.add_to_search_space('yo-yo')
+        assert searcher.compiled is None
+        assert type(searcher.automaton()) is Trie
+        assert searcher.perform_match_search('yo-yo')['yo-yo'] == (0,)
+        assert searcher.perform_match_search('ushers')['hers'] == (2,)
+    
+    @pytest.fixture
+    def terms(self):
+        """ Fixture function providing 1000 search terms, 1 in 7 matching """
+        yield tuple(f"line {idx}: {idx % 7 and 'nope' or 'ushers'}" for idx in range(1000))
+    
+    def test_batch_search(self, needles, terms):
+        from clu.trie import TrieSearcher, Status
+        
+        searcher = TrieSearcher(*needles)
+        expected = sorted(term for term in terms if searcher.perform_simple_search(term))
+        assert len(expected) == 143
+        
+        # In-process, then pooled, with and without compiling first:
+        assert sorted(searcher.perform_batch_search(terms, processes=0)) == expected
+        assert sorted(searcher.perform_batch_search(iter(terms), processes=2,
+                                                                 chunksize=64)) == expected
+        searcher.compile()
+        assert sorted(searcher.perform_batch_search(terms, processes=2)) == expected
+        
+        assert len(searcher.search_sets) == 3
+        for infodict in searcher.search_sets:
+            assert infodict['status'] == Status.COMPLETE
+            assert infodict['submitted'] == infodict['searched'] == 1000
+            assert sorted(infodict['results']) == expected
+        
+        # An abandoned search is incomplete:
+        batches = searcher.perform_batch_search(iter(terms), processes=2, chunksize=10)
+        assert next(batches) in expected
+        assert searcher.search_sets[-1]['status'] == Status.RUNNING
+        batches.close()
+        assert searcher.search_sets[-1]['status'] == Status.INCOMPLETE
+        assert searcher.search_sets[-1]['searched'] < 1000
+        
+        # A search is registered, and pending, before it starts:
+        batches = searcher.iterbatches(terms, processes=0)
+        assert searcher.search_sets[-1]['status'] == Status.PENDING
+        assert searcher.search_sets[-1]['submitted'] == 0
+        assert len(next(batches)) > 0
+        assert searcher.search_sets[-1]['status'] == Status.RUNNING
+        batches.close()
+        assert searcher.search_sets[-1]['status'] == Status.INCOMPLETE
+    
+    def test_async_search(self, needles, terms):
+        from clu.trie import TrieSearcher, Status
+        import asyncio
+        
+        searcher = TrieSearcher(*needles)
+        expected = sorted(searcher.perform_batch_search(terms, processes=0))
+        
+        async def search():
+            return [term async for term in searcher.perform_async_search(terms, processes=2)]
+        
+        assert sorted(asyncio.run(search())) == expected
+        assert searcher.search_sets[-1]['status'] == Status.COMPLETE
+        
+        # Cancelling the consumer while a batch is still being searched:
+        import threading
+        started = threading.Event()
+        release = threading.Event()
+        
+        def stream():
+            yield from terms[:10]
+            started.set()
+            release.wait(timeout=10)
+            yield from terms[10:]
+        
+        async def cancel():
+            search = searcher.perform_async_search(stream(), processes=0, chunksize=100)
+            assert searcher.search_sets[-1]['status'] == Status.PENDING
+            task = asyncio.create_task(search.__anext__())
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            task.cancel()
+            asyncio.get_running_loop().call_later(0.1, release.set)
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        
+        asyncio.run(cancel())
+        assert searcher.search_sets[-1]['status'] == Status.INCOMPLETE
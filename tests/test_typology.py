@@ -142,6 +142,42 @@ class TestTypology(object):
         assert subclasscheck(666, FunnyYouDontLookIntish)
         assert not subclasscheck(FunnyYouDontLookIntish, int)
     
+    def test_subclasschecker(self):
+        from clu.typology import subclasschecker, decision_typerefs
+        from abc import ABC
+        import gc
+        
+        class FunnyYouDontLookMappish(ABC):
+            pass
+        
+        ismappish = subclasschecker(FunnyYouDontLookMappish)
+        
+        assert not ismappish(dict)
+        assert not ismappish({})
+        
+        # Registration invalidates cached decisions:
+        FunnyYouDontLookMappish.register(dict)
+        assert ismappish(dict)
+        assert ismappish({})
+        
+        # Proxies with a lying “__class__” bypass the cache:
+        class Proxy(object):
+            __class__ = property(lambda self: dict)
+        
+        assert ismappish(Proxy())
+        assert not ismappish(Proxy)
+        
+        # Decisions are forgotten along with their types:
+        class Ephemeral(object):
+            pass
+        
+        assert not ismappish(Ephemeral())
+        typeid = id(Ephemeral)
+        assert typeid in decision_typerefs
+        del Ephemeral
+        gc.collect()
+        assert typeid not in decision_typerefs
+    
     def test_boolean_predicates(self):
         """ » Checking basic isXXX(•) functions from clu.typology … """
         import array, decimal, os